@@ -0,0 +1,37 @@
+"""Compare process pools whose workers each load a large artifact against pools sharing one copy loaded by the parent.
+
+Run with `python benchmarks/bench_artifacts.py` once decryptogame is installed.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from decryptogame.artifacts import artifacts, measure_pool
+import multiprocessing
+import time
+
+NUM_WORKERS = 4
+ARTIFACT_BYTES = 64 * 1024 * 1024
+LOAD_SECONDS = 0.5
+
+def load_embeddings() -> bytearray:
+    # stands in for reading a large embedding matrix from disk
+    time.sleep(LOAD_SECONDS)
+    return bytearray(b"\x01" * ARTIFACT_BYTES)
+
+def load_in_worker():
+    artifacts.load("embeddings", load_embeddings)
+
+def report(label, measurement):
+    pss = f", total PSS {measurement.total_pss / 2 ** 20:.0f} MiB" if measurement.worker_pss else ""
+    print(f"{label:<24} startup {measurement.startup_seconds:.2f}s, total RSS {measurement.total_rss / 2 ** 20:.0f} MiB{pss}")
+
+def main():
+    for start_method in ["fork", "spawn"]:
+        context = multiprocessing.get_context(start_method)
+        # every worker loads its own copy
+        report(f"{start_method}, per worker", measure_pool(lambda: ProcessPoolExecutor(NUM_WORKERS, mp_context=context, initializer=load_in_worker), NUM_WORKERS))
+        # the parent loads once and workers share it
+        artifacts.load("embeddings", load_embeddings)
+        report(f"{start_method}, shared", measure_pool(lambda: artifacts.pool(NUM_WORKERS, context), NUM_WORKERS, ["embeddings"]))
+        artifacts.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Compare the cost of playing games with no event bus, a bus without subscribers, a synchronous subscriber and a ring buffer subscriber.
+
+Run with `python benchmarks/bench_events.py` once decryptogame is installed.
+"""
+from decryptogame.batch import play_seeded_game
+from decryptogame.events import EventBus, RingBufferSubscriber
+from decryptogame.game import Game
+from decryptogame.teams import RandomTeam
+from functools import partial
+import time
+
+NUM_GAMES = 5000
+
+def timed(label, event_bus=None):
+    team_factories = [partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)]
+    start = time.perf_counter()
+    for seed in range(NUM_GAMES):
+        play_seeded_game(team_factories, seed, game_factory=partial(Game, event_bus=event_bus))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:.3f}s, {NUM_GAMES / elapsed:,.0f} games/s")
+
+def main():
+    timed("no bus")
+    timed("bus without subscribers", EventBus())
+
+    counts = {}
+    def count(event):
+        counts[type(event)] = counts.get(type(event), 0) + 1
+    bus = EventBus()
+    bus.subscribe(count)
+    timed("synchronous subscriber", bus)
+
+    bus = EventBus()
+    subscriber = RingBufferSubscriber(lambda batch: [count(event) for event in batch])
+    bus.subscribe(subscriber)
+    timed("ring buffer subscriber", bus)
+    subscriber.close()
+    print(f"{subscriber.dropped} events dropped")
+
+if __name__ == "__main__":
+    main()
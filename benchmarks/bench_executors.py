@@ -0,0 +1,41 @@
+"""Compare playing a batch of games serially, in threads and in processes, with teams whose guessers spend their time in code which releases the GIL.
+
+On a free-threaded build of Python, threads also run pure Python teams in parallel. Run the script under each build to compare them.
+Run with `python benchmarks/bench_executors.py` once decryptogame is installed.
+"""
+from decryptogame.batch import play_batch
+from decryptogame.teams import RandomTeam
+import hashlib
+import os
+import sys
+import time
+
+NUM_GAMES = 400
+NUM_WORKERS = os.cpu_count()
+# hashing a large buffer releases the GIL, standing in for NumPy or other C extension work
+WORK_BYTES = b"\x00" * (4 * 1024 * 1024)
+
+class HashingGuesser:
+    def __init__(self, guesser):
+        self.guesser = guesser
+
+    def decipher_clues(self, clues, context):
+        hashlib.sha256(WORK_BYTES).digest()
+        return self.guesser.decipher_clues(clues, context)
+
+def hashing_team(keywords):
+    team = RandomTeam(keywords)
+    team.guesser = HashingGuesser(team.guesser)
+    return team
+
+def main():
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled else 'disabled'}, {NUM_WORKERS} workers")
+    for backend in ["serial", "threads", "processes"]:
+        start = time.perf_counter()
+        play_batch([hashing_team, hashing_team], range(NUM_GAMES), backend=backend, max_workers=NUM_WORKERS, chunk_games=8)
+        elapsed = time.perf_counter() - start
+        print(f"{backend:<10} {elapsed:.2f}s, {NUM_GAMES / elapsed:.0f} games/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Compare approximate nearest neighbor queries with an IVF index against brute force over a large clue vocabulary, and measure the recall they trade for speed.
+
+Run with `python benchmarks/bench_neighbors.py` once decryptogame and numpy are installed.
+"""
+from decryptogame.neighbors import IVFIndex, normalize_rows, train_centroids
+import numpy
+import time
+
+NUM_VECTORS = 100000
+DIM = 64
+NUM_QUERIES = 1000
+NUM_LISTS = 256
+NUM_TOPICS = 2000
+K = 8
+
+def main():
+    rng = numpy.random.default_rng(0)
+    # word embeddings cluster by topic, and clues lie near the words they were given for
+    topics = rng.standard_normal((NUM_TOPICS, DIM))
+    vectors = normalize_rows(topics[rng.integers(NUM_TOPICS, size=NUM_VECTORS)] + 0.5 * rng.standard_normal((NUM_VECTORS, DIM)))
+    queries = normalize_rows(vectors[:NUM_QUERIES] + 0.05 * rng.standard_normal((NUM_QUERIES, DIM)).astype(numpy.float32))
+
+    start = time.perf_counter()
+    expected = numpy.stack([numpy.argpartition(-(vectors @ query), K)[:K] for query in queries])
+    brute_force = time.perf_counter() - start
+    print(f"{'brute force':<16} {1000 * brute_force / NUM_QUERIES:.3f}ms/query")
+
+    start = time.perf_counter()
+    centroids = train_centroids(vectors[rng.choice(NUM_VECTORS, 20000, replace=False)], num_lists=NUM_LISTS)
+    index = IVFIndex(centroids)
+    index.add(vectors, numpy.arange(NUM_VECTORS))
+    print(f"{'build':<16} {time.perf_counter() - start:.3f}s")
+
+    for nprobe in (1, 4, 16):
+        index.nprobe = nprobe
+        start = time.perf_counter()
+        _, found = index.search(queries, K)
+        elapsed = time.perf_counter() - start
+        recall = numpy.mean([len(set(row) & set(expected_row)) / K for row, expected_row in zip(found.tolist(), expected.tolist())])
+        print(f"{f'nprobe={nprobe}':<16} {1000 * elapsed / NUM_QUERIES:.3f}ms/query, recall@{K} {recall:.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare a search encryptor's first-round decisions with looking them up in an opening book built for it.
+
+Run with `python benchmarks/bench_openings.py` once decryptogame is installed.
+"""
+from decryptogame.game import Game
+from decryptogame.generators import RandomKeywordCards
+import decryptogame.official_words.english as english
+from decryptogame.openings import OpeningBook, build_opening_book
+from decryptogame.teams import RandomIntercepter, Team, TeamContext
+from itertools import permutations
+import os
+import tempfile
+import time
+
+NUM_GAMES = 20
+CODES = list(permutations(range(4), 3))
+
+class LetterSearchEncryptor:
+    """Searches the word list for the clue sharing the most letters with each keyword."""
+    def decide_clues(self, code, context):
+        return tuple(max((word for word in english.words if word != context.keywords[number]),
+                         key=lambda word: len(set(word) & set(context.keywords[number])))
+                     for number in code)
+
+class LetterSearchGuesser:
+    def decipher_clues(self, clues, context):
+        encryptor = LetterSearchEncryptor()
+        clue_slots = {clue: slot for slot in range(len(context.keywords)) for clue in encryptor.decide_clues((slot,), context)}
+        return tuple(clue_slots.get(clue, index) for index, clue in enumerate(clues))
+
+def SearchTeam(keywords, seed=0):
+    return Team(keywords=keywords, encryptor=LetterSearchEncryptor(), intercepter=RandomIntercepter(seed), guesser=LetterSearchGuesser())
+
+def main():
+    cards = [keywords for seed in range(NUM_GAMES) for keywords in next(RandomKeywordCards(seed=seed))]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "book.bin")
+        start = time.perf_counter()
+        entries = build_opening_book(path, SearchTeam, cards)
+        print(f"built {entries} entries for {len(cards)} cards in {time.perf_counter() - start:.2f}s")
+        book = OpeningBook(path)
+
+        # every first-round clue decision for the cards, searched and looked up
+        encryptor = LetterSearchEncryptor()
+        contexts = [TeamContext(team_name=0, keywords=keywords, num_opponent_keywords=4, game=Game()) for keywords in cards]
+        start = time.perf_counter()
+        searched = [encryptor.decide_clues(code, context) for context in contexts for code in CODES]
+        search_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        looked_up = [book.clues(context.keywords, code) for context in contexts for code in CODES]
+        book_elapsed = time.perf_counter() - start
+        print(f"{'search':<12} {1e6 * search_elapsed / len(searched):.1f}us/decision")
+        print(f"{'opening book':<12} {1e6 * book_elapsed / len(looked_up):.1f}us/decision")
+        assert looked_up == searched
+        book.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Compare scoring every candidate code for a round's clues with one gather from a ClueSlotPosterior's matrix against a loop over the code permutations.
+
+Run with `python benchmarks/bench_posterior.py` once decryptogame and numpy are installed.
+"""
+from decryptogame.posterior import ClueSlotPosterior, code_space
+from itertools import permutations
+import random
+import time
+
+NUM_SLOTS = 8
+CODE_LENGTH = 4
+NUM_OBSERVATIONS = 200
+REPEATS = 200
+
+def main():
+    rng = random.Random(0)
+    words = [f"clue{index}" for index in range(60)]
+    posterior = ClueSlotPosterior(NUM_SLOTS)
+    for _ in range(NUM_OBSERVATIONS):
+        posterior.observe(rng.choice(words), rng.randrange(NUM_SLOTS))
+    clues = tuple(rng.sample(words, CODE_LENGTH))
+    codes = code_space(NUM_SLOTS, CODE_LENGTH)
+    print(f"{len(codes)} codes of length {CODE_LENGTH} over {NUM_SLOTS} slots")
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        log_likelihoods = posterior.log_likelihoods(clues).tolist()
+        looped = max(permutations(range(NUM_SLOTS), CODE_LENGTH),
+                     key=lambda code: sum(log_likelihoods[slot][position] for position, slot in enumerate(code)))
+    elapsed = time.perf_counter() - start
+    print(f"{'permutation loop':<16} {1000 * elapsed / REPEATS:.3f}ms/round")
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        gathered = tuple(codes[posterior.score_codes(clues, codes).argmax()].tolist())
+    elapsed = time.perf_counter() - start
+    print(f"{'matrix gather':<16} {1000 * elapsed / REPEATS:.3f}ms/round")
+    assert gathered == looped
+
+if __name__ == "__main__":
+    main()
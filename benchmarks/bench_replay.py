@@ -0,0 +1,39 @@
+"""Compare rebuilding archived games one at a time from their notesheets against replaying them in bulk, and against replaying notesheets which are already packed.
+
+Run with `python benchmarks/bench_replay.py` once decryptogame and numpy are installed.
+"""
+from decryptogame.batch import play_seeded_game
+from decryptogame.game import Game
+from decryptogame.replay import pack_notesheets, replay_notesheets, replay_packed
+from decryptogame.sweep import RulesVariant
+from decryptogame.teams import RandomTeam
+from functools import partial
+import time
+
+NUM_GAMES = 20000
+
+def timed(label, replay):
+    start = time.perf_counter()
+    result = replay()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:.3f}s, {NUM_GAMES / elapsed:,.0f} games/s")
+    return result
+
+def main():
+    team_factories = [partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)]
+    notesheets = [play_seeded_game(team_factories, seed).notesheet for seed in range(NUM_GAMES)]
+    # re-score under house rules which end games sooner than the archived rules did
+    variant = RulesVariant(miscommunications=1, count_first_round=True)
+
+    def rebuild(notesheet):
+        rules = variant.game()
+        return Game(notesheet=notesheet, end_conditions=rules.end_conditions, interception_func=rules.interception_func)
+
+    games = timed("one game at a time", lambda: [rebuild(notesheet) for notesheet in notesheets])
+    results = timed("bulk from notesheets", lambda: replay_notesheets(notesheets, variant.game))
+    packed = pack_notesheets(notesheets)
+    timed("bulk from packed", lambda: replay_packed(packed, variant.game))
+    assert [game.winner() for game in games] == [results.winner(index) for index in range(NUM_GAMES)]
+
+if __name__ == "__main__":
+    main()
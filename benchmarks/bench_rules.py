@@ -0,0 +1,38 @@
+"""Compare scoring rounds with the built-in rules, which Game scores directly, against equivalent custom rule functions, which Game calls per note.
+
+Run with `python benchmarks/bench_rules.py` once decryptogame is installed.
+"""
+from decryptogame.components import Note
+from decryptogame.game import Game, interception_rule, miscommunication_rule
+from functools import partial
+import timeit
+
+ROUNDS = 8
+REPEATS = 5
+NUMBER = 20000
+
+round_notes = [
+    Note(clues=("a", "b", "c"), attempted_interception=(2, 3, 1), attempted_decipher=(2, 3, 1), correct_code=(0, 3, 1)),
+    Note(clues=("dog", "foot", "bar"), attempted_interception=(2, 1, 3), attempted_decipher=(2, 1, 3), correct_code=(2, 1, 3))
+]
+
+def score_game(**rules):
+    game = Game(**rules)
+    for _ in range(ROUNDS):
+        game.process_round_notes(round_notes)
+    return game
+
+def main():
+    # wrapping the built-in rules makes Game fall back to calling them per note
+    custom_rules = dict(miscommunication_func=partial(miscommunication_rule),
+                        interception_func=partial(interception_rule))
+    assert score_game().data == score_game(**custom_rules).data
+
+    built_in = min(timeit.repeat(score_game, repeat=REPEATS, number=NUMBER))
+    custom = min(timeit.repeat(lambda: score_game(**custom_rules), repeat=REPEATS, number=NUMBER))
+    print(f"built-in rules: {built_in / NUMBER * 1e6:.2f} us per {ROUNDS}-round game")
+    print(f"custom rules:   {custom / NUMBER * 1e6:.2f} us per {ROUNDS}-round game")
+    print(f"speedup:        {custom / built_in:.2f}x")
+
+if __name__ == "__main__":
+    main()
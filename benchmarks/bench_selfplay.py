@@ -0,0 +1,27 @@
+"""Measure the rate at which self-play games are played, turned into decision records and written to shuffled shards, on one core and across a process pool.
+
+Run with `python benchmarks/bench_selfplay.py` once decryptogame and numpy are installed.
+"""
+from decryptogame.selfplay import generate_selfplay
+from decryptogame.teams import RandomTeam
+from functools import partial
+import os
+import tempfile
+import time
+
+NUM_GAMES = 20000
+
+def timed(label, **options):
+    team_factories = [partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)]
+    with tempfile.TemporaryDirectory() as path:
+        start = time.perf_counter()
+        summary = generate_selfplay(team_factories, range(NUM_GAMES), path, **options)
+        elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:.3f}s, {summary.records / elapsed:,.0f} decisions/s in {len(summary.shards)} shards")
+
+def main():
+    timed("serial", backend="serial")
+    timed(f"{os.cpu_count()} processes", backend="processes")
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,30 @@
 Modules exported by this package:
 
 - `generators`: Provide clue and code generators. These are used to help initialize teams or rounds, but can be replaced with custom input.
-- `teams`: Provide team interfaces/protocols and ready-to-go implementations. The CommandLineTeam can be used for fast developer interaction.
+- `difficulty`: Build and read an on-disk index of keyword pair and card difficulty, which generators use to deal cards of a chosen difficulty.
+- `teams`: Provide team interfaces/protocols and ready-to-go implementations. The CommandLineTeam can be used for fast developer interaction, and the RandomTeam for simulation baselines.
 - `play`: Provide game and round procedures. They have been brought into the namespace for convenience.
+- `validators`: Provide clue validators which enforce rules such as clues not containing keywords, and penalties for invalid clues.
+- `events`: Provide typed game events and an event bus, so logging, dashboards and replay capture can observe games without wrapping teams.
+- `steps`: Provide a resumable game which is played one phase at a time. It can be paused, pickled and multiplexed by a scheduler.
+- `checkpoint`: Provide compact game records and a tournament runner which checkpoints its progress, so it can resume after an interruption.
+- `artifacts`: Provide a store for large read-only team artifacts, which are loaded once and shared with worker processes.
+- `batch`: Play batches of seeded games concurrently in threads or processes, keeping a compact result for each game.
+- `distributed`: Distribute seeded games across hosts through a work queue, with a coordinator which retries failed chunks and pluggable transports.
+- `sweep`: Play games for a grid of house rules variants across worker processes, stopping each variant early once its rates are known, and write a results table.
+- `power`: Compare two teams with a sequential test, playing games in growing batches only until the test decides, and report the games saved.
+- `regression`: Diff the decisions of an old and new team on every decision point of a corpus of archived games, in parallel, and report the outcomes which change.
+- `profile`: Profile seeded games from the command line, separating library time from team time, and write flamegraph-ready collapsed stacks.
+- `replay`: Replay many archived notesheets in bulk, computing the final game data and winner of each game under new rules. Requires the optional numpy dependency.
+- `selfplay`: Generate training data from self-play across a process pool, streaming each decision as a fixed-schema record into shuffled `.npy` shards. Requires the optional numpy dependency.
+- `neighbors`: Provide an approximate nearest neighbor index over word embeddings, and a reference guesser which deciphers clues with it. Requires the optional numpy dependency.
+- `posterior`: Provide a Bayesian posterior over which keyword slot each of an opponent's clues refers to, and an intercepter which guesses the most probable code. Requires the optional numpy dependency.
+- `openings`: Build and read an on-disk opening book of a team's first-round decisions, searched offline in parallel, so players skip their search when the answer is known.
+- `analytics`: Export notesheets as columnar tables to Parquet or Arrow, and query them. Requires the optional pyarrow dependency.
+- `shared`: Provide a game data backend in shared memory, so other processes can read live game data without pickling.
 - `game`: Provide a game object which manages game state, and scoring rules. Game has been brought into the namespace for convenience.
+- `features`: Provide notesheet features, such as the clues given for each keyword slot, which a game keeps up to date for its teams.
+- `interning`: Provide a clue intern table, so the notes of many games store shared clue ids instead of separate strings.
 - `components`: Provide several game components. They have been brought into the namespace for convenience.
 - `end_criteria`: EndConditions which determine when a game ends, and the winner or loser.
 """
@@ -0,0 +1,190 @@
+from collections.abc import Iterable, Sequence
+from decryptogame.components import GameData
+from decryptogame.game import Game
+from itertools import repeat
+import os
+from typing import Optional
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+DEFAULT_BATCH_ROWS = 65536
+
+# one row per (game, round, team)
+COLUMNS = ["game", "round", "team", "label", "clues", "correct_code", "attempted_interception", "attempted_decipher", "miscommunication", "intercepted"]
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ImportError("pyarrow is required for Arrow and Parquet export. Install it with `pip install decryptogame[analytics]`.")
+
+
+def _optional_list(values: Optional[Iterable]) -> Optional[list]:
+    return list(values) if values is not None else None
+
+def notesheet_rows(game: Game, game_id: int = 0, labels: Optional[Sequence[str]] = None) -> Iterable[tuple]:
+    """Flatten the notesheet of a game into rows, one per round and team. The miscommunication and interception flags are derived by replaying the game's rule functions.
+    Decisions skipped by fast outcome games are None in their notes, and are stored as nulls.
+
+    Args:
+        game (Game): The game to flatten.
+        game_id (int, optional): The id stored in the game column. Defaults to 0.
+        labels (Optional[Sequence[str]], optional): A label for each team, such as the name of the bot playing it. Defaults to None.
+
+    Yields:
+        tuple: A row with a value for each of COLUMNS.
+    """
+    data = GameData()
+    for round_number, round_notes in enumerate(game.notesheet):
+        for team_name, note in enumerate(round_notes):
+            miscommunication = game.miscommunication_func(note, data)
+            intercepted = game.interception_func(note, data)
+            yield (game_id, round_number, team_name, labels[team_name] if labels is not None else None,
+                   list(game.decode_clues(note.clues)) if note.clues is not None else None, list(note.correct_code),
+                   _optional_list(note.attempted_interception), _optional_list(note.attempted_decipher),
+                   bool(miscommunication), bool(intercepted))
+            data.miscommunications[team_name] += miscommunication
+            data.interceptions[not team_name] += intercepted
+        data.rounds_played += 1
+
+
+def notesheet_columns(games: Iterable[Game], labels: Optional[Iterable[Sequence[str]]] = None, *, first_game_id: int = 0) -> dict[str, list]:
+    """Flatten the notesheets of several games into columns, one row per game, round and team.
+
+    Args:
+        games (Iterable[Game]): The games to flatten. Games are numbered in order, starting from first_game_id.
+        labels (Optional[Iterable[Sequence[str]]], optional): A label for each team of each game. Defaults to None.
+        first_game_id (int, optional): The id of the first game. Defaults to 0.
+
+    Returns:
+        dict[str, list]: A list of values for each of COLUMNS.
+    """
+    labels = labels if labels is not None else repeat(None)
+    rows = [row for game_id, (game, game_labels) in enumerate(zip(games, labels), first_game_id)
+            for row in notesheet_rows(game, game_id, game_labels)]
+    return {column: list(values) for column, values in zip(COLUMNS, zip(*rows))} if rows else {column: [] for column in COLUMNS}
+
+
+def notesheet_schema() -> "pyarrow.Schema":
+    """Get the Arrow schema of exported notesheets. Clues and labels are dictionary-encoded, so each distinct string is stored once and referenced by id.
+
+    Returns:
+        pyarrow.Schema: The schema of exported notesheets.
+    """
+    _require_pyarrow()
+    code = pyarrow.list_(pyarrow.int8())
+    return pyarrow.schema([
+        ("game", pyarrow.int64()),
+        ("round", pyarrow.int16()),
+        ("team", pyarrow.int8()),
+        ("label", pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+        ("clues", pyarrow.list_(pyarrow.dictionary(pyarrow.int32(), pyarrow.string()))),
+        ("correct_code", code),
+        ("attempted_interception", code),
+        ("attempted_decipher", code),
+        ("miscommunication", pyarrow.bool_()),
+        ("intercepted", pyarrow.bool_()),
+    ])
+
+
+def write_notesheets(games: Iterable[Game], path: str | os.PathLike, *,
+                     labels: Optional[Iterable[Sequence[str]]] = None,
+                     file_format: str = "parquet",
+                     batch_rows: int = DEFAULT_BATCH_ROWS
+                     ) -> int:
+    """Export the notesheets of several games to a Parquet file or an Arrow IPC stream. Games are flattened and written a batch at a time, so only one batch is held in memory.
+
+    Args:
+        games (Iterable[Game]): The games to export.
+        path (str | os.PathLike): The file to write.
+        labels (Optional[Iterable[Sequence[str]]], optional): A label for each team of each game, such as the names of the bots playing. Defaults to None.
+        file_format (str, optional): Either "parquet" or "arrow". Defaults to "parquet".
+        batch_rows (int, optional): The number of rows in each row group or record batch. Defaults to DEFAULT_BATCH_ROWS.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        ValueError: If the file format is unknown.
+
+    Returns:
+        int: The number of rows written.
+    """
+    _require_pyarrow()
+    schema = notesheet_schema()
+    if file_format == "parquet":
+        writer = pyarrow.parquet.ParquetWriter(path, schema)
+    elif file_format == "arrow":
+        # the stream format allows each batch to carry its own clue dictionary, where the file format does not
+        writer = pyarrow.ipc.new_stream(path, schema)
+    else:
+        raise ValueError(f"unknown file format {file_format!r}, expected 'parquet' or 'arrow'")
+
+    labels = labels if labels is not None else repeat(None)
+    rows_written = 0
+    batch = []
+    with writer:
+        for game_id, (game, game_labels) in enumerate(zip(games, labels)):
+            batch.extend(notesheet_rows(game, game_id, game_labels))
+            if len(batch) >= batch_rows:
+                writer.write_batch(_record_batch(batch, schema))
+                rows_written += len(batch)
+                batch = []
+        if batch:
+            writer.write_batch(_record_batch(batch, schema))
+            rows_written += len(batch)
+    return rows_written
+
+def _record_batch(rows: list[tuple], schema: "pyarrow.Schema") -> "pyarrow.RecordBatch":
+    columns = list(zip(*rows))
+    return pyarrow.RecordBatch.from_arrays([pyarrow.array(values).cast(field.type) for values, field in zip(columns, schema)], schema=schema)
+
+
+def read_notesheets(path: str | os.PathLike, *, columns: Optional[Sequence[str]] = None, file_format: str = "parquet") -> "pyarrow.Table":
+    """Read notesheets exported by write_notesheets.
+
+    Args:
+        path (str | os.PathLike): The file to read.
+        columns (Optional[Sequence[str]], optional): The columns to read. Defaults to None, reading every column.
+        file_format (str, optional): Either "parquet" or "arrow". Defaults to "parquet".
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        ValueError: If the file format is unknown.
+
+    Returns:
+        pyarrow.Table: The exported rows.
+    """
+    _require_pyarrow()
+    if file_format == "parquet":
+        return pyarrow.parquet.read_table(path, columns=columns)
+    if file_format != "arrow":
+        raise ValueError(f"unknown file format {file_format!r}, expected 'parquet' or 'arrow'")
+    with pyarrow.memory_map(str(path)) as source:
+        table = pyarrow.ipc.open_stream(source).read_all()
+    return table.select(columns) if columns is not None else table
+
+
+def rate_by(table: "pyarrow.Table", flag: str = "intercepted", by: Sequence[str] = ("round", "label")) -> dict[tuple, float]:
+    """Compute the rate of a flag, such as interceptions, grouped by some columns. For example, the interception rate by round number per bot.
+
+    Args:
+        table (pyarrow.Table): Notesheet rows, as returned by read_notesheets.
+        flag (str, optional): The flag column to compute the rate of. Defaults to "intercepted".
+        by (Sequence[str], optional): The columns to group by. Defaults to ("round", "label").
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+
+    Returns:
+        dict[tuple, float]: The rate of the flag for each group, keyed by the group's values in sorted order.
+    """
+    _require_pyarrow()
+    by = list(by)
+    table = table.select(by + [flag])
+    # dictionary-encoded columns can not be grouped on directly
+    table = pyarrow.table({name: column.cast(column.type.value_type) if pyarrow.types.is_dictionary(column.type) else column
+                           for name, column in zip(table.column_names, table.columns)})
+    grouped = table.group_by(by).aggregate([(flag, "mean")]).sort_by([(column, "ascending") for column in by]).to_pydict()
+    return {tuple(grouped[column][i] for column in by): rate for i, rate in enumerate(grouped[f"{flag}_mean"])}
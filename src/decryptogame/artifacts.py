@@ -0,0 +1,260 @@
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+import dataclasses
+from decryptogame.components import Keywords
+from decryptogame.teams import Team
+from functools import partial
+import multiprocessing
+from multiprocessing import shared_memory
+import os
+import pickle
+import threading
+import time
+from typing import Any, Optional
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# resource is only available on Unix
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+@dataclasses.dataclass(frozen=True)
+class ArtifactHandle:
+    """Picklable handle to an artifact stored in a shared memory block, which worker processes use to attach to it.
+
+    Attributes:
+        memory_name (str): The name of the shared memory block.
+        size (int): The number of bytes of the artifact.
+        kind (str): How the artifact is rebuilt: "ndarray" for NumPy arrays, "buffer" for other buffers, or "pickle" for any other object.
+        format (str): The dtype of an array, or the struct format of a buffer.
+        shape (tuple[int, ...]): The shape of an array or buffer.
+    """
+    memory_name: str
+    size: int
+    kind: str
+    format: str = "B"
+    shape: tuple[int, ...] = ()
+
+
+class ArtifactStore:
+    """Store of large read-only team artifacts, such as embedding matrices or clue lexicons, which are loaded once and shared with worker processes.
+
+    Workers started with fork inherit loaded artifacts copy-on-write. For other start methods, share copies the artifacts into shared memory,
+    and workers attach to them with attach. Arrays and buffers are attached without copying. Other objects are unpickled once per worker.
+    """
+    def __init__(self):
+        self.artifacts: dict[str, Any] = {}
+        self.handles: dict[str, ArtifactHandle] = {}
+        self._memories: list[shared_memory.SharedMemory] = []
+        self._owner = False
+        # team factories may run in several threads, and each artifact must only be loaded once
+        # the lock is reentrant, so a loader may load the artifacts it depends on
+        self._lock = threading.RLock()
+
+    def load(self, name: str, loader: Callable[[], Any]) -> Any:
+        """Load an artifact if it has not been loaded or attached in this process yet.
+
+        Args:
+            name (str): The name of the artifact.
+            loader (Callable[[], Any]): Loads the artifact.
+
+        Returns:
+            Any: The artifact.
+        """
+        with self._lock:
+            if name not in self.artifacts:
+                self.artifacts[name] = loader()
+            return self.artifacts[name]
+
+    def __getitem__(self, name: str) -> Any:
+        """Get an artifact, attaching to it in shared memory if it has not been used in this process yet.
+
+        Args:
+            name (str): The name of the artifact.
+
+        Raises:
+            KeyError: If the artifact was neither loaded nor shared.
+
+        Returns:
+            Any: The artifact.
+        """
+        artifact = self.artifacts.get(name)
+        if artifact is None:
+            with self._lock:
+                if name not in self.artifacts:
+                    self.artifacts[name] = self._rebuild(self.handles[name])
+                artifact = self.artifacts[name]
+        return artifact
+
+    def share(self) -> dict[str, ArtifactHandle]:
+        """Copy every loaded artifact into shared memory, so workers which are not forked can attach to them.
+
+        Returns:
+            dict[str, ArtifactHandle]: A handle for each artifact, to pass to attach in each worker.
+        """
+        for name, artifact in self.artifacts.items():
+            if name in self.handles:
+                continue
+            if numpy is not None and isinstance(artifact, numpy.ndarray):
+                data, kind, format, shape = numpy.ascontiguousarray(artifact).data.cast("B"), "ndarray", artifact.dtype.str, artifact.shape
+            elif isinstance(artifact, (bytes, bytearray, memoryview)) or hasattr(artifact, "buffer_info"):
+                view = memoryview(artifact)
+                data, kind, format, shape = view.cast("B"), "buffer", view.format, view.shape
+            else:
+                data, kind, format, shape = pickle.dumps(artifact, protocol=pickle.HIGHEST_PROTOCOL), "pickle", "B", ()
+            memory = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+            memory.buf[:len(data)] = data
+            self._memories.append(memory)
+            self.handles[name] = ArtifactHandle(memory.name, len(data), kind, format, tuple(shape))
+        self._owner = True
+        return dict(self.handles)
+
+    def attach(self, handles: dict[str, ArtifactHandle]):
+        """Attach to artifacts shared by another process. Artifacts are only rebuilt when first used.
+
+        Args:
+            handles (dict[str, ArtifactHandle]): The handles returned by share.
+        """
+        self.handles.update(handles)
+
+    def _rebuild(self, handle: ArtifactHandle) -> Any:
+        # the block must stay open for as long as views of it are in use, so it is kept with the store
+        memory = shared_memory.SharedMemory(name=handle.memory_name)
+        self._memories.append(memory)
+        data = memory.buf[:handle.size]
+        if handle.kind == "ndarray":
+            array = numpy.ndarray(handle.shape, dtype=numpy.dtype(handle.format), buffer=data)
+            array.flags.writeable = False
+            return array
+        if handle.kind == "buffer":
+            return data.toreadonly().cast(handle.format, handle.shape) if handle.shape else data.toreadonly()
+        return pickle.loads(data)
+
+    def pool(self, max_workers: Optional[int] = None, mp_context: Optional[multiprocessing.context.BaseContext] = None) -> ProcessPoolExecutor:
+        """Start a process pool whose workers can use this store's artifacts. Forked workers inherit them, and other workers attach to shared copies.
+
+        Args:
+            max_workers (Optional[int], optional): The number of workers. Defaults to None, in which case a worker per core is used.
+            mp_context (Optional[multiprocessing.context.BaseContext], optional): The multiprocessing context. Defaults to None, using the platform's default.
+
+        Returns:
+            ProcessPoolExecutor: The process pool.
+        """
+        start_method = (mp_context or multiprocessing).get_start_method()
+        if start_method == "fork":
+            return ProcessPoolExecutor(max_workers, mp_context=mp_context)
+        return ProcessPoolExecutor(max_workers, mp_context=mp_context, initializer=_attach_artifacts, initargs=(self.share(),))
+
+    def close(self):
+        """Release this process's artifacts and shared memory blocks, and free the blocks if this process shared them."""
+        self.artifacts.clear()
+        self.handles.clear()
+        for memory in self._memories:
+            memory.close()
+            if self._owner:
+                memory.unlink()
+        self._memories.clear()
+        self._owner = False
+
+
+# each process has one store, which worker processes inherit or attach to
+artifacts = ArtifactStore()
+
+def _attach_artifacts(handles: dict[str, ArtifactHandle]):
+    artifacts.attach(handles)
+
+def _build_team(factory: Callable[..., Team], names: Sequence[str], keywords: Keywords) -> Team:
+    return factory(keywords, **{name: artifacts[name] for name in names})
+
+def with_artifacts(factory: Callable[..., Team], *names: str) -> Callable[[Keywords], Team]:
+    """Wrap a team factory so it receives artifacts from the process's store as keyword arguments. The wrapped factory is picklable if the factory is.
+
+    Args:
+        factory (Callable[..., Team]): Builds a team given its keyword card and the artifacts as keyword arguments.
+        *names (str): The names of the artifacts the factory needs.
+
+    Returns:
+        Callable[[Keywords], Team]: A team factory which builds the team given its keyword card.
+    """
+    return partial(_build_team, factory, names)
+
+
+@dataclasses.dataclass(kw_only=True)
+class PoolMeasurement:
+    """Dataclass representing the startup time and memory use of a process pool.
+
+    Attributes:
+        startup_seconds (float): The time taken for every worker to start and finish a first task.
+        worker_rss (dict[int, int]): The resident memory of each worker in bytes, keyed by process id.
+        worker_pss (dict[int, int]): The proportional memory of each worker in bytes, which splits shared pages between the processes sharing them. Empty where unavailable.
+    """
+    startup_seconds: float
+    worker_rss: dict[int, int]
+    worker_pss: dict[int, int]
+
+    @property
+    def total_rss(self) -> int:
+        """Get the total resident memory of the workers, which counts shared pages once per worker.
+
+        Returns:
+            int: The total resident memory in bytes.
+        """
+        return sum(self.worker_rss.values())
+
+    @property
+    def total_pss(self) -> int:
+        """Get the total proportional memory of the workers, which counts shared pages once overall.
+
+        Returns:
+            int: The total proportional memory in bytes.
+        """
+        return sum(self.worker_pss.values())
+
+def process_memory() -> tuple[int, int]:
+    """Measure the memory of the current process.
+
+    Returns:
+        tuple[int, int]: The resident and proportional memory in bytes. Without /proc, the peak resident memory is returned and the proportional memory is 0,
+            and without the resource module, as on Windows, both are 0.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as file:
+            fields = {line.split(":")[0]: int(line.split()[1]) * 1024 for line in file if line.split(":")[0] in ("Rss", "Pss")}
+        return fields["Rss"], fields["Pss"]
+    except (OSError, KeyError):
+        if resource is None:
+            return 0, 0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024, 0
+
+def _worker_memory(names: Sequence[str], delay: float) -> tuple[int, int, int]:
+    for name in names:
+        artifacts[name]
+    # hold each task briefly, so every worker picks one up
+    time.sleep(delay)
+    return (os.getpid(), *process_memory())
+
+def measure_pool(executor_factory: Callable[[], Executor], num_workers: int, names: Sequence[str] = (), delay: float = 0.1) -> PoolMeasurement:
+    """Start a process pool and measure how long its workers take to start and how much memory they use once they have touched some artifacts.
+
+    Args:
+        executor_factory (Callable[[], Executor]): Starts the process pool, for example ArtifactStore.pool.
+        num_workers (int): The number of workers in the pool.
+        names (Sequence[str], optional): The artifacts each worker uses before being measured. Defaults to none.
+        delay (float, optional): How long each measuring task is held, so the tasks are spread across the workers. Defaults to 0.1.
+
+    Returns:
+        PoolMeasurement: The startup time and memory of the workers.
+    """
+    start = time.perf_counter()
+    with executor_factory() as executor:
+        measurements = list(executor.map(_worker_memory, [names] * num_workers, [delay] * num_workers))
+        startup_seconds = time.perf_counter() - start - delay
+    return PoolMeasurement(startup_seconds=startup_seconds,
+                           worker_rss={pid: rss for pid, rss, _ in measurements},
+                           worker_pss={pid: pss for pid, _, pss in measurements if pss})
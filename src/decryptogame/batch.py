@@ -0,0 +1,120 @@
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import dataclasses
+from decryptogame.components import Keywords, TeamName
+from decryptogame.game import Game
+from decryptogame.generators import RandomCodes, RandomKeywordCards
+from decryptogame.play import play_game
+from decryptogame.teams import Team
+from itertools import islice
+from typing import Optional
+
+DEFAULT_CHUNK_GAMES = 64
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class GameResult:
+    """Dataclass representing the compact result of a seeded game.
+
+    Attributes:
+        seed (int): The seed which decided the game's keyword cards and codes.
+        winner (Optional[TeamName]): The winner of the game, or None for a tie.
+        rounds_played (int): The number of rounds played.
+        miscommunications (tuple[int, ...]): The final miscommunication counts for each team.
+        interceptions (tuple[int, ...]): The final interception counts for each team.
+    """
+    seed: int
+    winner: Optional[TeamName]
+    rounds_played: int
+    miscommunications: tuple[int, ...]
+    interceptions: tuple[int, ...]
+
+
+def play_seeded_game(team_factories: Sequence[Callable[[Keywords], Team]], seed: int, *,
+                     game_factory: Callable[[], Game] = Game,
+                     card_lengths: Optional[Sequence[int]] = None,
+                     code_lengths: Optional[Sequence[int]] = None,
+                     fast_outcome: bool = False
+                     ) -> Game:
+    """Play a game whose keyword cards and codes are decided by a seed. Every object the game uses is built for it, so seeded games may be played in parallel threads.
+
+    Args:
+        team_factories (Sequence[Callable[[Keywords], Team]]): A factory for each team, which builds the team given its keyword card.
+        seed (int): The seed for the keyword cards and codes.
+        game_factory (Callable[[], Game], optional): Builds the game object. Defaults to Game.
+        card_lengths (Optional[Sequence[int]], optional): The number of keywords on each team's keyword card. Defaults to None, using DEFAULT_CARD_LENGTH.
+        code_lengths (Optional[Sequence[int]], optional): The lengths of each team's codes. Defaults to None, using DEFAULT_CODE_LENGTH.
+        fast_outcome (bool, optional): Whether to skip the decisions which can no longer change the winner. Defaults to False.
+
+    Returns:
+        Game: The game state after play.
+    """
+    keyword_cards = next(RandomKeywordCards(card_lengths, seed=seed))
+    teams = [factory(keywords) for factory, keywords in zip(team_factories, keyword_cards)]
+    round_codes = RandomCodes(keyword_cards, code_lengths, seed=seed)
+    return play_game(teams, game=game_factory(), round_codes=round_codes, fast_outcome=fast_outcome)
+
+def play_chunk(team_factories: Sequence[Callable[[Keywords], Team]], seeds: Iterable[int], **game_options) -> list[GameResult]:
+    """Play a seeded game for each seed and keep their compact results.
+
+    Args:
+        team_factories (Sequence[Callable[[Keywords], Team]]): A factory for each team, which builds the team given its keyword card.
+        seeds (Iterable[int]): The seed of each game.
+        **game_options: Options passed on to play_seeded_game.
+
+    Returns:
+        list[GameResult]: The result of each game, in the same order as the seeds.
+    """
+    results = []
+    for seed in seeds:
+        game = play_seeded_game(team_factories, seed, **game_options)
+        data = game.data
+        results.append(GameResult(seed=seed, winner=game.winner(), rounds_played=data.rounds_played,
+                                  miscommunications=tuple(data.miscommunications), interceptions=tuple(data.interceptions)))
+    return results
+
+
+def play_batch(team_factories: Sequence[Callable[[Keywords], Team]], seeds: Iterable[int], *,
+               backend: str = "threads",
+               max_workers: Optional[int] = None,
+               executor: Optional[Executor] = None,
+               chunk_games: int = DEFAULT_CHUNK_GAMES,
+               **game_options
+               ) -> list[GameResult]:
+    """Play a batch of seeded games concurrently, in chunks of games.
+
+    Threads suit teams which spend their time in code that releases the GIL, such as NumPy or other C extensions, or any team on a free-threaded build of Python,
+    since games and results are not pickled. Processes suit teams which run pure Python, but their team factories must be picklable.
+
+    Args:
+        team_factories (Sequence[Callable[[Keywords], Team]]): A factory for each team, which builds the team given its keyword card. Each game builds its own teams.
+        seeds (Iterable[int]): The seed of each game.
+        backend (str, optional): Either "threads", "processes" or "serial". Defaults to "threads".
+        max_workers (Optional[int], optional): The number of threads or processes. Defaults to None, using the executor's default.
+        executor (Optional[Executor], optional): The executor to play chunks with, in place of the backend. Defaults to None.
+        chunk_games (int, optional): The number of games in each chunk. Defaults to DEFAULT_CHUNK_GAMES.
+        **game_options: Options passed on to play_seeded_game.
+
+    Raises:
+        ValueError: If the backend is unknown.
+
+    Returns:
+        list[GameResult]: The result of each game, in the same order as the seeds.
+    """
+    seeds = iter(seeds)
+    chunks = iter(lambda: list(islice(seeds, chunk_games)), [])
+    if executor is None and backend == "serial":
+        return [result for chunk in chunks for result in play_chunk(team_factories, chunk, **game_options)]
+    if executor is not None:
+        owned_executor = None
+    elif backend == "threads":
+        owned_executor = executor = ThreadPoolExecutor(max_workers)
+    elif backend == "processes":
+        owned_executor = executor = ProcessPoolExecutor(max_workers)
+    else:
+        raise ValueError(f"unknown backend {backend!r}, expected 'threads', 'processes' or 'serial'")
+    try:
+        futures = [executor.submit(play_chunk, team_factories, chunk, **game_options) for chunk in chunks]
+        return [result for future in futures for result in future.result()]
+    finally:
+        if owned_executor is not None:
+            owned_executor.shutdown(cancel_futures=True)
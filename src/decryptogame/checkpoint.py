@@ -0,0 +1,274 @@
+from collections.abc import Callable, Sequence
+import dataclasses
+from decryptogame.components import GameData, Keywords, Note
+from decryptogame.end_criteria import InterceptionEndCondition, MiscommunicationEndCondition, RoundEndCondition
+from decryptogame.game import Game, interception_miscommunication_diff_tiebreaker, interception_rule, miscommunication_rule
+from decryptogame.generators import RandomCodes, RandomKeywordCards
+from decryptogame.play import play_round
+from decryptogame.teams import Team
+import json
+import os
+from pathlib import Path
+import pickle
+from typing import Any, Optional
+
+# rule functions and end condition classes are stored by name, so they must be registered to be checkpointed
+REGISTRY: dict[str, Any] = {}
+
+def register(obj: Any, name: Optional[str] = None) -> Any:
+    """Register a rule function or end condition class so games using it can be checkpointed. May be used as a decorator.
+
+    Args:
+        obj (Any): The rule function or end condition class to register.
+        name (Optional[str], optional): The name to store it by. Defaults to the object's __name__.
+
+    Returns:
+        Any: The registered object.
+    """
+    REGISTRY[name if name is not None else obj.__name__] = obj
+    return obj
+
+for builtin in [miscommunication_rule, interception_rule, interception_miscommunication_diff_tiebreaker,
+                MiscommunicationEndCondition, InterceptionEndCondition, RoundEndCondition]:
+    register(builtin)
+
+
+def registered_name(obj: Any) -> str:
+    """Find the name a rule function or end condition class was registered by.
+
+    Args:
+        obj (Any): The registered object.
+
+    Raises:
+        ValueError: If the object was not registered.
+
+    Returns:
+        str: The name the object was registered by.
+    """
+    for name, registered in REGISTRY.items():
+        if registered is obj:
+            return name
+    raise ValueError(f"{obj!r} is not registered, so it cannot be checkpointed")
+
+
+def dump_note(note: Note) -> list:
+    """Convert a note to a compact JSON-compatible record.
+
+    Args:
+        note (Note): The note to convert.
+
+    Returns:
+        list: The clues, attempted interception, attempted decipher and correct code of the note. Decisions skipped by fast outcome games are None.
+    """
+    return [_optional_list(note.clues), _optional_list(note.attempted_interception), _optional_list(note.attempted_decipher), list(note.correct_code)]
+
+def load_note(record: Sequence) -> Note:
+    """Convert a record created by dump_note back to a note.
+
+    Args:
+        record (Sequence): The note record.
+
+    Returns:
+        Note: The restored note.
+    """
+    clues, attempted_interception, attempted_decipher, correct_code = record
+    return Note(clues=_optional_tuple(clues),
+                attempted_interception=_optional_tuple(attempted_interception),
+                attempted_decipher=_optional_tuple(attempted_decipher),
+                correct_code=tuple(correct_code))
+
+def _optional_list(values: Optional[Sequence]) -> Optional[list]:
+    return list(values) if values is not None else None
+
+def _optional_tuple(values: Optional[Sequence]) -> Optional[tuple]:
+    return tuple(values) if values is not None else None
+
+
+def dump_game(game: Game, *, start_round: int = 0) -> dict:
+    """Convert a game to a compact JSON-compatible record. Rule functions and end conditions are stored by registered name.
+
+    Args:
+        game (Game): The game to convert.
+        start_round (int, optional): The first round of the notesheet to include, so a checkpoint only holds rounds played since the last one. Defaults to 0.
+
+    Returns:
+        dict: The game record.
+    """
+    return {
+        "start_round": start_round,
+        "notesheet": [[dump_note(note) for note in round_notes] for round_notes in game.notesheet[start_round:]],
+        "data": dataclasses.asdict(game._data),
+        "end_conditions": [[registered_name(type(end_condition)), vars(end_condition)] for end_condition in game.end_conditions],
+        "miscommunication_func": registered_name(game.miscommunication_func),
+        "interception_func": registered_name(game.interception_func),
+        "tiebreaker_func": registered_name(game.tiebreaker_func),
+    }
+
+def load_game(record: dict, game: Game = None) -> Game:
+    """Restore a game from a record created by dump_game.
+
+    Args:
+        record (dict): The game record.
+        game (Game, optional): The game to extend with the record's rounds, for records which do not start at the first round. If None, a new game is created.
+
+    Raises:
+        ValueError: If the record's rounds do not follow on from the game's notesheet.
+
+    Returns:
+        Game: The restored game.
+    """
+    if game is None:
+        game = Game(end_conditions=[REGISTRY[name](**params) for name, params in record["end_conditions"]],
+                    miscommunication_func=REGISTRY[record["miscommunication_func"]],
+                    interception_func=REGISTRY[record["interception_func"]],
+                    tiebreaker_func=REGISTRY[record["tiebreaker_func"]])
+    if record["start_round"] != len(game.notesheet):
+        raise ValueError(f"record starts at round {record['start_round']} but the game has played {len(game.notesheet)} rounds")
+    game.notesheet.extend([load_note(note) for note in round_notes] for round_notes in record["notesheet"])
+    # the data is stored rather than replayed, so restoring does not depend on the rule functions
+    game._data = GameData(**record["data"])
+    return game
+
+
+class Tournament:
+    """A series of games between two teams which checkpoints its progress, so it can resume exactly where it stopped if it is interrupted.
+
+    Checkpoints are written to a directory as numbered segment files. Each segment only holds the rounds played since the previous one,
+    and is written to a temporary file which is then atomically renamed, so a checkpoint is never partially written.
+    The teams of a game still in progress are pickled next to the segment, so seeded or learning teams resume with the state they had.
+
+    Args:
+        team_factories (Sequence[Callable[[Keywords], Team]]): A factory for each team, which builds the team given its keyword card.
+        num_games (int): The number of games to play.
+        path (str | os.PathLike): The directory to write checkpoints to.
+        seed (int, optional): The random seed for the keyword cards and codes of every game. Defaults to 0.
+        checkpoint_rounds (int, optional): The number of rounds to play between checkpoints. Defaults to 64.
+        game_factory (Callable[[], Game], optional): Builds the game object for each new game. Defaults to Game.
+        checkpoint_teams (bool, optional): Whether to pickle the teams of the game in progress at each checkpoint. If False, for teams which
+            cannot be pickled, the game's teams are rebuilt by their factories on resuming, which only resumes exactly for stateless teams. Defaults to True.
+    """
+    def __init__(self, team_factories: Sequence[Callable[[Keywords], Team]], num_games: int, path: str | os.PathLike, *,
+                 seed: int = 0,
+                 checkpoint_rounds: int = 64,
+                 game_factory: Callable[[], Game] = Game,
+                 checkpoint_teams: bool = True
+                 ):
+        self.team_factories = team_factories
+        self.num_games = num_games
+        self.path = Path(path)
+        self.seed = seed
+        self.checkpoint_rounds = checkpoint_rounds
+        self.game_factory = game_factory
+        self.checkpoint_teams = checkpoint_teams
+        self.games: list[Game] = []
+        self.keyword_cards: list[Sequence[Keywords]] = []
+        self.keyword_generator = RandomKeywordCards(seed=seed)
+        self._round_codes: Optional[RandomCodes] = None
+        # the teams of the game in progress, or None until they are built
+        self._teams: Optional[list[Team]] = None
+        self._segments = 0
+        self._first_unsaved = 0
+        # the number of rounds of each game already checkpointed
+        self._saved_rounds: list[int] = []
+
+    def restore(self):
+        """Restore the games and generator states from the checkpoints in the tournament directory, if there are any."""
+        for segment in sorted(self.path.glob("*.jsonl")):
+            with open(segment) as file:
+                for line in file:
+                    self._load_record(json.loads(line))
+            self._segments += 1
+        # only the last segment's teams are kept, and only if its game was in progress
+        if self._segments and self._teams_path(self._segments - 1).exists():
+            with open(self._teams_path(self._segments - 1), "rb") as file:
+                self._teams = pickle.load(file)
+
+    def run(self) -> list[Game]:
+        """Restore from any checkpoints and play the remaining games, checkpointing every checkpoint_rounds rounds.
+
+        Returns:
+            list[Game]: The games played in the tournament.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        if not self._segments:
+            self.restore()
+        unsaved_rounds = 0
+        while True:
+            if not self.games or self.games[-1].game_over():
+                if len(self.games) == self.num_games:
+                    break
+                self._start_game()
+            game = self.games[-1]
+            if self._teams is None:
+                self._teams = [factory(keywords) for factory, keywords in zip(self.team_factories, self.keyword_cards[-1])]
+            while not game.game_over():
+                play_round(self._teams, game, next(self._round_codes))
+                unsaved_rounds += 1
+                if unsaved_rounds == self.checkpoint_rounds:
+                    self.checkpoint()
+                    unsaved_rounds = 0
+        self.checkpoint()
+        return self.games
+
+    def checkpoint(self):
+        """Write the rounds played since the last checkpoint to a new segment file."""
+        records = []
+        # games are played in order, so only the games since the last checkpoint's in-flight game have unsaved rounds
+        for game_index in range(self._first_unsaved, len(self.games)):
+            game = self.games[game_index]
+            saved_rounds = self._saved_rounds[game_index]
+            if saved_rounds == len(game.notesheet) and saved_rounds:
+                continue
+            record = {"game": game_index, "game_record": dump_game(game, start_round=saved_rounds)}
+            if not saved_rounds:
+                record["keyword_cards"] = self.keyword_cards[game_index]
+            records.append(record)
+            self._saved_rounds[game_index] = len(game.notesheet)
+        self._first_unsaved = max(len(self.games) - 1, 0)
+        if not records:
+            return
+        records.append({"keyword_state": self.keyword_generator.getstate(),
+                        "codes_state": self._round_codes.getstate()})
+        # the teams are written first, so a segment is never restored without the teams it was written with
+        if self.checkpoint_teams and self._teams is not None and not self.games[-1].game_over():
+            self._write_atomically(self._teams_path(self._segments), pickle.dumps(self._teams, protocol=pickle.HIGHEST_PROTOCOL))
+        self._write_atomically(self.path / f"{self._segments:08d}.jsonl", "".join(json.dumps(record) + "\n" for record in records).encode())
+        if self._segments:
+            self._teams_path(self._segments - 1).unlink(missing_ok=True)
+        self._segments += 1
+
+    def _teams_path(self, segment: int) -> Path:
+        return self.path / f"{segment:08d}.teams.pickle"
+
+    @staticmethod
+    def _write_atomically(path: Path, data: bytes):
+        temporary_path = path.with_name(path.name + ".tmp")
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+
+    def _start_game(self):
+        keyword_cards = next(self.keyword_generator)
+        self.keyword_cards.append(keyword_cards)
+        self.games.append(self.game_factory())
+        self._teams = None
+        self._saved_rounds.append(0)
+        self._round_codes = RandomCodes(keyword_cards, seed=self.seed * self.num_games + len(self.games))
+
+    def _load_record(self, record: dict):
+        if "keyword_state" in record:
+            self.keyword_generator.setstate(record["keyword_state"])
+            self._round_codes = RandomCodes(self.keyword_cards[-1])
+            self._round_codes.setstate(record["codes_state"])
+            return
+        game_index = record["game"]
+        if game_index == len(self.games):
+            self.keyword_cards.append([tuple(keywords) for keywords in record["keyword_cards"]])
+            self.games.append(load_game(record["game_record"]))
+            self._saved_rounds.append(0)
+        else:
+            load_game(record["game_record"], self.games[game_index])
+        self._saved_rounds[game_index] = len(self.games[game_index].notesheet)
+        self._first_unsaved = game_index
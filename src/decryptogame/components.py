@@ -1,3 +1,4 @@
+from contextlib import AbstractContextManager, nullcontext
 import dataclasses
 from copy import deepcopy
 from collections.abc import Sequence
@@ -54,13 +55,21 @@ class GameData:
         """
         return deepcopy(self)
 
+    def batch(self) -> AbstractContextManager:
+        """Group the updates of a round, so game data shared with other processes publishes the round at once rather than one counter at a time.
+
+        Returns:
+            AbstractContextManager: A context manager to make the updates in. It does nothing, as GameData is not shared.
+        """
+        return nullcontext()
+
 @dataclasses.dataclass(kw_only=True)
 class Note:
     """Class representing a note with information about the code, clues, attempted decipher and interception of a team in a given round.
 
     Attributes:
         clues (Clue): The clue information associated with the note.
-        attempted_interception (Code): The code for the attempted interception.
+        attempted_interception (Code): The code the opposing team guessed when attempting to intercept this note.
         attempted_decipher (Code): The code for the attempted decipher.
         correct_code (Code): The correct deciphered code.
     """
@@ -0,0 +1,249 @@
+"""Build and read an on-disk index of how difficult keyword pairs and keyword cards are, for dealing cards of a chosen difficulty.
+
+Build the index over the official word list with `python -m decryptogame.difficulty keywords.idx`.
+"""
+import argparse
+from collections.abc import Callable, Iterable, Sequence
+import decryptogame.official_words.english as english
+import hashlib
+from itertools import combinations
+import mmap
+import os
+import random
+import struct
+from typing import Optional
+
+DEFAULT_CARD_LENGTH = 4
+DEFAULT_NUM_BANDS = 8
+DEFAULT_BUCKET_CAPACITY = 2048
+# cards sampled to find the band edges, and at most this many times the buckets' total capacity to fill them
+EDGE_SAMPLES = 20000
+MAX_FILL_FACTOR = 50
+
+MAGIC = b"DKPI"
+VERSION = 1
+# magic, version, number of words, card length, number of bands, bucket capacity and the word list digest, padded so the arrays after it are aligned
+HEADER = struct.Struct("<4sHIHHI20s2x")
+PAIR_SCORE = struct.Struct("<e")
+
+
+def words_digest(words: Sequence[str]) -> bytes:
+    """Digest a word list, so an index is only used with the words it was built over.
+
+    Args:
+        words (Sequence[str]): The word list.
+
+    Returns:
+        bytes: The 20 byte digest.
+    """
+    return hashlib.sha1("\n".join(words).encode()).digest()
+
+def letter_similarity(word1: str, word2: str) -> float:
+    """Score how alike two words are by the letters they share, from 0 for no shared letters to 1 for the same letters.
+    This stands in for a semantic similarity, such as the cosine similarity of word embeddings, where none is available.
+
+    Args:
+        word1 (str): The first word.
+        word2 (str): The second word.
+
+    Returns:
+        float: The Jaccard similarity of the words' sets of letters.
+    """
+    letters1, letters2 = set(word1.casefold()), set(word2.casefold())
+    return len(letters1 & letters2) / len(letters1 | letters2)
+
+def pair_offset(i: int, j: int, num_words: int) -> int:
+    """Find where the score of a word pair is stored in the upper-triangular matrix of pair scores, which is stored row by row.
+
+    Args:
+        i (int): The index of one word.
+        j (int): The index of the other word, which must differ from i.
+        num_words (int): The number of words.
+
+    Returns:
+        int: The offset of the pair's score.
+    """
+    if i > j:
+        i, j = j, i
+    return i * (2 * num_words - i - 1) // 2 + (j - i - 1)
+
+
+class DifficultyIndex:
+    """Memory-mapped index of the difficulty of keyword pairs and cards over a word list.
+
+    A pair's difficulty is its similarity score, since keywords which are alike are harder to clue apart, and a card's difficulty is the mean score of its pairs.
+    The index stores every pair's score as an upper-triangular float16 matrix, and buckets of cards for each difficulty band, so a card in a band is drawn in O(1).
+
+    Args:
+        path (str | os.PathLike): The path of the index, as written by build_difficulty_index.
+
+    Attributes:
+        num_words (int): The number of words indexed.
+        card_length (int): The number of keywords on each bucketed card.
+        num_bands (int): The number of difficulty bands.
+        digest (bytes): The digest of the word list the index was built over.
+        band_edges (list[float]): The lowest card difficulty of each band, followed by the highest difficulty of the last band. Bands hold about as many cards each.
+        bucket_sizes (list[int]): The number of cards in each band's bucket.
+    """
+    def __init__(self, path: str | os.PathLike):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.num_words, self.card_length, self.num_bands, self.bucket_capacity, self.digest = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} keyword difficulty index")
+        view = memoryview(self._mmap)
+        offset = HEADER.size
+        self.band_edges = list(view[offset:offset + 8 * (self.num_bands + 1)].cast("d"))
+        offset += 8 * (self.num_bands + 1)
+        self.bucket_sizes = list(view[offset:offset + 4 * self.num_bands].cast("I"))
+        offset += 4 * self.num_bands
+        num_pairs = self.num_words * (self.num_words - 1) // 2
+        # memoryview can not cast to float16, so scores are unpacked one at a time from the map
+        self._scores_offset = offset
+        offset += 2 * num_pairs
+        self.buckets = view[offset:offset + 2 * self.num_bands * self.bucket_capacity * self.card_length].cast("H")
+
+    def pair_difficulty(self, i: int, j: int) -> float:
+        """Get the difficulty of a pair of words.
+
+        Args:
+            i (int): The index of one word.
+            j (int): The index of the other word.
+
+        Returns:
+            float: The pair's similarity score.
+        """
+        return PAIR_SCORE.unpack_from(self._mmap, self._scores_offset + 2 * pair_offset(i, j, self.num_words))[0]
+
+    def card_difficulty(self, card: Sequence[int]) -> float:
+        """Get the difficulty of a card, the mean difficulty of its pairs of words.
+
+        Args:
+            card (Sequence[int]): The indices of the card's words.
+
+        Returns:
+            float: The card's difficulty.
+        """
+        pairs = list(combinations(card, 2))
+        return sum(self.pair_difficulty(i, j) for i, j in pairs) / len(pairs) if pairs else 0.0
+
+    def cross_difficulty(self, card1: Sequence[int], card2: Sequence[int]) -> float:
+        """Get how alike two teams' cards are, the mean difficulty of the pairs of one word from each, since alike cards make the opponent's clues misleading.
+
+        Args:
+            card1 (Sequence[int]): The indices of one team's words.
+            card2 (Sequence[int]): The indices of the other team's words.
+
+        Returns:
+            float: The cards' cross difficulty.
+        """
+        return sum(self.pair_difficulty(i, j) for i in card1 for j in card2) / (len(card1) * len(card2))
+
+    def band(self, difficulty: float) -> int:
+        """Find the band of a card difficulty.
+
+        Args:
+            difficulty (float): The card difficulty.
+
+        Returns:
+            int: The band, from 0 for the easiest cards to num_bands - 1 for the hardest.
+        """
+        for band in range(self.num_bands - 1):
+            if difficulty < self.band_edges[band + 1]:
+                return band
+        return self.num_bands - 1
+
+    def draw(self, band: int, rng: random.Random) -> tuple[int, ...]:
+        """Draw a card from a band's bucket.
+
+        Args:
+            band (int): The difficulty band.
+            rng (random.Random): The random number generator to draw with.
+
+        Raises:
+            ValueError: If the band's bucket is empty.
+
+        Returns:
+            tuple[int, ...]: The indices of the card's words.
+        """
+        if not self.bucket_sizes[band]:
+            raise ValueError(f"difficulty band {band} has no cards")
+        start = (band * self.bucket_capacity + rng.randrange(self.bucket_sizes[band])) * self.card_length
+        return tuple(self.buckets[start:start + self.card_length])
+
+    def close(self):
+        """Release the memory map. Views of the index can not be used afterwards."""
+        self.buckets.release()
+        self._mmap.close()
+
+
+def build_difficulty_index(path: str | os.PathLike, words: Sequence[str] = english.words, *,
+                           score_pair: Callable[[str, str], float] = letter_similarity,
+                           card_length: int = DEFAULT_CARD_LENGTH,
+                           num_bands: int = DEFAULT_NUM_BANDS,
+                           bucket_capacity: int = DEFAULT_BUCKET_CAPACITY,
+                           seed: Optional[int] = 0):
+    """Build a difficulty index offline and write it to disk. Every pair of words is scored, band edges are set at quantiles of sampled cards' difficulties,
+    and random cards are sorted into their band's bucket until every bucket is full.
+
+    Args:
+        path (str | os.PathLike): The path to write the index to. It is written to a temporary file first, and only replaces the path once complete.
+        words (Sequence[str], optional): The words to index. Defaults to the official English word list.
+        score_pair (Callable[[str, str], float], optional): Scores how alike two words are, such as the cosine similarity of their embeddings. Defaults to letter_similarity.
+        card_length (int, optional): The number of keywords on each card. Defaults to DEFAULT_CARD_LENGTH.
+        num_bands (int, optional): The number of difficulty bands. Defaults to DEFAULT_NUM_BANDS.
+        bucket_capacity (int, optional): The most cards kept for each band. Defaults to DEFAULT_BUCKET_CAPACITY.
+        seed (Optional[int], optional): The random seed for sampling cards. Defaults to 0.
+    """
+    num_words = len(words)
+    scores = [score_pair(words[i], words[j]) for i in range(num_words) for j in range(i + 1, num_words)]
+    # round the scores to float16 as stored, so the bands agree with the difficulties read back from the index
+    scores = list(struct.unpack(f"<{len(scores)}e", struct.pack(f"<{len(scores)}e", *scores)))
+    card_difficulty = lambda card: sum(scores[pair_offset(i, j, num_words)] for i, j in combinations(card, 2)) / max(len(card) * (len(card) - 1) // 2, 1)
+
+    rng = random.Random(seed)
+    indices = range(num_words)
+    sampled = sorted(card_difficulty(rng.sample(indices, card_length)) for _ in range(EDGE_SAMPLES))
+    band_edges = [sampled[len(sampled) * band // num_bands] for band in range(num_bands)] + [sampled[-1]]
+
+    buckets: list[list[tuple[int, ...]]] = [[] for _ in range(num_bands)]
+    for _ in range(MAX_FILL_FACTOR * num_bands * bucket_capacity):
+        card = tuple(rng.sample(indices, card_length))
+        difficulty = card_difficulty(card)
+        band = next((band for band in range(num_bands - 1) if difficulty < band_edges[band + 1]), num_bands - 1)
+        if len(buckets[band]) < bucket_capacity:
+            buckets[band].append(card)
+            if all(len(bucket) == bucket_capacity for bucket in buckets):
+                break
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, num_words, card_length, num_bands, bucket_capacity, words_digest(words)))
+        file.write(struct.pack(f"<{num_bands + 1}d", *band_edges))
+        file.write(struct.pack(f"<{num_bands}I", *(len(bucket) for bucket in buckets)))
+        file.write(struct.pack(f"<{len(scores)}e", *scores))
+        for bucket in buckets:
+            padded = [index for card in bucket for index in card] + [0] * ((bucket_capacity - len(bucket)) * card_length)
+            file.write(struct.pack(f"<{len(padded)}H", *padded))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    """Run the command line which builds a difficulty index over the official word list.
+
+    Args:
+        argv (Optional[Iterable[str]], optional): The command line arguments. Defaults to None, using sys.argv.
+    """
+    parser = argparse.ArgumentParser(prog="python -m decryptogame.difficulty", description="Build a keyword difficulty index over the official word list.")
+    parser.add_argument("path", help="the path to write the index to")
+    parser.add_argument("--card-length", type=int, default=DEFAULT_CARD_LENGTH, help="the number of keywords on each card")
+    parser.add_argument("--bands", type=int, default=DEFAULT_NUM_BANDS, help="the number of difficulty bands")
+    parser.add_argument("--bucket-capacity", type=int, default=DEFAULT_BUCKET_CAPACITY, help="the most cards kept for each band")
+    parser.add_argument("--seed", type=int, default=0, help="the random seed for sampling cards")
+    args = parser.parse_args(argv)
+    build_difficulty_index(args.path, card_length=args.card_length, num_bands=args.bands, bucket_capacity=args.bucket_capacity, seed=args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,465 @@
+"""Distribute seeded games across worker processes and hosts through a work queue.
+
+A Coordinator partitions the games of each matchup into chunks of seeds and leases them to workers, which play each chunk with the batch engine and send back its compact results.
+Chunks whose worker disconnects, fails or takes longer than its lease are retried, and a chunk's results are only kept once, however many times it was played.
+
+Start a worker on another host with `DECRYPTOGAME_AUTHKEY=... python -m decryptogame.distributed HOST:PORT --matchups MODULE:ATTRIBUTE`.
+"""
+import argparse
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping, Sequence
+import dataclasses
+from decryptogame.batch import GameResult, play_batch
+from decryptogame.components import Keywords
+from decryptogame.teams import Team
+from multiprocessing.connection import Client, Listener, Pipe
+import os
+import pkgutil
+import queue
+import socket
+import threading
+import time
+from typing import Any, Optional, Protocol
+
+DEFAULT_CHUNK_GAMES = 256
+DEFAULT_LEASE_TIMEOUT = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+# how long workers wait before asking again while every remaining chunk is leased
+DEFAULT_POLL_INTERVAL = 0.1
+AUTHKEY_VARIABLE = "DECRYPTOGAME_AUTHKEY"
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class Chunk:
+    """Dataclass representing a unit of work, the seeded games of a matchup which a worker plays at once.
+
+    Attributes:
+        chunk_id (int): The chunk's position in the coordinator's job space.
+        matchup (str): The name of the matchup, which workers look up their team factories by.
+        seeds (Sequence[int]): The seed of each game, usually a range.
+    """
+    chunk_id: int
+    matchup: str
+    seeds: Sequence[int]
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class ChunkResult:
+    """Dataclass representing the results a worker sends back for a chunk.
+
+    Attributes:
+        chunk_id (int): The chunk which was played.
+        worker (str): The name of the worker which played it.
+        results (tuple[GameResult, ...]): The result of each game, in the same order as the chunk's seeds.
+    """
+    chunk_id: int
+    worker: str
+    results: tuple[GameResult, ...]
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class ChunkFailed:
+    """Dataclass representing a worker's report that playing a chunk raised an exception.
+
+    Attributes:
+        chunk_id (int): The chunk which failed.
+        worker (str): The name of the worker which played it.
+        error (str): A description of the exception.
+    """
+    chunk_id: int
+    worker: str
+    error: str
+
+
+def partition_jobs(matchups: Sequence[str], seeds: Iterable[int], chunk_games: int = DEFAULT_CHUNK_GAMES) -> list[Chunk]:
+    """Partition the games of every matchup into chunks. Each matchup plays every seed.
+
+    Args:
+        matchups (Sequence[str]): The name of each matchup.
+        seeds (Iterable[int]): The seed of each game. Runs of consecutive seeds are stored as ranges, so chunks stay small.
+        chunk_games (int, optional): The most games in each chunk. Defaults to DEFAULT_CHUNK_GAMES.
+
+    Returns:
+        list[Chunk]: The chunks, matchup by matchup, with ids in order.
+    """
+    seeds = list(seeds)
+    runs = []
+    for start in range(0, len(seeds), chunk_games):
+        run = seeds[start:start + chunk_games]
+        consecutive = run == list(range(run[0], run[0] + len(run)))
+        runs.append(range(run[0], run[0] + len(run)) if consecutive else run)
+    return [Chunk(chunk_id=chunk_id, matchup=matchup, seeds=run)
+            for chunk_id, (matchup, run) in enumerate((matchup, run) for matchup in matchups for run in runs)]
+
+
+class Channel(Protocol):
+    """Protocol for a two-way connection between the coordinator and a worker, which sends and receives picklable messages."""
+    def send(self, message: Any):
+        """Send a message.
+
+        Args:
+            message (Any): The message.
+        """
+        ...
+
+    def recv(self) -> Any:
+        """Wait for the next message.
+
+        Raises:
+            EOFError: If the other end has closed the channel.
+
+        Returns:
+            Any: The message.
+        """
+        ...
+
+    def close(self):
+        """Close the channel."""
+        ...
+
+class Transport(Protocol):
+    """Protocol for the transport which connects workers to the coordinator, such as a local pipe or a network connection."""
+    def accept(self, timeout: float) -> Optional[Channel]:
+        """Wait for a worker to connect, on the coordinator's side.
+
+        Args:
+            timeout (float): The longest time to wait, in seconds.
+
+        Returns:
+            Optional[Channel]: The worker's channel, or None if no worker connected in time.
+        """
+        ...
+
+    def connect(self) -> Channel:
+        """Connect to the coordinator, on a worker's side.
+
+        Returns:
+            Channel: The coordinator's channel.
+        """
+        ...
+
+    def close(self):
+        """Stop accepting workers."""
+        ...
+
+
+class LocalTransport(Transport):
+    """Transport which connects workers in threads of the coordinator's process through pipes, standing in for a network for tests and single-host runs."""
+    def __init__(self):
+        self._accepted: queue.Queue = queue.Queue()
+
+    def accept(self, timeout: float) -> Optional[Channel]:
+        try:
+            return self._accepted.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def connect(self) -> Channel:
+        coordinator_end, worker_end = Pipe()
+        self._accepted.put(coordinator_end)
+        return worker_end
+
+    def close(self):
+        # workers which were never accepted see the channel close, instead of waiting for a reply forever
+        while True:
+            try:
+                self._accepted.get_nowait().close()
+            except queue.Empty:
+                return
+
+class TCPTransport(Transport):
+    """Transport which connects workers to the coordinator over TCP. Workers must be given the same authentication key as the coordinator.
+    Messages are pickled, so only connect hosts which trust each other.
+
+    Args:
+        address (tuple[str, int]): The host and port the coordinator listens on. A port of 0 picks a free port once the coordinator listens.
+        authkey (bytes): The key connections are authenticated with.
+    """
+    def __init__(self, address: tuple[str, int], authkey: bytes):
+        self.address = address
+        self.authkey = authkey
+        self._listener: Optional[Listener] = None
+        self._accepted: queue.Queue = queue.Queue()
+
+    def listen(self) -> tuple[str, int]:
+        """Start listening for workers, if the coordinator is not listening yet.
+
+        Returns:
+            tuple[str, int]: The address workers connect to.
+        """
+        if self._listener is None:
+            self._listener = Listener(self.address, authkey=self.authkey)
+            self.address = self._listener.address
+            # listeners can not time out, so connections are accepted in a thread and handed over through a queue
+            threading.Thread(target=self._accept_connections, args=(self._listener,), daemon=True).start()
+        return self.address
+
+    def _accept_connections(self, listener: Listener):
+        while True:
+            try:
+                self._accepted.put(listener.accept())
+            except OSError:
+                # the listener was closed
+                return
+            except Exception:
+                # a connection which failed to authenticate is dropped
+                continue
+
+    def accept(self, timeout: float) -> Optional[Channel]:
+        self.listen()
+        try:
+            return self._accepted.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def connect(self) -> Channel:
+        return Client(self.address, authkey=self.authkey)
+
+    def close(self):
+        if self._listener is not None:
+            self._listener.close()
+        while True:
+            try:
+                self._accepted.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class Coordinator:
+    """Coordinator which leases the chunks of a job space to workers and collects their results.
+
+    Workers ask for a chunk, play it and send back its results, which also asks for the next chunk. Every message is answered with a chunk,
+    with a float telling the worker how long to wait while every remaining chunk is leased, or with None once the job is finished.
+
+    Args:
+        transport (Transport): The transport workers connect through.
+        matchups (Sequence[str]): The name of each matchup to play.
+        seeds (Iterable[int]): The seed of each game, which every matchup plays.
+        chunk_games (int, optional): The most games in each chunk. Defaults to DEFAULT_CHUNK_GAMES.
+        lease_timeout (float, optional): How long a worker may take to play a chunk, in seconds, before it is leased to another worker as well. Defaults to DEFAULT_LEASE_TIMEOUT.
+        max_attempts (int, optional): The most times a chunk is leased before it is given up on. Defaults to DEFAULT_MAX_ATTEMPTS.
+        poll_interval (float, optional): How long workers wait, in seconds, while every remaining chunk is leased. Defaults to DEFAULT_POLL_INTERVAL.
+
+    Attributes:
+        chunks (list[Chunk]): The chunks of the job space, indexed by id.
+        results (dict[int, ChunkResult]): The results of each finished chunk. The first results sent for a chunk are kept, and later duplicates are ignored.
+        errors (dict[int, str]): The last error reported for each chunk which failed.
+        duplicates (int): The number of results ignored because their chunk was already finished.
+    """
+    def __init__(self, transport: Transport, matchups: Sequence[str], seeds: Iterable[int], *,
+                 chunk_games: int = DEFAULT_CHUNK_GAMES,
+                 lease_timeout: float = DEFAULT_LEASE_TIMEOUT,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL
+                 ):
+        self.transport = transport
+        self.matchups = list(matchups)
+        self.chunks = partition_jobs(self.matchups, seeds, chunk_games)
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        # workers tell a wait from a chunk by its type, so the wait is always a float
+        self.poll_interval = float(poll_interval)
+        self.results: dict[int, ChunkResult] = {}
+        self.errors: dict[int, str] = {}
+        self.duplicates = 0
+        self._pending = deque(range(len(self.chunks)))
+        # the deadline of each leased chunk, and the number of times each chunk was leased, which numbers the attempt of its latest lease
+        self._leases: dict[int, float] = {}
+        self._attempts = [0] * len(self.chunks)
+        self._given_up: set[int] = set()
+        self._finished = threading.Condition()
+
+    def done(self) -> bool:
+        """Check if every chunk is finished or given up on.
+
+        Returns:
+            bool: True if the job is finished, False otherwise.
+        """
+        return len(self.results) + len(self._given_up) == len(self.chunks)
+
+    def _expire(self):
+        # called with the lock held, gives up on chunks whose last lease expired, as their workers are hung
+        now = time.monotonic()
+        for chunk_id, deadline in list(self._leases.items()):
+            if deadline <= now and self._attempts[chunk_id] >= self.max_attempts:
+                del self._leases[chunk_id]
+                self.errors.setdefault(chunk_id, "lease expired")
+                self._given_up.add(chunk_id)
+                self._finished.notify_all()
+
+    def _lease(self) -> Chunk | float | None:
+        # called with the lock held
+        self._expire()
+        if self.done():
+            return None
+        if self._pending:
+            chunk_id = self._pending.popleft()
+        else:
+            now = time.monotonic()
+            expired = [chunk_id for chunk_id, deadline in self._leases.items()
+                       if deadline <= now and self._attempts[chunk_id] < self.max_attempts]
+            if not expired:
+                return self.poll_interval
+            chunk_id = min(expired, key=self._leases.__getitem__)
+        self._attempts[chunk_id] += 1
+        self._leases[chunk_id] = time.monotonic() + self.lease_timeout
+        return self.chunks[chunk_id]
+
+    def _release(self, chunk_id: int, attempt: int, error: Optional[str] = None):
+        # called with the lock held, when a chunk's worker failed or disconnected before finishing it. A worker whose lease expired
+        # no longer holds the chunk once it is leased again, so only the worker holding the chunk's latest attempt releases it
+        if chunk_id in self.results or chunk_id not in self._leases or self._attempts[chunk_id] != attempt:
+            return
+        del self._leases[chunk_id]
+        if error is not None:
+            self.errors[chunk_id] = error
+        if self._attempts[chunk_id] < self.max_attempts:
+            self._pending.append(chunk_id)
+        else:
+            self._given_up.add(chunk_id)
+            self._finished.notify_all()
+
+    def _receive(self, message: ChunkResult | ChunkFailed | None, leased: Optional[tuple[int, int]]) -> tuple[Chunk | float | None, Optional[tuple[int, int]]]:
+        # leased is the chunk id and attempt of the lease held by the worker which sent the message, and the new lease is returned with the reply
+        with self._finished:
+            if isinstance(message, ChunkResult):
+                if message.chunk_id in self.results:
+                    self.duplicates += 1
+                else:
+                    self.results[message.chunk_id] = message
+                    self._leases.pop(message.chunk_id, None)
+                    self._given_up.discard(message.chunk_id)
+                    self._finished.notify_all()
+            elif isinstance(message, ChunkFailed) and leased is not None and leased[0] == message.chunk_id:
+                self._release(*leased, message.error)
+            reply = self._lease()
+            return reply, ((reply.chunk_id, self._attempts[reply.chunk_id]) if isinstance(reply, Chunk) else None)
+
+    def _serve(self, channel: Channel):
+        leased = None
+        try:
+            while True:
+                reply, leased = self._receive(channel.recv(), leased)
+                channel.send(reply)
+                if reply is None:
+                    return
+        except (EOFError, OSError):
+            # the worker disconnected, so the chunk it was playing is leased again
+            if leased is not None:
+                with self._finished:
+                    self._release(*leased, "worker disconnected")
+        finally:
+            channel.close()
+
+    def _accept_workers(self, stop: threading.Event):
+        while not stop.is_set():
+            channel = self.transport.accept(self.poll_interval)
+            if channel is not None:
+                threading.Thread(target=self._serve, args=(channel,), daemon=True).start()
+
+    def run(self, timeout: Optional[float] = None) -> dict[str, list[GameResult]]:
+        """Serve chunks to workers until every chunk is finished. Workers may connect before or while the coordinator runs.
+
+        Args:
+            timeout (Optional[float], optional): The longest time to wait, in seconds. Defaults to None, waiting until the job is finished.
+
+        Raises:
+            TimeoutError: If the job is not finished in time.
+            RuntimeError: If a chunk failed on every attempt.
+
+        Returns:
+            dict[str, list[GameResult]]: The result of each game of each matchup, in the same order as the seeds.
+        """
+        stop = threading.Event()
+        accepter = threading.Thread(target=self._accept_workers, args=(stop,), daemon=True)
+        accepter.start()
+        try:
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            with self._finished:
+                # leases are checked every poll interval, so chunks held by hung workers are given up on even when no worker asks for work
+                self._expire()
+                while not self.done():
+                    remaining = deadline - time.monotonic() if deadline is not None else self.poll_interval
+                    if remaining <= 0:
+                        raise TimeoutError(f"{len(self.chunks) - len(self.results)} of {len(self.chunks)} chunks are not finished")
+                    self._finished.wait(min(remaining, self.poll_interval))
+                    self._expire()
+        finally:
+            stop.set()
+            accepter.join()
+            self.transport.close()
+        if self._given_up:
+            chunk_id = min(self._given_up)
+            raise RuntimeError(f"{len(self._given_up)} chunks failed {self.max_attempts} times, chunk {chunk_id} with: {self.errors.get(chunk_id)}")
+        results = {matchup: [] for matchup in self.matchups}
+        for chunk in self.chunks:
+            results[chunk.matchup].extend(self.results[chunk.chunk_id].results)
+        return results
+
+
+def run_worker(channel: Channel, matchups: Mapping[str, Sequence[Callable[[Keywords], Team]]], *,
+               name: Optional[str] = None,
+               backend: str = "serial",
+               max_workers: Optional[int] = None,
+               **game_options
+               ) -> int:
+    """Play chunks leased by a coordinator until the job is finished or the coordinator goes away.
+
+    Args:
+        channel (Channel): The worker's channel to the coordinator, from Transport.connect.
+        matchups (Mapping[str, Sequence[Callable[[Keywords], Team]]]): The team factories of each matchup, by name.
+        name (Optional[str], optional): The worker's name, recorded with its results. Defaults to None, using the host name and process id.
+        backend (str, optional): The backend each chunk is played with by play_batch, such as "processes" to use every core of the worker's host. Defaults to "serial".
+        max_workers (Optional[int], optional): The number of threads or processes each chunk is played with. Defaults to None, using the executor's default.
+        **game_options: Options passed on to play_seeded_game.
+
+    Returns:
+        int: The number of chunks the worker played.
+    """
+    name = name if name is not None else f"{socket.gethostname()}:{os.getpid()}"
+    played = 0
+    message = None
+    try:
+        while True:
+            channel.send(message)
+            reply = channel.recv()
+            if reply is None:
+                return played
+            if isinstance(reply, (int, float)):
+                time.sleep(reply)
+                message = None
+                continue
+            try:
+                results = play_batch(matchups[reply.matchup], reply.seeds, backend=backend, max_workers=max_workers, **game_options)
+                message = ChunkResult(chunk_id=reply.chunk_id, worker=name, results=tuple(results))
+                played += 1
+            except Exception as error:
+                message = ChunkFailed(chunk_id=reply.chunk_id, worker=name, error=repr(error))
+    except (EOFError, OSError):
+        return played
+    finally:
+        channel.close()
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    """Run the command line which starts a worker and connects it to a coordinator over TCP.
+
+    Args:
+        argv (Optional[Iterable[str]], optional): The command line arguments. Defaults to None, using sys.argv.
+
+    Returns:
+        int: The number of chunks the worker played.
+    """
+    parser = argparse.ArgumentParser(prog="python -m decryptogame.distributed",
+                                     description=f"Play chunks of games for a coordinator. The authentication key is read from ${AUTHKEY_VARIABLE}.")
+    parser.add_argument("address", metavar="HOST:PORT", help="the address the coordinator listens on")
+    parser.add_argument("--matchups", required=True, metavar="MODULE:ATTRIBUTE", help="a mapping of each matchup's name to its team factories")
+    parser.add_argument("--backend", choices=["serial", "threads", "processes"], default="serial", help="how each chunk's games are played")
+    parser.add_argument("--workers", type=int, help="the number of threads or processes each chunk is played with")
+    parser.add_argument("--name", help="the worker's name. Defaults to the host name and process id")
+    args = parser.parse_args(argv)
+
+    host, _, port = args.address.rpartition(":")
+    transport = TCPTransport((host, int(port)), os.environ[AUTHKEY_VARIABLE].encode())
+    return run_worker(transport.connect(), pkgutil.resolve_name(args.matchups), name=args.name, backend=args.backend, max_workers=args.workers)
+
+if __name__ == "__main__":
+    main()
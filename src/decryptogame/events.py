@@ -0,0 +1,213 @@
+from collections import deque
+from collections.abc import Callable, Sequence
+import dataclasses
+from decryptogame.components import Clue, Code, GameData, Note, TeamName
+import threading
+from typing import Optional
+
+DEFAULT_CAPACITY = 65536
+DEFAULT_BATCH_SIZE = 1024
+DEFAULT_INTERVAL = 0.05
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class Event:
+    """Dataclass representing something which happened in a game.
+
+    Attributes:
+        round_number (int): The round the event happened in, counting from 0.
+    """
+    round_number: int
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class RoundStarted(Event):
+    """Event emitted by play_round once a round's codes are dealt.
+
+    Attributes:
+        codes (Sequence[Code]): The codes for each team.
+    """
+    codes: Sequence[Code]
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class CluesDecided(Event):
+    """Event emitted by play_round once a team's encryptor decides their clues.
+
+    Attributes:
+        team_name (TeamName): The team which gave the clues.
+        clues (Clue): The clues.
+    """
+    team_name: TeamName
+    clues: Clue
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class InterceptionAttempted(Event):
+    """Event emitted by play_round once a team's intercepter guesses the opponent's code.
+
+    Attributes:
+        team_name (TeamName): The intercepting team.
+        attempted_interception (Code): The guessed code.
+    """
+    team_name: TeamName
+    attempted_interception: Code
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class DecipherAttempted(Event):
+    """Event emitted by play_round once a team's guesser deciphers their own clues.
+
+    Attributes:
+        team_name (TeamName): The deciphering team.
+        attempted_decipher (Code): The guessed code.
+    """
+    team_name: TeamName
+    attempted_decipher: Code
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class RoundScored(Event):
+    """Event emitted by Game.process_round_notes once a round's notes are scored.
+
+    Attributes:
+        notes (Sequence[Note]): The notes of each team for the round.
+        data (GameData): A copy of the game data after scoring.
+    """
+    notes: Sequence[Note]
+    data: GameData
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class GameEnded(Event):
+    """Event emitted by play_game once a game is over. The round number is the number of rounds played.
+
+    Attributes:
+        winner (Optional[TeamName]): The winner of the game, or None for a tie.
+        data (GameData): A copy of the final game data.
+    """
+    winner: Optional[TeamName]
+    data: GameData
+
+
+class EventBus:
+    """Bus which passes the events of a game to the subscribers of their types. Games only build events while the bus has subscribers,
+    so a bus without subscribers, like a game without a bus, costs nothing.
+
+    Subscribers run synchronously in the playing thread. Wrap a subscriber in a RingBufferSubscriber to handle events in batches in a background thread instead.
+    """
+    def __init__(self):
+        self._subscribers: list[tuple[Callable[[Event], None], tuple[type[Event], ...]]] = []
+        # the handlers for each event type, resolved on first emit
+        self._dispatch: dict[type[Event], list[Callable[[Event], None]]] = {}
+
+    @property
+    def active(self) -> bool:
+        """Check if the bus has any subscribers, so events need to be built.
+
+        Returns:
+            bool: True if there are subscribers, False otherwise.
+        """
+        return bool(self._subscribers)
+
+    def subscribe(self, handler: Callable[[Event], None], *event_types: type[Event]) -> Callable[[Event], None]:
+        """Subscribe a handler to events. May be used as a decorator when no event types are given.
+
+        Args:
+            handler (Callable[[Event], None]): Handles each event.
+            *event_types (type[Event]): The event types to handle, including their subclasses. Defaults to every event.
+
+        Returns:
+            Callable[[Event], None]: The handler, to unsubscribe with later.
+        """
+        self._subscribers.append((handler, event_types or (Event,)))
+        self._dispatch.clear()
+        return handler
+
+    def unsubscribe(self, handler: Callable[[Event], None]):
+        """Unsubscribe a handler from every event type it was subscribed to.
+
+        Args:
+            handler (Callable[[Event], None]): The handler.
+        """
+        self._subscribers = [(subscriber, event_types) for subscriber, event_types in self._subscribers if subscriber != handler]
+        self._dispatch.clear()
+
+    def emit(self, event: Event):
+        """Pass an event to each of its subscribers, in the order they subscribed.
+
+        Args:
+            event (Event): The event.
+        """
+        event_type = type(event)
+        handlers = self._dispatch.get(event_type)
+        if handlers is None:
+            handlers = self._dispatch[event_type] = [handler for handler, event_types in self._subscribers if issubclass(event_type, event_types)]
+        for handler in handlers:
+            handler(event)
+
+
+class RingBufferSubscriber:
+    """Subscriber which adds events to a ring buffer, which a background thread drains in batches, so handling events does not slow the playing thread.
+    If the buffer is full, the oldest events are dropped and counted.
+
+    Args:
+        handler (Callable[[list[Event]], None]): Handles each batch of events, in the background thread.
+        capacity (int, optional): The most events held in the buffer. Defaults to DEFAULT_CAPACITY.
+        batch_size (int, optional): The most events in each batch. The thread is woken early once this many events are waiting. Defaults to DEFAULT_BATCH_SIZE.
+        interval (float, optional): The longest time between drains, in seconds. Defaults to DEFAULT_INTERVAL.
+
+    Attributes:
+        dropped (int): The number of events dropped because the buffer was full.
+    """
+    def __init__(self, handler: Callable[[list[Event]], None], capacity: int = DEFAULT_CAPACITY,
+                 batch_size: int = DEFAULT_BATCH_SIZE, interval: float = DEFAULT_INTERVAL):
+        self.handler = handler
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        # appending to and popping from a deque are atomic, so the buffer needs no lock
+        self._buffer: deque[Event] = deque(maxlen=capacity)
+        self._wake = threading.Event()
+        self._drained = threading.Condition()
+        self._closed = False
+        self._busy = False
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def __call__(self, event: Event):
+        buffer = self._buffer
+        if len(buffer) == self.capacity:
+            self.dropped += 1
+        buffer.append(event)
+        if len(buffer) >= self.batch_size:
+            self._wake.set()
+
+    def _drain(self):
+        buffer = self._buffer
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            closed = self._closed
+            self._busy = True
+            while buffer:
+                batch = []
+                while buffer and len(batch) < self.batch_size:
+                    batch.append(buffer.popleft())
+                self.handler(batch)
+            with self._drained:
+                self._busy = False
+                self._drained.notify_all()
+            if closed:
+                return
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait until the events emitted so far have been handled.
+
+        Args:
+            timeout (Optional[float], optional): The longest time to wait, in seconds. Defaults to None, waiting until they are handled.
+        """
+        with self._drained:
+            self._wake.set()
+            self._drained.wait_for(lambda: (not self._buffer and not self._busy) or not self._thread.is_alive(), timeout)
+
+    def close(self):
+        """Handle the remaining events, then stop the background thread."""
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
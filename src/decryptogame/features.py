@@ -0,0 +1,84 @@
+from array import array
+from collections.abc import Sequence
+from decryptogame.components import Code, Note
+
+
+class NotesheetFeatures:
+    """Features of each team's revealed notes, updated incrementally as rounds are processed so decisions do not need to scan the notesheet.
+
+    Attributes:
+        rounds (int): The number of rounds processed.
+        slot_clues (list[list[list[str]]]): The clues each team has given for each of their keyword slots, indexed by team name then slot. Games with a clue table store clue ids instead.
+        slot_counts (list[array]): The number of clues each team has given for each of their keyword slots, indexed by team name.
+        codes (list[array]): Each team's revealed codes, one after another, indexed by team name.
+        code_lengths (list[array]): The length of each team's revealed codes, indexed by team name.
+    """
+    def __init__(self, num_teams: int = 2):
+        self.rounds = 0
+        self.slot_clues: list[list[list[str]]] = [[] for _ in range(num_teams)]
+        self.slot_counts = [array("l") for _ in range(num_teams)]
+        self.codes = [array("b") for _ in range(num_teams)]
+        self.code_lengths = [array("b") for _ in range(num_teams)]
+
+    def update(self, round_notes: Sequence[Note]):
+        """Add the revealed notes of a round to the features.
+
+        Args:
+            round_notes (Sequence[Note]): The notes of each team for the round.
+        """
+        for team_name, note in enumerate(round_notes):
+            slot_clues = self.slot_clues[team_name]
+            slot_counts = self.slot_counts[team_name]
+            for slot, clue in zip(note.correct_code, note.clues):
+                if slot >= len(slot_clues):
+                    slot_clues.extend([] for _ in range(slot + 1 - len(slot_clues)))
+                    slot_counts.extend([0] * (slot + 1 - len(slot_counts)))
+                slot_clues[slot].append(clue)
+                slot_counts[slot] += 1
+            self.codes[team_name].extend(note.correct_code)
+            self.code_lengths[team_name].append(len(note.correct_code))
+        self.rounds += 1
+
+    def clues_for_slot(self, team_name: int, slot: int) -> list[str]:
+        """Get the clues a team has given for one of their keyword slots.
+
+        Args:
+            team_name (int): The team which gave the clues.
+            slot (int): The keyword slot.
+
+        Returns:
+            list[str]: The clues given for the slot, in the order they were given.
+        """
+        slot_clues = self.slot_clues[team_name]
+        return slot_clues[slot] if slot < len(slot_clues) else []
+
+    def slot_frequencies(self, team_name: int, num_slots: int) -> list[float]:
+        """Get how often a team has used each of their keyword slots.
+
+        Args:
+            team_name (int): The team which used the slots.
+            num_slots (int): The number of keyword slots on the team's card.
+
+        Returns:
+            list[float]: The fraction of the team's clues given for each slot, or zeros if no clues have been given.
+        """
+        counts = list(self.slot_counts[team_name]) + [0] * (num_slots - len(self.slot_counts[team_name]))
+        total = sum(counts)
+        return [count / total if total else 0.0 for count in counts]
+
+    def code_history(self, team_name: int) -> list[Code]:
+        """Get a team's revealed codes.
+
+        Args:
+            team_name (int): The team whose codes were revealed.
+
+        Returns:
+            list[Code]: The team's codes, one per round.
+        """
+        history = []
+        start = 0
+        codes = self.codes[team_name]
+        for code_length in self.code_lengths[team_name]:
+            history.append(tuple(codes[start:start + code_length]))
+            start += code_length
+        return history
@@ -1,6 +1,10 @@
 from collections.abc import Sequence
-from decryptogame.components import GameData, Note, TeamName
+from decryptogame.components import Clue, GameData, Note, TeamName
 from decryptogame.end_criteria import EndCondition, OfficialEndConditions
+from decryptogame.events import EventBus, RoundScored
+from decryptogame.features import NotesheetFeatures
+from decryptogame.interning import ClueId, ClueTable
+from itertools import product
 from typing import Optional
 
 def miscommunication_rule(note: Note, data: GameData) -> int:
@@ -50,7 +54,9 @@ class Game:
                  end_conditions: list[EndCondition] = None,
                  miscommunication_func = miscommunication_rule,
                  interception_func = interception_rule,
-                 tiebreaker_func = interception_miscommunication_diff_tiebreaker
+                 tiebreaker_func = interception_miscommunication_diff_tiebreaker,
+                 event_bus: Optional[EventBus] = None,
+                 clue_table: Optional[ClueTable] = None
                  ):
         """Initialize the game.
 
@@ -60,13 +66,18 @@ class Game:
             miscommunication_func (function, optional): The function to calculate miscommunications. Defaults to miscommunication_rule.
             interception_func (function, optional): The function to calculate interceptions. Defaults to interception_rule.
             tiebreaker_func (function, optional): The tiebreaker function to decide the winner. Defaults to interception_miscommunication_diff_tiebreaker.
+            event_bus (Optional[EventBus], optional): The bus which the game and play functions emit events to. Defaults to None, emitting no events.
+            clue_table (Optional[ClueTable], optional): The table which play_round interns clues by, so notes store clue ids. Defaults to None, storing clues as strings.
         """
         self.notesheet = []
         self.end_conditions = end_conditions if end_conditions is not None else OfficialEndConditions()
         self.miscommunication_func = miscommunication_func
         self.interception_func  = interception_func 
         self.tiebreaker_func = tiebreaker_func
+        self.event_bus = event_bus
+        self.clue_table = clue_table
         self._data = GameData()
+        self._features = None
         # initialize game data based on round notes in notesheet
         if notesheet is None:
             return
@@ -88,18 +99,100 @@ class Game:
         return self._data.copy()
     
 
+    @property
+    def features(self) -> NotesheetFeatures:
+        """Get the features of each team's revealed notes. They are only built once accessed, then only the rounds processed since the last access are added.
+
+        Returns:
+            NotesheetFeatures: The features of the notesheet.
+        """
+        if self._features is None:
+            self._features = NotesheetFeatures()
+        for round_notes in self.notesheet[self._features.rounds:]:
+            self._features.update(round_notes)
+        return self._features
+
+
+    def decode_clues(self, clues: Sequence[ClueId]) -> Clue:
+        """Get the clues of a note as strings, whether or not the game interns clues.
+
+        Args:
+            clues (Sequence[ClueId]): The clues of a note.
+
+        Returns:
+            Clue: The clues.
+        """
+        return self.clue_table.decode(clues) if self.clue_table is not None else tuple(clues)
+
+
     def process_round_notes(self, round_notes: list[Note]):
         """Process the notes for a round. The GameData is updated according to the rules and round results, and the round_notes are then added to the notesheet.
 
         Args:
             round_notes (list[Note]): The list of notes for the current round.
         """
-        for team_name, note in enumerate(round_notes):
-            opponent = not team_name
-            self._data.miscommunications[team_name] += self.miscommunication_func(note, self._data)
-            self._data.interceptions[opponent] += self.interception_func(note, self._data)
-        self._data.rounds_played += 1
+        if type(self._data) is GameData:
+            self._score_round(round_notes)
+        else:
+            # game data shared with other processes publishes the round at once, and plain game data skips the batch's cost
+            with self._data.batch():
+                self._score_round(round_notes)
         self.notesheet.append(round_notes)
+        if self.event_bus is not None and self.event_bus.active:
+            self.event_bus.emit(RoundScored(round_number=self._data.rounds_played - 1, notes=round_notes, data=self._data.copy()))
+
+    def _score_round(self, round_notes: list[Note]):
+        if self.miscommunication_func is miscommunication_rule and self.interception_func is interception_rule:
+            # the official rules are scored directly, saving two rule calls per note
+            count_interceptions = self._data.rounds_played != 0
+            for team_name, note in enumerate(round_notes):
+                correct_code = note.correct_code
+                if note.attempted_decipher != correct_code:
+                    self._data.miscommunications[team_name] += 1
+                if count_interceptions and note.attempted_interception == correct_code:
+                    self._data.interceptions[not team_name] += 1
+        else:
+            for team_name, note in enumerate(round_notes):
+                opponent = not team_name
+                self._data.miscommunications[team_name] += self.miscommunication_func(note, self._data)
+                self._data.interceptions[opponent] += self.interception_func(note, self._data)
+        self._data.rounds_played += 1
+
+
+    def outcome_decided(self, miscommunicated: Sequence[Optional[bool]], intercepted: Sequence[Optional[bool]]) -> bool:
+        """Check if the game is sure to end after the current round with the same winner, whatever the round's unknown results. Only the built-in rules can be reasoned about, so games with other rule functions are never decided early.
+
+        Args:
+            miscommunicated (Sequence[Optional[bool]]): Whether each team's decipher attempt this round is wrong, or None if it is not known yet.
+            intercepted (Sequence[Optional[bool]]): Whether each team's note this round counts as intercepted, or None if it is not known yet.
+
+        Returns:
+            bool: True if every possible result of the round ends the game with the same winner, False otherwise.
+        """
+        if self.miscommunication_func is not miscommunication_rule or self.interception_func is not interception_rule:
+            return False
+        # interceptions do not count in the first round
+        if self._data.rounds_played == 0:
+            intercepted = [False] * len(intercepted)
+        num_teams = len(miscommunicated)
+        known_results = [*miscommunicated, *intercepted]
+        unknowns = [index for index, result in enumerate(known_results) if result is None]
+        winners = set()
+        for unknown_results in product((False, True), repeat=len(unknowns)):
+            results = list(known_results)
+            for index, result in zip(unknowns, unknown_results):
+                results[index] = result
+            round_miscommunicated, round_intercepted = results[:num_teams], results[num_teams:]
+            # a team's note being intercepted scores for the opponent
+            trial_data = GameData(rounds_played=self._data.rounds_played + 1,
+                                  miscommunications=[count + round_miscommunicated[team_name] for team_name, count in enumerate(self._data.miscommunications)],
+                                  interceptions=[count + round_intercepted[not team_name] for team_name, count in enumerate(self._data.interceptions)])
+            if not self.game_over(trial_data):
+                return False
+            winners.add(self.winner(trial_data))
+            if len(winners) > 1:
+                return False
+        return True
 
 
     def game_over(self, game_data: GameData = None) -> bool:
@@ -1,9 +1,13 @@
 import random
+from array import array
+from collections import Counter
 from collections.abc import Sequence
 from decryptogame.components import Keywords, Code
+from decryptogame.difficulty import DifficultyIndex, words_digest
 import decryptogame.official_words.english as english
 from itertools import permutations
-from typing import Optional
+from math import perm
+from typing import Optional, Protocol
 
 
 DEFAULT_CODE_LENGTH = 3
@@ -43,22 +47,248 @@ class RandomCodes:
             RandomCodes: The generator object itself.
         """
         return self
-    
+
+    def getstate(self) -> list:
+        """Get the state of the random number generator, so generation can be resumed later. The state only holds lists and ints, so it may be stored as JSON.
+
+        Returns:
+            list: The state of the random number generator.
+        """
+        version, internal_state, gauss_next = self.random.getstate()
+        return [version, list(internal_state), gauss_next]
+
+    def setstate(self, state: Sequence):
+        """Restore the state of the random number generator from a state returned by getstate.
+
+        Args:
+            state (Sequence): The state of the random number generator.
+        """
+        version, internal_state, gauss_next = state
+        self.random.setstate((version, tuple(internal_state), gauss_next))
+
+class CodePolicy(Protocol):
+    """Interface representing a house rule which decides whether a code may be drawn, given the codes a team has already been given this game."""
+
+    def allows(self, code: Code, history: Sequence[Code]) -> bool:
+        """Check if a code may be drawn.
+
+        Args:
+            code (Code): The candidate code.
+            history (Sequence[Code]): The team's earlier codes this game, oldest first.
+
+        Returns:
+            bool: True if the code may be drawn, False otherwise.
+        """
+        ...
+
+
+class MaxOverlap(CodePolicy):
+    """Policy which limits how many digits a code shares, in the same positions, with each of the team's recent codes.
+
+    Args:
+        max_overlap (int): The most digits a code may share with a recent code.
+        rounds (Optional[int], optional): The number of recent codes to compare against. Defaults to None, comparing against every earlier code.
+    """
+    def __init__(self, max_overlap: int, rounds: Optional[int] = None):
+        self.max_overlap = max_overlap
+        self.rounds = rounds
+
+    def allows(self, code: Code, history: Sequence[Code]) -> bool:
+        recent = history if self.rounds is None else history[len(history) - self.rounds:]
+        return all(sum(digit == earlier_digit for digit, earlier_digit in zip(code, earlier)) <= self.max_overlap for earlier in recent)
+
+
+class BalancedSlots(CodePolicy):
+    """Policy which only allows codes using the team's least used keyword slots, so every slot is clued about as often as the others.
+
+    Args:
+        num_slots (int): The number of keyword slots on the team's card.
+    """
+    def __init__(self, num_slots: int):
+        self.num_slots = num_slots
+
+    def allows(self, code: Code, history: Sequence[Code]) -> bool:
+        counts = Counter(digit for earlier in history for digit in earlier)
+        slot_counts = sorted(counts[slot] for slot in range(self.num_slots))
+        return sorted(counts[digit] for digit in code) == slot_counts[:len(code)]
+
+
+class _CodeDeck:
+    # a lazily shuffled deck of code ranks: positions which have not been swapped hold their own rank,
+    # so only the swapped positions are stored and each draw without replacement costs O(1)
+    def __init__(self, num_keywords: int, code_length: int):
+        self.num_keywords = num_keywords
+        self.code_length = code_length
+        self.size = perm(num_keywords, code_length)
+        self.swaps: dict[int, int] = {}
+        self.drawn = 0
+
+    def rank_at(self, position: int) -> int:
+        return self.swaps.get(position, position)
+
+    def take(self, position: int) -> int:
+        # swap the position to the front of the undrawn positions, as a Fisher-Yates shuffle does
+        rank = self.rank_at(position)
+        self.swaps[position] = self.rank_at(self.drawn)
+        self.swaps.pop(self.drawn, None)
+        self.drawn += 1
+        if self.drawn == self.size:
+            # every code has been drawn, so a new shuffle begins
+            self.swaps.clear()
+            self.drawn = 0
+        return rank
+
+    def code(self, rank: int) -> Code:
+        # unrank in the same order as itertools.permutations
+        digits = list(range(self.num_keywords))
+        code = []
+        for position in range(self.code_length):
+            index, rank = divmod(rank, perm(self.num_keywords - position - 1, self.code_length - position - 1))
+            code.append(digits.pop(index))
+        return tuple(code)
+
+
+class ScheduledCodes:
+    """Generator for generating codes for each team which do not repeat within a game, and which follow house rule policies.
+
+    Each team's codes are drawn without replacement from a lazily shuffled deck of every code, so each draw costs O(1) however many codes there are.
+    Once every code has been drawn, a new shuffle begins. A candidate code which a policy forbids stays in the deck for later rounds.
+    If no code left in the deck is allowed, the policies are relaxed for that round.
+
+    Args:
+        keyword_cards (Sequence[Keywords]): The keyword cards for each team.
+        code_lengths (Sequence[int], optional): The lengths of the codes for each team. Defaults to DEFAULT_CODE_LENGTH.
+        seed (int, optional): The random seed for consistent code generation. Defaults to None.
+        policies (Sequence[CodePolicy], optional): Policies every code must follow, such as MaxOverlap or BalancedSlots. Defaults to none, so codes only do not repeat.
+        max_attempts (int, optional): The number of random candidates tried before the rest of the deck is searched. Defaults to 8.
+
+    Yields:
+        tuple[Code, Code]: A tuple containing the codes for each team.
+    """
+    def __init__(self, keyword_cards: Sequence[Keywords], code_lengths: Sequence[int] = None, seed: Optional[int] = None,
+                 policies: Sequence[CodePolicy] = (), max_attempts: int = 8):
+        self.code_lengths = code_lengths if code_lengths is not None else [DEFAULT_CODE_LENGTH] * len(keyword_cards)
+        self.random = random.Random(seed) if seed is not None else random.Random()
+        self.num_keywords = [len(keywords) for keywords in keyword_cards]
+        self.policies = list(policies)
+        self.max_attempts = max_attempts
+        self.new_game()
+
+    def new_game(self):
+        """Start a new game, reshuffling every team's deck and forgetting their code histories."""
+        self.decks = [_CodeDeck(num_keywords, code_length) for num_keywords, code_length in zip(self.num_keywords, self.code_lengths)]
+        self.histories: list[list[Code]] = [[] for _ in self.decks]
+
+    def _allows(self, code: Code, history: Sequence[Code]) -> bool:
+        return all(policy.allows(code, history) for policy in self.policies)
+
+    def _draw(self, deck: _CodeDeck, history: list[Code]) -> Code:
+        first_position = self.random.randrange(deck.drawn, deck.size)
+        position = first_position
+        for _ in range(self.max_attempts):
+            if self._allows(deck.code(deck.rank_at(position)), history):
+                break
+            position = self.random.randrange(deck.drawn, deck.size)
+        else:
+            # search the rest of the deck, starting from a random position so the search is not biased towards early ranks
+            remaining = deck.size - deck.drawn
+            offset = self.random.randrange(remaining)
+            candidates = (deck.drawn + (offset + i) % remaining for i in range(remaining))
+            position = next((candidate for candidate in candidates if self._allows(deck.code(deck.rank_at(candidate)), history)), first_position)
+        code = deck.code(deck.take(position))
+        history.append(code)
+        return code
+
+    def __next__(self) -> tuple[Code, Code]:
+        """Generate the next set of codes for each team in the current game.
+
+        Returns:
+            tuple[Code, Code]: A tuple containing the codes for each team.
+        """
+        return [self._draw(deck, history) for deck, history in zip(self.decks, self.histories)]
+
+    def __iter__(self):
+        """Return the generator as an iterable object.
+
+        Returns:
+            ScheduledCodes: The generator object itself.
+        """
+        return self
+
+    def next_n(self, games: int, rounds: int) -> array:
+        """Generate the codes for several new games at once, packed into a flat array for bulk use such as training data. Each game starts with new_game.
+
+        Args:
+            games (int): The number of games.
+            rounds (int): The number of rounds in each game.
+
+        Returns:
+            array: The code digits, indexed by game, then round, then team, then position, so each round takes sum(code_lengths) entries.
+        """
+        packed = array("b")
+        for _ in range(games):
+            self.new_game()
+            for _ in range(rounds):
+                for code in next(self):
+                    packed.extend(code)
+        return packed
+
+    def getstate(self) -> list:
+        """Get the state of the random number generator, decks and code histories, so generation can be resumed later. The state only holds lists and ints, so it may be stored as JSON.
+
+        Returns:
+            list: The state of the generator.
+        """
+        version, internal_state, gauss_next = self.random.getstate()
+        decks = [[deck.drawn, sorted(deck.swaps.items())] for deck in self.decks]
+        return [[version, list(internal_state), gauss_next], decks, self.histories]
+
+    def setstate(self, state: Sequence):
+        """Restore the state of the generator from a state returned by getstate.
+
+        Args:
+            state (Sequence): The state of the generator.
+        """
+        (version, internal_state, gauss_next), decks, histories = state
+        self.random.setstate((version, tuple(internal_state), gauss_next))
+        self.new_game()
+        for deck, (drawn, swaps) in zip(self.decks, decks):
+            deck.drawn = drawn
+            deck.swaps = {position: rank for position, rank in swaps}
+        self.histories = [[tuple(code) for code in history] for history in histories]
+
 class RandomKeywordCards:
     """Generator for generating random keyword cards for the Decrypto game.
 
     Args:
         card_lengths (Sequence[int], optional): The number of keywords on each team's keyword card. Defaults to DEFAULT_CARD_LENGTH.
-        words (list[str], optional): The list of words to use for generating keyword cards. Defaults to the official English word list.
+        words (Sequence[str], optional): The words to use for generating keyword cards. Defaults to the official English word list.
         seed (int, optional): The random seed for consistent card generation. Defaults to None.
+        difficulty_index (Optional[DifficultyIndex], optional): A difficulty index built over the words, to deal cards of a chosen difficulty. Defaults to None.
+        difficulty_band (Optional[int | tuple[int, int]], optional): The difficulty band of the cards, or the lowest and highest bands. Defaults to None, dealing cards of any difficulty.
+
+    Raises:
+        ValueError: If a difficulty band is given without an index, or the index was built over other words or for other card lengths.
 
     Yields:
         tuple[Keywords, Keywords]: A tuple containing the randomly generated keyword cards for each team.
     """
-    def __init__(self, card_lengths: Sequence[int] = None, words: list[str] = english.words, seed: Optional[int] = None):
+    def __init__(self, card_lengths: Sequence[int] = None, words: Sequence[str] = english.words, seed: Optional[int] = None,
+                 difficulty_index: Optional[DifficultyIndex] = None, difficulty_band: Optional[int | tuple[int, int]] = None):
         self.card_lengths = card_lengths if card_lengths is not None else [DEFAULT_CARD_LENGTH] * 2
         self.words = words
         self.random = random.Random(seed) if seed is not None else random.Random()
+        self.difficulty_index = difficulty_index
+        self.bands = None
+        if difficulty_band is not None:
+            if difficulty_index is None:
+                raise ValueError("a difficulty band needs a difficulty index")
+            if difficulty_index.digest != words_digest(words) or any(card_length != difficulty_index.card_length for card_length in self.card_lengths):
+                raise ValueError("the difficulty index was built over other words or for other card lengths")
+            low, high = difficulty_band if isinstance(difficulty_band, tuple) else (difficulty_band, difficulty_band)
+            self.bands = range(low, high + 1)
+            # bands are drawn in proportion to their number of cards, so every card in the range is as likely
+            self.band_weights = [difficulty_index.bucket_sizes[band] for band in self.bands]
 
     def __next__(self) -> tuple[Keywords, Keywords]:
         """Generate the next set of random keyword cards for each team.
@@ -66,6 +296,8 @@ class RandomKeywordCards:
         Returns:
             tuple[Keywords, Keywords]: A tuple containing the randomly generated keyword cards for each team.
         """
+        if self.bands is not None:
+            return self._next_in_band()
         word_indices = list(range(len(self.words)))
         cards = []
         for card_length in self.card_lengths:
@@ -77,10 +309,42 @@ class RandomKeywordCards:
             cards.append(tuple(self.words[i] for i in keyword_indices))
         return cards
 
+    def _next_in_band(self) -> tuple[Keywords, Keywords]:
+        used = set()
+        cards = []
+        for _ in self.card_lengths:
+            # cards are drawn from precomputed buckets, and only drawn again in the rare case they share a word with another team's card
+            while True:
+                band = self.random.choices(self.bands, self.band_weights)[0] if len(self.bands) > 1 else self.bands[0]
+                keyword_indices = self.difficulty_index.draw(band, self.random)
+                if used.isdisjoint(keyword_indices):
+                    break
+            used.update(keyword_indices)
+            cards.append(tuple(self.words[i] for i in keyword_indices))
+        return cards
+
     def __iter__(self):
         """Return the generator as an iterable object.
 
         Returns:
             RandomKeywordCards: The generator object itself.
         """
-        return self
\ No newline at end of file
+        return self
+
+    def getstate(self) -> list:
+        """Get the state of the random number generator, so generation can be resumed later. The state only holds lists and ints, so it may be stored as JSON.
+
+        Returns:
+            list: The state of the random number generator.
+        """
+        version, internal_state, gauss_next = self.random.getstate()
+        return [version, list(internal_state), gauss_next]
+
+    def setstate(self, state: Sequence):
+        """Restore the state of the random number generator from a state returned by getstate.
+
+        Args:
+            state (Sequence): The state of the random number generator.
+        """
+        version, internal_state, gauss_next = state
+        self.random.setstate((version, tuple(internal_state), gauss_next))
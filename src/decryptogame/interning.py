@@ -0,0 +1,121 @@
+from collections.abc import Iterable, Sequence
+from decryptogame.components import Clue
+import threading
+from typing import Optional
+
+# a clue stored in a note of a game which interns clues, an id in its clue table, or the clue itself if the table was full
+ClueId = int | str
+
+
+class ClueTable:
+    """Table which interns clue words as integer ids, so notes store each clue as an id shared by every game using the table instead of a string of its own.
+    A table may be shared by the games of a tournament, and by games played in several threads.
+
+    In bounded mode, the table stops growing once it holds max_size clues, and clues it has not seen before are then stored as strings.
+    Ids are never reused, so archived notes can always be decoded with the table they were interned by.
+
+    Args:
+        words (Iterable[str], optional): Clues to intern up front, given ids in order. Defaults to none.
+        max_size (Optional[int], optional): The most clues the table holds. Defaults to None, for no bound.
+
+    Attributes:
+        words (list[str]): The interned clues, indexed by id.
+        ids (dict[str, int]): The id of each interned clue.
+        overflowed (int): The number of clues stored as strings because the table was full.
+    """
+    def __init__(self, words: Iterable[str] = (), max_size: Optional[int] = None):
+        self.words: list[str] = []
+        self.ids: dict[str, int] = {}
+        self.max_size = max_size
+        self.overflowed = 0
+        # the lock is only taken for clues not interned yet, so two threads can not give the same clue two ids
+        self._lock = threading.Lock()
+        for word in words:
+            self.intern(word)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, clue: str) -> bool:
+        return clue in self.ids
+
+    def intern(self, clue: str) -> ClueId:
+        """Find the id of a clue, giving it the next id if it is new.
+
+        Args:
+            clue (str): The clue.
+
+        Returns:
+            ClueId: The clue's id, or the clue itself if it is new and the table is full.
+        """
+        clue_id = self.ids.get(clue)
+        if clue_id is not None:
+            return clue_id
+        with self._lock:
+            clue_id = self.ids.get(clue)
+            if clue_id is not None:
+                return clue_id
+            if self.max_size is not None and len(self.words) >= self.max_size:
+                self.overflowed += 1
+                return clue
+            clue_id = self.ids[clue] = len(self.words)
+            self.words.append(clue)
+            return clue_id
+
+    def intern_clues(self, clues: Clue) -> tuple[ClueId, ...]:
+        """Intern each of a team's clues.
+
+        Args:
+            clues (Clue): The clues.
+
+        Returns:
+            tuple[ClueId, ...]: The id of each clue.
+        """
+        ids = self.ids
+        return tuple(ids[clue] if clue in ids else self.intern(clue) for clue in clues)
+
+    def decode(self, clue_ids: Sequence[ClueId]) -> Clue:
+        """Get the clues back from their ids.
+
+        Args:
+            clue_ids (Sequence[ClueId]): The ids, or clues stored as strings.
+
+        Returns:
+            Clue: The clues.
+        """
+        words = self.words
+        return tuple(clue_id if isinstance(clue_id, str) else words[clue_id] for clue_id in clue_ids)
+
+    def dump(self) -> list[str]:
+        """Serialize the table. The result only holds strings, so it may be stored as JSON.
+
+        Returns:
+            list[str]: The interned clues, indexed by id.
+        """
+        return list(self.words)
+
+    @classmethod
+    def load(cls, words: Sequence[str], max_size: Optional[int] = None) -> "ClueTable":
+        """Rebuild a table from a serialized table, giving each clue its id again.
+
+        Args:
+            words (Sequence[str]): The interned clues, indexed by id, as returned by dump.
+            max_size (Optional[int], optional): The most clues the table holds. Defaults to None, for no bound.
+
+        Returns:
+            ClueTable: The table.
+        """
+        table = cls(max_size=max_size)
+        table.words = list(words)
+        table.ids = {word: clue_id for clue_id, word in enumerate(table.words)}
+        return table
+
+    def __getstate__(self) -> dict:
+        # locks can not be pickled, so tables are pickled without theirs
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
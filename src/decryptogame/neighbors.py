@@ -0,0 +1,218 @@
+from array import array
+from collections.abc import Mapping, Sequence
+from decryptogame.components import Clue, Code
+from decryptogame.teams import Guesser, TeamContext
+from itertools import permutations
+from typing import Optional
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DEFAULT_NUM_LISTS = 64
+DEFAULT_NPROBE = 4
+DEFAULT_ITERATIONS = 10
+DEFAULT_NEIGHBORS = 8
+# indexes holding fewer vectors than this are scanned whole, which is faster than probing lists
+EXACT_SEARCH_BELOW = 1024
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("numpy is required for nearest neighbor search. Install it with `pip install decryptogame[numpy]`.")
+
+def normalize_rows(vectors: "numpy.ndarray") -> "numpy.ndarray":
+    """Scale vectors to unit length, so their dot products are cosine similarities. Zero vectors are left as they are.
+
+    Args:
+        vectors (numpy.ndarray): A (n, dim) array of vectors.
+
+    Returns:
+        numpy.ndarray: A (n, dim) float32 array of unit vectors.
+    """
+    vectors = numpy.asarray(vectors, dtype=numpy.float32)
+    norms = numpy.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / numpy.where(norms == 0, 1, norms)
+
+def train_centroids(vectors: "numpy.ndarray", num_lists: int = DEFAULT_NUM_LISTS, iterations: int = DEFAULT_ITERATIONS, seed: Optional[int] = 0) -> "numpy.ndarray":
+    """Cluster vectors with spherical k-means to find the centroids of an IVFIndex's lists. Centroids are trained once, over a sample of the whole vocabulary,
+    and may be shared by every game's indexes.
+
+    Args:
+        vectors (numpy.ndarray): A (n, dim) array of vectors to cluster.
+        num_lists (int, optional): The number of centroids. Defaults to DEFAULT_NUM_LISTS.
+        iterations (int, optional): The number of k-means iterations. Defaults to DEFAULT_ITERATIONS.
+        seed (Optional[int], optional): The random seed for choosing the initial centroids. Defaults to 0.
+
+    Returns:
+        numpy.ndarray: A (num_lists, dim) float32 array of unit centroids.
+    """
+    _require_numpy()
+    vectors = normalize_rows(vectors)
+    rng = numpy.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=min(num_lists, len(vectors)), replace=False)]
+    for _ in range(iterations):
+        assignments = (vectors @ centroids.T).argmax(axis=1)
+        sums = numpy.zeros_like(centroids)
+        numpy.add.at(sums, assignments, vectors)
+        # a centroid which lost every vector keeps its place
+        empty = ~numpy.bincount(assignments, minlength=len(centroids)).astype(bool)
+        sums[empty] = centroids[empty]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted file index for approximate nearest neighbor search by cosine similarity. Each vector is added to the list of its nearest centroid,
+    and a query only scans the lists of its nprobe nearest centroids. Vectors can be added at any time, so an index can grow as a game goes on.
+
+    Args:
+        centroids (numpy.ndarray): A (num_lists, dim) array of list centroids, as trained by train_centroids.
+        nprobe (int, optional): The number of lists scanned by each query. Defaults to DEFAULT_NPROBE.
+
+    Attributes:
+        centroids (numpy.ndarray): The unit list centroids.
+        nprobe (int): The number of lists scanned by each query.
+    """
+    def __init__(self, centroids: "numpy.ndarray", nprobe: int = DEFAULT_NPROBE):
+        _require_numpy()
+        self.centroids = normalize_rows(centroids)
+        self.nprobe = nprobe
+        dim = self.centroids.shape[1]
+        # vectors and labels are stored in buffers which double when full, and each list holds the rows of its vectors
+        self._vectors = numpy.empty((16, dim), dtype=numpy.float32)
+        self._labels = numpy.empty(16, dtype=numpy.int64)
+        self._size = 0
+        self._lists = [array("q") for _ in range(len(self.centroids))]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, vectors: "numpy.ndarray", labels: Sequence[int]):
+        """Add vectors to the index.
+
+        Args:
+            vectors (numpy.ndarray): A (n, dim) array of vectors.
+            labels (Sequence[int]): A label for each vector, returned by searches, such as the keyword slot a clue was given for.
+        """
+        vectors = normalize_rows(numpy.atleast_2d(vectors))
+        start, end = self._size, self._size + len(vectors)
+        if end > len(self._vectors):
+            capacity = max(end, 2 * len(self._vectors))
+            self._vectors = numpy.resize(self._vectors, (capacity, self._vectors.shape[1]))
+            self._labels = numpy.resize(self._labels, capacity)
+        self._vectors[start:end] = vectors
+        self._labels[start:end] = labels
+        for row, list_index in enumerate((vectors @ self.centroids.T).argmax(axis=1), start=start):
+            self._lists[list_index].append(row)
+        self._size = end
+
+    def search(self, queries: "numpy.ndarray", k: int = DEFAULT_NEIGHBORS) -> tuple["numpy.ndarray", "numpy.ndarray"]:
+        """Find the approximate nearest neighbors of each query.
+
+        Args:
+            queries (numpy.ndarray): A (n, dim) array of query vectors.
+            k (int, optional): The number of neighbors. Defaults to DEFAULT_NEIGHBORS.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: A (n, k) array of the neighbors' cosine similarities, highest first, and a (n, k) array of their labels.
+                Rows with fewer than k neighbors are padded with -inf similarities and -1 labels.
+        """
+        queries = normalize_rows(numpy.atleast_2d(queries))
+        similarities = numpy.full((len(queries), k), -numpy.inf, dtype=numpy.float32)
+        labels = numpy.full((len(queries), k), -1, dtype=numpy.int64)
+        if self._size < EXACT_SEARCH_BELOW:
+            rows = [numpy.arange(self._size)] * len(queries)
+        else:
+            probes = numpy.argsort(-(queries @ self.centroids.T), axis=1)[:, :self.nprobe]
+            # the lists are copied, since arrays with views of their buffer could not grow
+            rows = [numpy.concatenate([numpy.array(self._lists[list_index], dtype=numpy.int64) for list_index in query_probes])
+                    for query_probes in probes]
+        for query_index, (query, query_rows) in enumerate(zip(queries, rows)):
+            if not len(query_rows):
+                continue
+            scores = self._vectors[query_rows] @ query
+            count = min(k, len(scores))
+            top = numpy.argpartition(-scores, count - 1)[:count]
+            top = top[numpy.argsort(-scores[top])]
+            similarities[query_index, :count] = scores[top]
+            labels[query_index, :count] = self._labels[query_rows[top]]
+        return similarities, labels
+
+
+class EmbeddingGuesser(Guesser):
+    """Reference guesser which deciphers clues by their nearest neighbors among the embeddings of the team's keywords and of the clues given for each slot.
+    Each game's index is built on the guesser's first decision, then only the clues revealed since its last decision are added.
+
+    The embeddings of a large vocabulary are best loaded once per process, for example with decryptogame.artifacts.
+
+    Args:
+        vocabulary (Mapping[str, int]): The row of each word's embedding. Words are looked up in upper case, as the official words are written.
+        vectors (numpy.ndarray): A (words, dim) array of word embeddings.
+        centroids (Optional[numpy.ndarray], optional): The centroids of each game's index, as trained by train_centroids. Defaults to None, using a single list,
+            which suits the few hundred vectors of a single game.
+        k (int, optional): The number of neighbors each clue votes with. Defaults to DEFAULT_NEIGHBORS.
+        nprobe (int, optional): The number of lists scanned by each query. Defaults to DEFAULT_NPROBE.
+    """
+    def __init__(self, vocabulary: Mapping[str, int], vectors: "numpy.ndarray", centroids: Optional["numpy.ndarray"] = None,
+                 k: int = DEFAULT_NEIGHBORS, nprobe: int = DEFAULT_NPROBE):
+        _require_numpy()
+        self.vocabulary = vocabulary
+        self.vectors = vectors
+        self.centroids = centroids if centroids is not None else numpy.ones((1, vectors.shape[1]), dtype=numpy.float32)
+        self.k = k
+        self.nprobe = nprobe
+        self.index = None
+        self._game = None
+        self._slot_counts: list[int] = []
+
+    def embed(self, words: Sequence[str]) -> "numpy.ndarray":
+        """Look up the embeddings of words. Words outside the vocabulary are given zero vectors, which are like no other word.
+
+        Args:
+            words (Sequence[str]): The words.
+
+        Returns:
+            numpy.ndarray: A (len(words), dim) array of embeddings.
+        """
+        rows = [self.vocabulary.get(word.upper(), -1) for word in words]
+        embeddings = numpy.zeros((len(words), self.vectors.shape[1]), dtype=numpy.float32)
+        known = [index for index, row in enumerate(rows) if row >= 0]
+        embeddings[known] = self.vectors[[rows[index] for index in known]]
+        return embeddings
+
+    def update(self, context: TeamContext):
+        """Bring the index up to date with the game, building it for a new game or adding the clues revealed since the last update.
+
+        Args:
+            context (TeamContext): The guesser's context.
+        """
+        if context.game is not self._game:
+            self._game = context.game
+            self.index = IVFIndex(self.centroids, self.nprobe)
+            self.index.add(self.embed(context.keywords), range(len(context.keywords)))
+            self._slot_counts = [0] * len(context.keywords)
+        slot_clues = context.features.slot_clues[context.team_name]
+        for slot, clues in enumerate(slot_clues[:len(self._slot_counts)]):
+            if len(clues) > self._slot_counts[slot]:
+                new_clues = context.decode_clues(clues[self._slot_counts[slot]:])
+                self.index.add(self.embed(new_clues), [slot] * len(new_clues))
+                self._slot_counts[slot] = len(clues)
+
+    def decipher_clues(self, clues: Clue, context: TeamContext) -> Code:
+        """Decipher the team's clues. Each clue's neighbors vote for their slots by similarity, and the code with the most votes is guessed.
+
+        Args:
+            clues (Clue): The clues provided by the Guesser's team.
+            context (TeamContext): Relevant information the Guesser's decision may be guided by.
+
+        Returns:
+            Code: Distinct code numbers, one for each clue.
+        """
+        self.update(context)
+        similarities, labels = self.index.search(self.embed(clues), self.k)
+        num_slots = len(context.keywords)
+        votes = numpy.zeros((len(clues), num_slots))
+        found = labels >= 0
+        numpy.add.at(votes, (numpy.nonzero(found)[0], labels[found]), numpy.maximum(similarities[found], 0))
+        return max(permutations(range(num_slots), len(clues)), key=lambda code: sum(votes[position, slot] for position, slot in enumerate(code)))
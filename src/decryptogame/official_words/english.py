@@ -1,4 +1,5 @@
-words = [
+# a tuple, so the shared default word list can not be changed by one generator or thread under another
+words = (
     "GLASS",
 	"FRUIT",
 	"HUNT",
@@ -423,4 +424,4 @@ words = [
 	"PEANUT",
 	"BICYCLE",
 	"MUSEUM",
-]
\ No newline at end of file
+)
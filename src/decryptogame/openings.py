@@ -0,0 +1,389 @@
+"""Build and read an opening book of first-round decisions, so search-based players skip their search when the answer is known.
+
+Build a book for the keyword cards of a range of seeded games with `python -m decryptogame.openings book.bin --team MODULE:FACTORY --games 1000`.
+"""
+import argparse
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from decryptogame.components import Clue, Code, Keywords, Note
+from decryptogame.game import Game
+from decryptogame.generators import DEFAULT_CODE_LENGTH, RandomKeywordCards
+from decryptogame.teams import Encryptor, Guesser, Team, TeamContext
+import hashlib
+from itertools import permutations
+import json
+import mmap
+import os
+import pkgutil
+import struct
+from typing import Optional
+
+DEFAULT_ROUNDS = 1
+MAX_ROUNDS = 2
+
+MAGIC = b"DOBK"
+VERSION = 1
+# magic, version, rounds, number of slots and number of entries
+HEADER = struct.Struct("<4sHHII")
+# key hash, offset of the entry in the data after the slots, and length of the entry, which is 0 for an empty slot
+SLOT = struct.Struct("<QII")
+
+# the kinds of decision a book holds
+CLUES = "E"
+DECIPHER = "G"
+
+History = Sequence[tuple[Code, Clue]]
+
+
+def book_key(kind: str, keywords: Keywords, history: History, decision_input: Sequence) -> str:
+    """Build the key of a book entry. Keys hold the team's earlier codes and clues, so an entry only applies to the history it was searched for.
+
+    Args:
+        kind (str): CLUES for an encryptor's decision, or DECIPHER for a guesser's.
+        keywords (Keywords): The team's keywords.
+        history (History): The team's code and clues of each earlier round.
+        decision_input (Sequence): The code to give clues for, or the clues to decipher.
+
+    Returns:
+        str: The key.
+    """
+    rounds = "|".join(f"{','.join(map(str, code))}:{','.join(clues)}" for code, clues in history)
+    return f"{kind}{len(history)}|{','.join(keywords)}|{rounds}|{','.join(map(str, decision_input))}"
+
+def _key_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+
+
+class OpeningBook:
+    """Memory-mapped opening book, a hash table from keys built by book_key to the decisions searched for them offline. Lookups are O(1).
+
+    Args:
+        path (str | os.PathLike): The path of the book, as written by write_opening_book.
+
+    Attributes:
+        rounds (int): The number of opening rounds the book holds decisions for.
+        num_entries (int): The number of decisions in the book.
+    """
+    def __init__(self, path: str | os.PathLike):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.rounds, self._num_slots, self.num_entries = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+        self._data_offset = HEADER.size + self._num_slots * SLOT.size
+
+    def __len__(self) -> int:
+        return self.num_entries
+
+    def get(self, key: str) -> Optional[list]:
+        """Look up a decision.
+
+        Args:
+            key (str): The key, built by book_key.
+
+        Returns:
+            Optional[list]: The decision, or None if the book has no entry for the key.
+        """
+        key_hash = _key_hash(key)
+        encoded_key = key.encode()
+        mask = self._num_slots - 1
+        slot = key_hash & mask
+        # slots are probed linearly, and the table is at most half full, so an empty slot is found quickly
+        while True:
+            slot_hash, offset, length = SLOT.unpack_from(self._mmap, HEADER.size + slot * SLOT.size)
+            if not length:
+                return None
+            if slot_hash == key_hash:
+                entry = self._mmap[self._data_offset + offset:self._data_offset + offset + length]
+                entry_key, _, value = entry.partition(b"\0")
+                if entry_key == encoded_key:
+                    return json.loads(value)
+            slot = (slot + 1) & mask
+
+    def clues(self, keywords: Keywords, code: Code, history: History = ()) -> Optional[Clue]:
+        """Look up the clues an encryptor gives for a code.
+
+        Args:
+            keywords (Keywords): The team's keywords.
+            code (Code): The code to give clues for.
+            history (History, optional): The team's code and clues of each earlier round. Defaults to none, for the first round.
+
+        Returns:
+            Optional[Clue]: The clues, or None if the book has no entry.
+        """
+        clues = self.get(book_key(CLUES, keywords, history, code))
+        return tuple(clues) if clues is not None else None
+
+    def decipher(self, keywords: Keywords, clues: Clue, history: History = ()) -> Optional[Code]:
+        """Look up the code a guesser deciphers clues as.
+
+        Args:
+            keywords (Keywords): The team's keywords.
+            clues (Clue): The clues to decipher.
+            history (History, optional): The team's code and clues of each earlier round. Defaults to none, for the first round.
+
+        Returns:
+            Optional[Code]: The code, or None if the book has no entry.
+        """
+        code = self.get(book_key(DECIPHER, keywords, history, clues))
+        return tuple(code) if code is not None else None
+
+    def close(self):
+        """Release the memory map."""
+        self._mmap.close()
+
+
+def write_opening_book(path: str | os.PathLike, entries: Mapping[str, list], rounds: int = DEFAULT_ROUNDS):
+    """Write an opening book to disk.
+
+    Args:
+        path (str | os.PathLike): The path to write the book to. It is written to a temporary file first, and only replaces the path once complete.
+        entries (Mapping[str, list]): The decision for each key built by book_key.
+        rounds (int, optional): The number of opening rounds the entries cover. Defaults to DEFAULT_ROUNDS.
+    """
+    num_slots = 1
+    while num_slots < 2 * len(entries):
+        num_slots *= 2
+    slots = [(0, 0, 0)] * num_slots
+    data = bytearray()
+    for key, value in entries.items():
+        key_hash = _key_hash(key)
+        entry = key.encode() + b"\0" + json.dumps(value, separators=(",", ":")).encode()
+        slot = key_hash & (num_slots - 1)
+        while slots[slot][2]:
+            slot = (slot + 1) & (num_slots - 1)
+        slots[slot] = (key_hash, len(data), len(entry))
+        data += entry
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, rounds, num_slots, len(entries)))
+        file.writelines(SLOT.pack(*slot) for slot in slots)
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def _opening_context(keywords: Keywords, history: History, num_opponent_keywords: int) -> TeamContext:
+    # a game in which only the team's earlier rounds were played, as its decisions are assumed to depend on them alone
+    game = Game()
+    for code, clues in history:
+        game.process_round_notes([Note(clues=clues, attempted_interception=None, attempted_decipher=code, correct_code=code),
+                                  Note(clues=(), attempted_interception=None, attempted_decipher=(), correct_code=())])
+    return TeamContext(team_name=0, keywords=keywords, num_opponent_keywords=num_opponent_keywords, game=game)
+
+def search_openings(team_factory: Callable[[Keywords], Team], keywords: Keywords, *,
+                    rounds: int = DEFAULT_ROUNDS,
+                    code_length: int = DEFAULT_CODE_LENGTH,
+                    num_opponent_keywords: Optional[int] = None
+                    ) -> dict[str, list]:
+    """Search a team's opening decisions for a keyword card, for every code it can be dealt.
+
+    Second-round decisions are searched for each first round the book's own decisions lead to, in a game where only the team's own first round
+    is known, so they suit players which do not depend on the opponent's first round.
+
+    Args:
+        team_factory (Callable[[Keywords], Team]): Builds the team whose encryptor and guesser are searched. Their decisions should be deterministic.
+        keywords (Keywords): The keyword card.
+        rounds (int, optional): The number of opening rounds, 1 or 2. Defaults to DEFAULT_ROUNDS.
+        code_length (int, optional): The length of the team's codes. Defaults to DEFAULT_CODE_LENGTH.
+        num_opponent_keywords (Optional[int], optional): The number of keywords on the opponent's card. Defaults to None, the same as the team's.
+
+    Raises:
+        ValueError: If rounds is not 1 or 2.
+
+    Returns:
+        dict[str, list]: The decision for each key.
+    """
+    if not 1 <= rounds <= MAX_ROUNDS:
+        raise ValueError(f"opening books hold 1 to {MAX_ROUNDS} rounds, not {rounds}")
+    keywords = tuple(keywords)
+    num_opponent_keywords = num_opponent_keywords if num_opponent_keywords is not None else len(keywords)
+    team = team_factory(keywords)
+    codes = list(permutations(range(len(keywords)), code_length))
+    entries = {}
+
+    def search(history: History) -> list[tuple[Code, Clue]]:
+        context = _opening_context(keywords, history, num_opponent_keywords)
+        rounds_searched = []
+        for code in codes:
+            clues = tuple(team.encryptor.decide_clues(code, context))
+            entries[book_key(CLUES, keywords, history, code)] = list(clues)
+            decipher_key = book_key(DECIPHER, keywords, history, clues)
+            if decipher_key not in entries:
+                entries[decipher_key] = list(team.guesser.decipher_clues(clues, context))
+            rounds_searched.append((code, clues))
+        return rounds_searched
+
+    for first_round in search(()):
+        if rounds > 1:
+            search([first_round])
+    return entries
+
+def build_opening_book(path: str | os.PathLike, team_factory: Callable[[Keywords], Team], keyword_cards: Iterable[Keywords], *,
+                       rounds: int = DEFAULT_ROUNDS,
+                       code_length: int = DEFAULT_CODE_LENGTH,
+                       backend: str = "processes",
+                       max_workers: Optional[int] = None,
+                       executor: Optional[Executor] = None
+                       ) -> int:
+    """Search the opening decisions of a team for many keyword cards in parallel, and write them to an opening book.
+
+    Args:
+        path (str | os.PathLike): The path to write the book to.
+        team_factory (Callable[[Keywords], Team]): Builds the team whose encryptor and guesser are searched. It must be picklable for the processes backend.
+        keyword_cards (Iterable[Keywords]): The keyword cards to search. Repeated cards are searched once.
+        rounds (int, optional): The number of opening rounds, 1 or 2. Defaults to DEFAULT_ROUNDS.
+        code_length (int, optional): The length of the team's codes. Defaults to DEFAULT_CODE_LENGTH.
+        backend (str, optional): Either "processes", "threads" or "serial". Defaults to "processes".
+        max_workers (Optional[int], optional): The number of processes or threads. Defaults to None, using the executor's default.
+        executor (Optional[Executor], optional): The executor to search cards with, in place of the backend. Defaults to None.
+
+    Raises:
+        ValueError: If the backend is unknown.
+
+    Returns:
+        int: The number of entries written.
+    """
+    cards = list(dict.fromkeys(tuple(keywords) for keywords in keyword_cards))
+    entries = {}
+    if executor is None and backend == "serial":
+        for keywords in cards:
+            entries.update(search_openings(team_factory, keywords, rounds=rounds, code_length=code_length))
+    else:
+        if executor is not None:
+            owned_executor = None
+        elif backend == "processes":
+            owned_executor = executor = ProcessPoolExecutor(max_workers)
+        elif backend == "threads":
+            owned_executor = executor = ThreadPoolExecutor(max_workers)
+        else:
+            raise ValueError(f"unknown backend {backend!r}, expected 'processes', 'threads' or 'serial'")
+        try:
+            futures = [executor.submit(search_openings, team_factory, keywords, rounds=rounds, code_length=code_length) for keywords in cards]
+            for future in futures:
+                entries.update(future.result())
+        finally:
+            if owned_executor is not None:
+                owned_executor.shutdown(cancel_futures=True)
+    write_opening_book(path, entries, rounds)
+    return len(entries)
+
+
+def _team_history(context: TeamContext) -> list[tuple[Code, Clue]]:
+    return [(round_notes[context.team_name].correct_code, context.decode_clues(round_notes[context.team_name].clues))
+            for round_notes in context.game.notesheet]
+
+class BookEncryptor(Encryptor):
+    """An encryptor which gives the opening book's clues in the opening rounds, and otherwise falls back to another encryptor.
+
+    Args:
+        book (OpeningBook): The opening book.
+        encryptor (Encryptor): The encryptor to fall back to, usually the one the book was searched for.
+
+    Attributes:
+        hits (int): The number of decisions found in the book.
+        misses (int): The number of opening decisions not found in the book.
+    """
+    def __init__(self, book: OpeningBook, encryptor: Encryptor):
+        self.book = book
+        self.encryptor = encryptor
+        self.hits = 0
+        self.misses = 0
+
+    def decide_clues(self, code: Code, context: TeamContext) -> Clue:
+        """Decide clues for a code, from the book if it holds them.
+
+        Args:
+            code (Code): The code assigned to the Encryptor to decide clues for.
+            context (TeamContext): Relevant information the Encryptor's decision may be guided by.
+
+        Returns:
+            Clue: A clue for each code number in the provided code.
+        """
+        if context.features.rounds < self.book.rounds:
+            clues = self.book.clues(context.keywords, code, _team_history(context))
+            if clues is not None:
+                self.hits += 1
+                return clues
+            self.misses += 1
+        return self.encryptor.decide_clues(code, context)
+
+class BookGuesser(Guesser):
+    """A guesser which deciphers with the opening book's codes in the opening rounds, and otherwise falls back to another guesser.
+
+    Args:
+        book (OpeningBook): The opening book.
+        guesser (Guesser): The guesser to fall back to, usually the one the book was searched for.
+
+    Attributes:
+        hits (int): The number of decisions found in the book.
+        misses (int): The number of opening decisions not found in the book.
+    """
+    def __init__(self, book: OpeningBook, guesser: Guesser):
+        self.book = book
+        self.guesser = guesser
+        self.hits = 0
+        self.misses = 0
+
+    def decipher_clues(self, clues: Clue, context: TeamContext) -> Code:
+        """Decipher the team's clues, from the book if it holds them.
+
+        Args:
+            clues (Clue): The clues provided by the Guesser's team.
+            context (TeamContext): Relevant information the Guesser's decision may be guided by.
+
+        Returns:
+            Code: Distinct code numbers, one for each clue.
+        """
+        if context.features.rounds < self.book.rounds:
+            code = self.book.decipher(context.keywords, tuple(clues), _team_history(context))
+            if code is not None:
+                self.hits += 1
+                return code
+            self.misses += 1
+        return self.guesser.decipher_clues(clues, context)
+
+def with_opening_book(team: Team, book: OpeningBook) -> Team:
+    """Wrap a team's encryptor and guesser so they consult an opening book first.
+
+    Args:
+        team (Team): The team.
+        book (OpeningBook): The opening book.
+
+    Returns:
+        Team: The team, with its encryptor and guesser wrapped.
+    """
+    team.encryptor = BookEncryptor(book, team.encryptor)
+    team.guesser = BookGuesser(book, team.guesser)
+    return team
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    """Run the command line which builds an opening book for the keyword cards of seeded games.
+
+    Args:
+        argv (Optional[Iterable[str]], optional): The command line arguments. Defaults to None, using sys.argv.
+
+    Returns:
+        int: The number of entries written.
+    """
+    parser = argparse.ArgumentParser(prog="python -m decryptogame.openings", description="Build an opening book for the keyword cards of seeded games.")
+    parser.add_argument("path", help="the path to write the book to")
+    parser.add_argument("--team", required=True, metavar="MODULE:FACTORY", help="the factory of the team whose decisions are searched")
+    parser.add_argument("--games", type=int, default=1000, help="the number of seeded games whose keyword cards are searched")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the first game")
+    parser.add_argument("--rounds", type=int, choices=range(1, MAX_ROUNDS + 1), default=DEFAULT_ROUNDS, help="the number of opening rounds")
+    parser.add_argument("--code-length", type=int, default=DEFAULT_CODE_LENGTH, help="the length of the codes")
+    parser.add_argument("--backend", choices=["processes", "threads", "serial"], default="processes", help="how cards are searched in parallel")
+    parser.add_argument("--workers", type=int, help="the number of processes or threads")
+    args = parser.parse_args(argv)
+
+    # the cards of both teams of each seeded game, dealt as play_seeded_game deals them
+    cards = [keywords for seed in range(args.seed, args.seed + args.games) for keywords in next(RandomKeywordCards(seed=seed))]
+    return build_opening_book(args.path, pkgutil.resolve_name(args.team), cards, rounds=args.rounds, code_length=args.code_length,
+                              backend=args.backend, max_workers=args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,20 @@
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Sequence
 from decryptogame.components import Code, Note
+from decryptogame.events import CluesDecided, DecipherAttempted, GameEnded, InterceptionAttempted, RoundStarted
 from decryptogame.game import Game
 from decryptogame.generators import RandomCodes
 from decryptogame.teams import Team, TeamContext
+from decryptogame.validators import ClueValidator, miscommunication_penalty
 from functools import partial
 from typing import Optional
     
 def play_game(teams: Sequence[Team], *, 
               game: Game = None, 
               round_codes: Iterable[Sequence[Code]] = None, 
-              round_limit: Optional[int]=None
+              round_limit: Optional[int]=None,
+              clue_validator: Optional[ClueValidator] = None,
+              invalid_clue_penalty: Callable[[Note], Note] = miscommunication_penalty,
+              fast_outcome: bool = False
               ) -> Game:
     """Play a game of Decrypto. This function will change the game object as the rounds are played.
 
@@ -18,6 +23,9 @@ def play_game(teams: Sequence[Team], *,
         game (Game): The Decrypto game object. If None, a standard game will be generated.
         round_codes (Iterable[Sequence[Code]], optional): Iterable of codes for each round. If None, random codes will be generated.
         round_limit (Optional[int], optional): The maximum number of rounds to play. If None, the game continues until completion.
+        clue_validator (Optional[ClueValidator], optional): Validator which decides whether each team's clues are allowed. If None, any clues are allowed.
+        invalid_clue_penalty (Callable[[Note], Note], optional): Rule which penalizes the note of a team whose clues are not allowed. Defaults to miscommunication_penalty.
+        fast_outcome (bool, optional): Whether to skip the team decisions which can no longer change the winner, for win-rate simulations. The winner is the same as with every decision made, but the notesheet and game data may differ. Defaults to False.
     
     Returns:
             Game: The game state after play.
@@ -27,17 +35,27 @@ def play_game(teams: Sequence[Team], *,
     for rounds_played, codes in enumerate(round_codes):
         if game.game_over() or rounds_played == round_limit:
             break
-        play_round(teams, game, codes)
+        play_round(teams, game, codes, clue_validator=clue_validator, invalid_clue_penalty=invalid_clue_penalty, fast_outcome=fast_outcome)
+    if game.event_bus is not None and game.event_bus.active and game.game_over():
+        data = game.data
+        game.event_bus.emit(GameEnded(round_number=data.rounds_played, winner=game.winner(), data=data))
     return game
 
 
-def play_round(teams:Sequence[Team], game: Game, codes: Sequence[Code]):
+def play_round(teams:Sequence[Team], game: Game, codes: Sequence[Code], *,
+               clue_validator: Optional[ClueValidator] = None,
+               invalid_clue_penalty: Callable[[Note], Note] = miscommunication_penalty,
+               fast_outcome: bool = False
+               ):
     """Play a single round of Decrypto. The game object will be updated with the round results.
 
     Args:
         teams (Sequence[Team]): The pair of teams participating in the game.
         game (Game): The Decrypto game object which encodes the current state.
         codes (Sequence[Code]): The codes for the current round.
+        clue_validator (Optional[ClueValidator], optional): Validator which decides whether each team's clues are allowed. If None, any clues are allowed.
+        invalid_clue_penalty (Callable[[Note], Note], optional): Rule which penalizes the note of a team whose clues are not allowed. Defaults to miscommunication_penalty.
+        fast_outcome (bool, optional): Whether to skip the team decisions which can no longer change the winner, once the game is sure to end this round. Skipped decisions are recorded as None. Ignored when a clue validator is given. Defaults to False.
     """
     # each member may need information about its team and the game to make proper decisions
     context = [TeamContext(
@@ -48,33 +66,67 @@ def play_round(teams:Sequence[Team], game: Game, codes: Sequence[Code]):
                 )
                 for team_name, team in enumerate(teams)]
 
+    # in fast outcome mode, once the game is sure to end this round with the same winner, the remaining decisions are skipped
+    fast_outcome = fast_outcome and clue_validator is None
+    miscommunicated = [None] * len(codes)
+    intercepted = [None] * len(codes)
+    decided = fast_outcome and game.outcome_decided(miscommunicated, intercepted)
+
+    # events are only built while the game's bus has subscribers
+    event_bus = game.event_bus if game.event_bus is not None and game.event_bus.active else None
+    round_number = game._data.rounds_played
+    if event_bus is not None:
+        event_bus.emit(RoundStarted(round_number=round_number, codes=codes))
+
     # each team's encryptor decides the clues
     clues = {}
     for team_name, code in enumerate(codes): 
         team = teams[team_name]
         # give the encryptor the context of its team and the current game state
-        clues[team_name] = team.encryptor.decide_clues(code, context[team_name])
+        clues[team_name] = team.encryptor.decide_clues(code, context[team_name]) if not decided else None
+        if event_bus is not None and not decided:
+            event_bus.emit(CluesDecided(round_number=round_number, team_name=team_name, clues=clues[team_name]))
 
-    # each team attempts to intercept the opposing team's code
+    # each team attempts to intercept the opposing team's code, and the attempt is kept for the opposing team's note
     attempted_interception = {}
-    for team_name, code in enumerate(codes):
+    for team_name in range(len(codes)):
         team = teams[team_name]
         # give the intercepter the context of its team and the current game state
         opponent = not team_name
-        attempted_interception[team_name] = team.intercepter.intercept_clues(clues[opponent], context[team_name])
+        attempted_interception[opponent] = team.intercepter.intercept_clues(clues[opponent], context[team_name]) if not decided else None
+        if event_bus is not None and not decided:
+            event_bus.emit(InterceptionAttempted(round_number=round_number, team_name=team_name, attempted_interception=attempted_interception[opponent]))
+        if fast_outcome and not decided:
+            intercepted[opponent] = attempted_interception[opponent] == codes[opponent]
+            decided = game.outcome_decided(miscommunicated, intercepted)
 
     # each team attempts to decipher the clues to their code
     attempted_decipher = {}
     for team_name, code in enumerate(codes):
         team = teams[team_name]
         # give the guesser the context of its team and the current game state
-        attempted_decipher[team_name] = team.guesser.decipher_clues(clues[team_name], context[team_name])
+        attempted_decipher[team_name] = team.guesser.decipher_clues(clues[team_name], context[team_name]) if not decided else None
+        if event_bus is not None and not decided:
+            event_bus.emit(DecipherAttempted(round_number=round_number, team_name=team_name, attempted_decipher=attempted_decipher[team_name]))
+        if fast_outcome and not decided:
+            miscommunicated[team_name] = attempted_decipher[team_name] != code
+            decided = game.outcome_decided(miscommunicated, intercepted)
+
+    # games with a clue table store each clue as its id in the table
+    clue_table = game.clue_table
+    note_clues = {team_name: clue_table.intern_clues(team_clues) if clue_table is not None and team_clues is not None else team_clues
+                  for team_name, team_clues in clues.items()}
 
     # each team reveals their codes and the notes are processed and added to the notesheet
-    notes = [Note(clues=clues[team_name],
+    notes = [Note(clues=note_clues[team_name],
                   attempted_interception=attempted_interception[team_name],
                   attempted_decipher=attempted_decipher[team_name],
                   correct_code=code
                   ) 
                   for team_name, code in enumerate(codes)]
+
+    # teams whose clues are not allowed are penalized before the notes are scored
+    if clue_validator is not None:
+        notes = [note if clue_validator.valid_clues(clues[team_name], team.keywords) else invalid_clue_penalty(note)
+                 for team_name, (team, note) in enumerate(zip(teams, notes))]
     game.process_round_notes(notes)
@@ -0,0 +1,205 @@
+from collections.abc import Sequence
+from decryptogame.components import Clue, Code
+import decryptogame.official_words.english as english
+from decryptogame.teams import Intercepter, TeamContext
+from functools import lru_cache
+from itertools import permutations
+import math
+import random
+from typing import Optional
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the pseudo-count of every clue for every slot, so clues not seen for a slot yet keep some probability
+DEFAULT_PRIOR = 0.5
+DEFAULT_CAPACITY = 64
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("numpy is required for clue posteriors. Install it with `pip install decryptogame[numpy]`.")
+
+@lru_cache(maxsize=None)
+def code_space(num_keywords: int, code_length: int) -> "numpy.ndarray":
+    """Get every code a team can be dealt, in the same order as RandomCodes draws from. The array is shared, so it must not be changed.
+
+    Args:
+        num_keywords (int): The number of keywords on the team's card.
+        code_length (int): The length of the team's codes.
+
+    Returns:
+        numpy.ndarray: A (codes, code_length) array of the slots of each code.
+    """
+    _require_numpy()
+    codes = numpy.array(list(permutations(range(num_keywords), code_length)), dtype=numpy.intp).reshape(-1, code_length)
+    codes.flags.writeable = False
+    return codes
+
+
+class ClueSlotPosterior:
+    """Bayesian model of which keyword slot a team's clues refer to, learned from the clues the team has given for each slot.
+
+    Each slot has a multinomial distribution over clues with a symmetric Dirichlet prior, so the log-probability of a clue given a slot
+    is log(count + prior) - log(total + prior * vocabulary_size). Log-counts are stored in a (slots, known clues) matrix, so revealing a note
+    updates one entry per clue, and every candidate code is scored with one gather from the matrix. Since codes are dealt uniformly,
+    a code's posterior is proportional to the likelihood of the clues given for it.
+
+    Clues are compared case-insensitively, and clues never seen before are equally likely for every slot with no clues yet.
+
+    Args:
+        num_slots (int): The number of keywords on the team's card.
+        prior (float, optional): The Dirichlet pseudo-count of each clue for each slot. Defaults to DEFAULT_PRIOR.
+        vocabulary_size (int, optional): The number of clues the team might give. Defaults to the size of the official word list.
+        capacity (int, optional): The number of clues the matrix has room for at first. It doubles when full. Defaults to DEFAULT_CAPACITY.
+
+    Attributes:
+        clue_columns (dict[str, int]): The matrix column of each known clue.
+        observations (int): The number of clues observed.
+    """
+    def __init__(self, num_slots: int, prior: float = DEFAULT_PRIOR, vocabulary_size: int = len(english.words), capacity: int = DEFAULT_CAPACITY):
+        _require_numpy()
+        self.num_slots = num_slots
+        self.prior = prior
+        self.vocabulary_size = vocabulary_size
+        self.clue_columns: dict[str, int] = {}
+        self.observations = 0
+        # the first column is for unknown clues, which keep the prior's log-count for every slot
+        self._counts = numpy.zeros((num_slots, capacity + 1), dtype=numpy.int64)
+        self._log_counts = numpy.full((num_slots, capacity + 1), math.log(prior))
+        self._totals = numpy.zeros(num_slots, dtype=numpy.int64)
+        self._log_totals = numpy.full(num_slots, math.log(prior * vocabulary_size))
+
+    def _column(self, clue: str) -> int:
+        # the column of a clue, or 0 for a clue never observed
+        return self.clue_columns.get(clue.casefold(), 0)
+
+    def _add_column(self, clue: str) -> int:
+        key = clue.casefold()
+        column = self.clue_columns.get(key)
+        if column is None:
+            column = self.clue_columns[key] = len(self.clue_columns) + 1
+            if column == self._counts.shape[1]:
+                extra = self._counts.shape[1]
+                self._counts = numpy.hstack([self._counts, numpy.zeros((self.num_slots, extra), dtype=numpy.int64)])
+                self._log_counts = numpy.hstack([self._log_counts, numpy.full((self.num_slots, extra), math.log(self.prior))])
+        return column
+
+    def observe(self, clue: str, slot: int):
+        """Observe a clue revealed to have been given for a slot.
+
+        Args:
+            clue (str): The clue.
+            slot (int): The slot it was given for.
+        """
+        column = self._add_column(clue)
+        count = self._counts[slot, column] = self._counts[slot, column] + 1
+        self._log_counts[slot, column] = math.log(count + self.prior)
+        total = self._totals[slot] = self._totals[slot] + 1
+        self._log_totals[slot] = math.log(total + self.prior * self.vocabulary_size)
+        self.observations += 1
+
+    def observe_note(self, clues: Clue, code: Code):
+        """Observe the clues of a revealed note, each given for the slot of its code number.
+
+        Args:
+            clues (Clue): The note's clues.
+            code (Code): The note's correct code.
+        """
+        for clue, slot in zip(clues, code):
+            self.observe(clue, slot)
+
+    def log_likelihoods(self, clues: Clue) -> "numpy.ndarray":
+        """Get the log-probability of each clue being given for each slot.
+
+        Args:
+            clues (Clue): The clues.
+
+        Returns:
+            numpy.ndarray: A (slots, len(clues)) array of log-probabilities.
+        """
+        columns = [self._column(clue) for clue in clues]
+        return self._log_counts[:, columns] - self._log_totals[:, None]
+
+    def score_codes(self, clues: Clue, codes: Optional["numpy.ndarray"] = None) -> "numpy.ndarray":
+        """Score candidate codes for clues by their log-likelihood, which is their log-posterior up to a constant.
+
+        Args:
+            clues (Clue): The clues, in the order of their code numbers.
+            codes (Optional[numpy.ndarray], optional): A (codes, len(clues)) array of candidate codes. Defaults to None, using every code in code_space.
+
+        Returns:
+            numpy.ndarray: The score of each code.
+        """
+        if codes is None:
+            codes = code_space(self.num_slots, len(clues))
+        log_likelihoods = self.log_likelihoods(clues)
+        return log_likelihoods[codes, numpy.arange(len(clues))].sum(axis=1)
+
+    def posterior(self, clues: Clue, codes: Optional["numpy.ndarray"] = None) -> "numpy.ndarray":
+        """Get the posterior probability of each candidate code for clues.
+
+        Args:
+            clues (Clue): The clues, in the order of their code numbers.
+            codes (Optional[numpy.ndarray], optional): A (codes, len(clues)) array of candidate codes. Defaults to None, using every code in code_space.
+
+        Returns:
+            numpy.ndarray: The probability of each code, summing to 1.
+        """
+        scores = self.score_codes(clues, codes)
+        probabilities = numpy.exp(scores - scores.max())
+        return probabilities / probabilities.sum()
+
+
+class BayesianIntercepter(Intercepter):
+    """A teammate who intercepts with the most probable code under a ClueSlotPosterior of the opponent's revealed clues. Ties are broken at random.
+
+    The posterior is built on the intercepter's first decision of each game, then only the clues revealed since its last decision are observed.
+
+    Args:
+        seed (int, optional): The random seed for breaking ties. Defaults to None.
+        prior (float, optional): The Dirichlet pseudo-count of each clue for each slot. Defaults to DEFAULT_PRIOR.
+    """
+    def __init__(self, seed: Optional[int] = None, prior: float = DEFAULT_PRIOR):
+        _require_numpy()
+        self.random = random.Random(seed)
+        self.prior = prior
+        self.posterior: Optional[ClueSlotPosterior] = None
+        self._game = None
+        self._slot_counts: list[int] = []
+
+    def update(self, context: TeamContext):
+        """Bring the posterior up to date with the opponent's revealed clues.
+
+        Args:
+            context (TeamContext): The intercepter's context.
+        """
+        if context.game is not self._game:
+            self._game = context.game
+            self.posterior = ClueSlotPosterior(context.num_opponent_keywords, self.prior)
+            self._slot_counts = [0] * context.num_opponent_keywords
+        # with two teams, the opponent is the other team
+        slot_clues = context.features.slot_clues[1 - context.team_name]
+        for slot, clues in enumerate(slot_clues[:len(self._slot_counts)]):
+            if len(clues) > self._slot_counts[slot]:
+                for clue in context.decode_clues(clues[self._slot_counts[slot]:]):
+                    self.posterior.observe(clue, slot)
+                self._slot_counts[slot] = len(clues)
+
+    def intercept_clues(self, opponent_clues: Clue, context: TeamContext) -> Code:
+        """Guess the most probable code for the opposing team's clues.
+
+        Args:
+            opponent_clues (Clue): The clues provided by the opposing team.
+            context (TeamContext): Relevant information the Intercepter's decision may be guided by.
+
+        Returns:
+            Code: Distinct code numbers, one for each clue.
+        """
+        self.update(context)
+        codes = code_space(context.num_opponent_keywords, len(opponent_clues))
+        scores = self.posterior.score_codes(opponent_clues, codes)
+        # scores summed in a different order may differ in their last bits, so near ties are ties
+        best = numpy.flatnonzero(scores >= scores.max() - 1e-9)
+        return tuple(codes[self.random.choice(best)].tolist())
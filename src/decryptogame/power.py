@@ -0,0 +1,240 @@
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Executor
+import dataclasses
+from decryptogame.batch import play_batch
+from decryptogame.components import Keywords, TeamName
+from decryptogame.teams import Team
+import math
+from statistics import NormalDist
+from typing import Optional
+
+DEFAULT_EFFECT = 0.05
+DEFAULT_ALPHA = 0.05
+DEFAULT_BETA = 0.1
+DEFAULT_BATCH_GAMES = 500
+DEFAULT_GROWTH = 1.5
+DEFAULT_MAX_GAMES = 1000000
+
+# the decisions of a sequential test
+BETTER = "better"
+WORSE = "worse"
+EQUIVALENT = "equivalent"
+UNDECIDED = "undecided"
+
+
+def _log_likelihood_ratio(wins: int, losses: int, p1: float, p0: float = 0.5) -> float:
+    return wins * math.log(p1 / p0) + losses * math.log((1 - p1) / (1 - p0))
+
+def fixed_sample_games(effect: float = DEFAULT_EFFECT, alpha: float = DEFAULT_ALPHA, beta: float = DEFAULT_BETA) -> int:
+    """Find the number of decisive games a fixed-budget run needs to detect an effect, with a two-sided binomial test of the candidate's share of decisive games.
+
+    Args:
+        effect (float, optional): The difference from an even share of decisive games to detect. Defaults to DEFAULT_EFFECT.
+        alpha (float, optional): The chance of declaring a difference between equal teams. Defaults to DEFAULT_ALPHA.
+        beta (float, optional): The chance of missing a difference of the effect size. Defaults to DEFAULT_BETA.
+
+    Returns:
+        int: The number of decisive games.
+    """
+    normal = NormalDist()
+    p1 = 0.5 + effect
+    z = normal.inv_cdf(1 - alpha / 2) * 0.5 + normal.inv_cdf(1 - beta) * math.sqrt(p1 * (1 - p1))
+    return math.ceil((z / effect) ** 2)
+
+
+class SequentialTest:
+    """Wald's sequential probability ratio test of whether a candidate team wins more or less often than its opponent.
+
+    The test is on the candidate's share of decisive games. Two one-sided tests of an even share, against a share higher and lower by the effect,
+    each run at half the error rates, and the test stops once both have decided. Tied games, such as those where
+    interception_miscommunication_diff_tiebreaker returns None, favor neither team, so they are counted but do not move the test.
+
+    Args:
+        effect (float, optional): The difference from an even share of decisive games to detect. Defaults to DEFAULT_EFFECT.
+        alpha (float, optional): The chance of declaring a difference between equal teams. Defaults to DEFAULT_ALPHA.
+        beta (float, optional): The chance of missing a difference of the effect size. Defaults to DEFAULT_BETA.
+
+    Attributes:
+        wins (int): The number of games the candidate won.
+        losses (int): The number of games the candidate lost.
+        ties (int): The number of tied games.
+        decision (str): BETTER, WORSE or EQUIVALENT once the test stops, and UNDECIDED before.
+    """
+    def __init__(self, effect: float = DEFAULT_EFFECT, alpha: float = DEFAULT_ALPHA, beta: float = DEFAULT_BETA):
+        if not 0 < effect < 0.5:
+            raise ValueError(f"effect must be between 0 and 0.5, not {effect}")
+        self.effect = effect
+        self.alpha = alpha
+        self.beta = beta
+        self.wins = 0
+        self.losses = 0
+        self.ties = 0
+        self.decision = UNDECIDED
+        self.upper_bound = math.log((1 - beta / 2) / (alpha / 2))
+        self.lower_bound = math.log((beta / 2) / (1 - alpha / 2))
+        # the decisions of the one-sided tests for a better and a worse candidate, None until each decides
+        self._better: Optional[bool] = None
+        self._worse: Optional[bool] = None
+
+    @property
+    def games(self) -> int:
+        """Get the number of games the test has seen.
+
+        Returns:
+            int: The number of games.
+        """
+        return self.wins + self.losses + self.ties
+
+    def log_likelihood_ratios(self) -> tuple[float, float]:
+        """Get the evidence for each one-sided test.
+
+        Returns:
+            tuple[float, float]: The log likelihood ratios of a better and of a worse candidate against equal teams.
+        """
+        return (_log_likelihood_ratio(self.wins, self.losses, 0.5 + self.effect),
+                _log_likelihood_ratio(self.wins, self.losses, 0.5 - self.effect))
+
+    def update(self, won: Optional[bool]) -> str:
+        """Add the outcome of a game to the test. Outcomes after the test stops are counted, but do not change its decision.
+
+        Args:
+            won (Optional[bool]): True if the candidate won, False if it lost, or None for a tie.
+
+        Returns:
+            str: The test's decision.
+        """
+        if won is None:
+            self.ties += 1
+            return self.decision
+        if won:
+            self.wins += 1
+        else:
+            self.losses += 1
+        if self.decision != UNDECIDED:
+            return self.decision
+        better, worse = self.log_likelihood_ratios()
+        if self._better is None and not self.lower_bound < better < self.upper_bound:
+            self._better = better >= self.upper_bound
+        if self._worse is None and not self.lower_bound < worse < self.upper_bound:
+            self._worse = worse >= self.upper_bound
+        if self._better:
+            self.decision = BETTER
+        elif self._worse:
+            self.decision = WORSE
+        elif self._better is False and self._worse is False:
+            self.decision = EQUIVALENT
+        return self.decision
+
+
+@dataclasses.dataclass(kw_only=True)
+class PowerResult:
+    """Dataclass representing the outcome of a sequential comparison of two teams.
+
+    Attributes:
+        decision (str): BETTER or WORSE if the candidate wins more or less often than its opponent, EQUIVALENT if they differ by less than the effect,
+            or UNDECIDED if the games ran out first.
+        games (int): The number of games simulated, in whole batches.
+        decided_at (Optional[int]): The game at which the test decided, or None if it did not.
+        wins (int): The number of games the candidate won.
+        losses (int): The number of games the candidate lost.
+        ties (int): The number of tied games.
+        fixed_games (Optional[int]): The number of games a fixed-budget run with the same error rates would simulate, at the observed rate of decisive games,
+            or None if no game was decisive.
+    """
+    decision: str
+    games: int
+    decided_at: Optional[int]
+    wins: int
+    losses: int
+    ties: int
+    fixed_games: Optional[int]
+
+    @property
+    def games_saved(self) -> Optional[int]:
+        """Get the number of games saved compared with a fixed-budget run.
+
+        Returns:
+            Optional[int]: The fixed-budget games less the games simulated, negative if the sequential run simulated more, or None if no game was decisive.
+        """
+        return self.fixed_games - self.games if self.fixed_games is not None else None
+
+    @property
+    def score(self) -> float:
+        """Get the candidate's score, counting a win as 1 and a tie as 1/2.
+
+        Returns:
+            float: The mean score per game, or 0.5 if no games were played.
+        """
+        games = self.wins + self.losses + self.ties
+        return (self.wins + self.ties / 2) / games if games else 0.5
+
+
+def _batch_sizes(batch_games: int, growth: float, max_games: int, multiple: int = 1) -> Iterable[int]:
+    # batches are rounded up to a multiple, except for a last batch cut short by max_games
+    games = 0
+    size = batch_games
+    while games < max_games:
+        size = min(-(-size // multiple) * multiple, max_games - games)
+        yield size
+        games += size
+        size = math.ceil(size * growth)
+
+def compare_teams(candidate: Callable[[Keywords], Team], opponent: Callable[[Keywords], Team], *,
+                  effect: float = DEFAULT_EFFECT,
+                  alpha: float = DEFAULT_ALPHA,
+                  beta: float = DEFAULT_BETA,
+                  batch_games: int = DEFAULT_BATCH_GAMES,
+                  growth: float = DEFAULT_GROWTH,
+                  max_games: int = DEFAULT_MAX_GAMES,
+                  seed: int = 0,
+                  swap_sides: bool = True,
+                  backend: str = "serial",
+                  executor: Optional[Executor] = None,
+                  **game_options
+                  ) -> PowerResult:
+    """Play seeded games between two teams in growing batches until a sequential test decides whether the candidate wins more often, less often,
+    or about as often as its opponent.
+
+    Args:
+        candidate (Callable[[Keywords], Team]): Builds the candidate team given its keyword card.
+        opponent (Callable[[Keywords], Team]): Builds the opponent team given its keyword card.
+        effect (float, optional): The difference from an even share of decisive games to detect, so 0.05 separates teams which win 55% of decisive games. Defaults to DEFAULT_EFFECT.
+        alpha (float, optional): The chance of declaring a difference between equal teams. Defaults to DEFAULT_ALPHA.
+        beta (float, optional): The chance of missing a difference of the effect size. Defaults to DEFAULT_BETA.
+        batch_games (int, optional): The number of games in the first batch. With swapped sides, batches are rounded up to an even number of games. Defaults to DEFAULT_BATCH_GAMES.
+        growth (float, optional): The factor each batch grows by, so long comparisons take few batches. Defaults to DEFAULT_GROWTH.
+        max_games (int, optional): The most games to simulate. Defaults to DEFAULT_MAX_GAMES.
+        seed (int, optional): The seed of the first game. Later games use the following seeds. Defaults to 0.
+        swap_sides (bool, optional): Whether the teams swap sides every other game, with the same cards and codes, so neither team is favored by its side
+            or by a seed's deal. Defaults to True.
+        backend (str, optional): The backend each batch is played with by play_batch. Defaults to "serial".
+        executor (Optional[Executor], optional): The executor to play batches with, in place of the backend. Defaults to None.
+        **game_options: Options passed on to play_seeded_game.
+
+    Returns:
+        PowerResult: The decision and the number of games it took.
+    """
+    test = SequentialTest(effect, alpha, beta)
+    decided_at = None
+    next_seed = seed
+    for size in _batch_sizes(batch_games, growth, max_games, 2 if swap_sides else 1):
+        # with swapped sides, each seed is played once from each side, so a batch holds half as many seeds
+        seeds = range(next_seed, next_seed + (size + 1) // 2 if swap_sides else next_seed + size)
+        next_seed = seeds.stop
+        results = play_batch([candidate, opponent], seeds, backend=backend, executor=executor, **game_options)
+        outcomes = [(result.winner, TeamName.WHITE) for result in results]
+        if swap_sides:
+            # a last batch cut to an odd size by max_games plays its last seed from one side only
+            swapped = play_batch([opponent, candidate], seeds[:size // 2], backend=backend, executor=executor, **game_options)
+            outcomes = ([outcome for pair in zip(outcomes, ((result.winner, TeamName.BLACK) for result in swapped)) for outcome in pair]
+                        + outcomes[len(swapped):])
+        for winner, side in outcomes:
+            if test.update(winner == side if winner is not None else None) != UNDECIDED and decided_at is None:
+                decided_at = test.games
+        if decided_at is not None:
+            break
+
+    decisive = test.wins + test.losses
+    fixed_games = math.ceil(fixed_sample_games(effect, alpha, beta) * test.games / decisive) if decisive else None
+    return PowerResult(decision=test.decision, games=test.games, decided_at=decided_at, wins=test.wins, losses=test.losses, ties=test.ties,
+                       fixed_games=fixed_games)
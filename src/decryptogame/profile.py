@@ -0,0 +1,375 @@
+"""Profile seeded games with custom teams, and write flamegraph-ready collapsed stacks and a summary which separates library time from team time.
+
+Run with `python -m decryptogame.profile --games 200 --team mybots:SmartTeam --team decryptogame.teams:RandomTeam --output league`.
+"""
+import argparse
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
+import cProfile
+import dataclasses
+import decryptogame
+from decryptogame.batch import play_seeded_game
+from decryptogame.components import Keywords
+from decryptogame.teams import Team
+import importlib
+import os
+import pstats
+import re
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+from typing import Optional
+
+DEFAULT_GAMES = 100
+DEFAULT_TEAM = "decryptogame.teams:RandomTeam"
+DEFAULT_INTERVAL = 0.001
+DEFAULT_FRAMES = 32
+DEFAULT_TOP = 25
+
+LIBRARY = "library"
+TEAM = "team"
+OTHER = "other"
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(decryptogame.__file__))
+# the ready-made teams live in the package, but their time is team time
+TEAM_MODULES = {os.path.join(PACKAGE_DIR, "teams.py")}
+# the profiler's own frames, and the frames which only hand games to the library, are not counted
+HARNESS_MODULES = {os.path.abspath(__file__), os.path.join(PACKAGE_DIR, "batch.py")}
+STDLIB_DIRS = tuple(os.path.abspath(sysconfig.get_path(name)) for name in ("stdlib", "platstdlib"))
+
+
+def frame_category(filename: str) -> Optional[str]:
+    """Decide whether code in a file is library or team code.
+
+    Args:
+        filename (str): The file of the code, as recorded by the profiler.
+
+    Returns:
+        Optional[str]: LIBRARY for the package, other than its ready-made teams, TEAM for the ready-made teams and any other code,
+            or None for the standard library, built-in functions and the profiler itself, whose time belongs to their caller.
+    """
+    if filename.startswith(("~", "<")):
+        return None
+    filename = os.path.abspath(filename)
+    if filename in HARNESS_MODULES:
+        return None
+    if filename in TEAM_MODULES:
+        return TEAM
+    if filename.startswith(PACKAGE_DIR + os.sep):
+        return LIBRARY
+    if filename.startswith(STDLIB_DIRS) and "site-packages" not in filename:
+        return None
+    return TEAM
+
+def stack_category(filenames: Sequence[str]) -> str:
+    """Decide whether a stack is spending library or team time, by its innermost frame which is library or team code.
+
+    Args:
+        filenames (Sequence[str]): The file of each frame, outermost first.
+
+    Returns:
+        str: LIBRARY, TEAM, or OTHER if no frame is library or team code.
+    """
+    for filename in reversed(filenames):
+        category = frame_category(filename)
+        if category is not None:
+            return category
+    return OTHER
+
+def frame_label(filename: str, function: str) -> str:
+    """Label a frame for a collapsed stack.
+
+    Args:
+        filename (str): The file of the frame.
+        function (str): The function of the frame.
+
+    Returns:
+        str: The label, with no semicolons or spaces so flamegraph tools can split it.
+    """
+    if filename == "~":
+        # built-in functions have no file, and their names may hold addresses which differ between runs
+        return re.sub(r" at 0x[0-9a-f]+", "", function).replace(";", ":").replace(" ", "_")
+    return f"{os.path.basename(filename)}:{function}".replace(";", ":").replace(" ", "_")
+
+
+@dataclasses.dataclass(kw_only=True)
+class FunctionStats:
+    """Dataclass representing the time spent in a function.
+
+    Attributes:
+        label (str): The function's label.
+        category (str): Whether the function's time is LIBRARY, TEAM or OTHER time.
+        calls (int): The number of calls, or of samples when sampling.
+        inline (float): The time spent in the function itself, in seconds.
+        cumulative (float): The time spent in the function and the functions it called, in seconds.
+    """
+    label: str
+    category: str
+    calls: int = 0
+    inline: float = 0.0
+    cumulative: float = 0.0
+
+
+@dataclasses.dataclass(kw_only=True)
+class Profile:
+    """Dataclass representing the result of profiling.
+
+    Attributes:
+        functions (list[FunctionStats]): The time spent in each function, longest inline time first.
+        stacks (Counter[str]): The weight of each collapsed stack, whose frames are joined by semicolons, outermost first.
+            Stacks are weighted by whole microseconds with cProfile, samples when sampling, and bytes with tracemalloc.
+        unit (str): The unit of the functions' inline and cumulative weights, "s" or "bytes".
+    """
+    functions: list[FunctionStats]
+    stacks: Counter
+    unit: str
+
+    def totals(self) -> dict[str, float]:
+        """Sum the weights of the stacks by whether they are spending library or team time.
+
+        Returns:
+            dict[str, float]: The total weight for LIBRARY, TEAM and OTHER.
+        """
+        totals = {LIBRARY: 0.0, TEAM: 0.0, OTHER: 0.0}
+        for function in self.functions:
+            totals[function.category] += function.inline
+        return totals
+
+    def write_collapsed(self, path: str):
+        """Write the collapsed stacks, one stack and its weight per line, as read by flamegraph.pl, speedscope and similar tools.
+
+        Args:
+            path (str): The path of the output file.
+        """
+        with open(path, "w") as file:
+            for stack, weight in sorted(self.stacks.items()):
+                if weight > 0:
+                    file.write(f"{stack} {weight}\n")
+
+    def summary(self, top: int = DEFAULT_TOP) -> str:
+        """Format the library and team totals, and the functions with the most inline weight.
+
+        Args:
+            top (int, optional): The number of functions listed. Defaults to DEFAULT_TOP.
+
+        Returns:
+            str: The summary table.
+        """
+        totals = self.totals()
+        overall = sum(totals.values()) or 1
+        lines = [f"{category:<8} {total:>14.6g} {self.unit:<5} {total / overall:>6.1%}" for category, total in totals.items()]
+        lines.append("")
+        lines.append(f"{'calls':>10} {'inline':>12} {'cumulative':>12} {'category':<8} function")
+        for function in self.functions[:top]:
+            lines.append(f"{function.calls:>10} {function.inline:>12.6g} {function.cumulative:>12.6g} {function.category:<8} {function.label}")
+        return "\n".join(lines)
+
+
+def load_team_factory(spec: str) -> Callable[[Keywords], Team]:
+    """Import a team factory given as "module:attribute".
+
+    Args:
+        spec (str): The module and attribute of the factory, such as "decryptogame.teams:RandomTeam".
+
+    Raises:
+        ValueError: If the spec has no attribute.
+
+    Returns:
+        Callable[[Keywords], Team]: The team factory.
+    """
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"team factory {spec!r} should be given as 'module:attribute'")
+    factory = importlib.import_module(module_name)
+    for name in attribute.split("."):
+        factory = getattr(factory, name)
+    return factory
+
+def play_games(team_factories: Sequence[Callable[[Keywords], Team]], games: int, seed: int = 0, **game_options):
+    """Play seeded games one after another, as profiled.
+
+    Args:
+        team_factories (Sequence[Callable[[Keywords], Team]]): A factory for each team.
+        games (int): The number of games.
+        seed (int, optional): The seed of the first game. Each game after uses the next seed. Defaults to 0.
+        **game_options: Options passed on to play_seeded_game.
+    """
+    for game_seed in range(seed, seed + games):
+        play_seeded_game(team_factories, game_seed, **game_options)
+
+
+def profile_deterministic(play: Callable[[], None], stats_path: Optional[str] = None) -> Profile:
+    """Profile with cProfile, which times every call. cProfile only records each function's callers,
+    so the collapsed stacks are caller and callee pairs weighted by the callee's inline time in microseconds.
+
+    Args:
+        play (Callable[[], None]): Plays the profiled games.
+        stats_path (Optional[str], optional): Where to write the raw stats, for tools such as snakeviz. Defaults to None, writing none.
+
+    Returns:
+        Profile: The profile.
+    """
+    profiler = cProfile.Profile()
+    profiler.runcall(play)
+    if stats_path is not None:
+        profiler.dump_stats(stats_path)
+    stats = pstats.Stats(profiler).stats
+
+    categories = {}
+    def category(function, seen=()) -> str:
+        # code whose time belongs to its caller takes the category of the caller which spent the most time in it
+        if function not in categories:
+            own = frame_category(function[0])
+            if own is None:
+                callers = [caller for caller in sorted(stats[function][4], key=lambda caller: -stats[function][4][caller][2])
+                           if caller in stats and caller not in seen]
+                own = category(callers[0], (*seen, function)) if callers else OTHER
+            categories[function] = own
+        return categories[function]
+
+    functions = []
+    stacks = Counter()
+    for function, (_, calls, inline, cumulative, callers) in stats.items():
+        label = frame_label(function[0], function[2])
+        functions.append(FunctionStats(label=label, category=category(function), calls=calls, inline=inline, cumulative=cumulative))
+        for caller, (_, _, caller_inline, _) in callers.items():
+            stacks[f"{frame_label(caller[0], caller[2])};{label}"] += round(caller_inline * 1e6)
+        if not callers:
+            stacks[label] += round(inline * 1e6)
+    functions.sort(key=lambda function: -function.inline)
+    return Profile(functions=functions, stacks=stacks, unit="s")
+
+def profile_sampling(play: Callable[[], None], interval: float = DEFAULT_INTERVAL) -> Profile:
+    """Profile by sampling the stack of the playing thread at intervals, which slows play much less than cProfile and records whole stacks.
+    Collapsed stacks are weighted by their number of samples.
+
+    Args:
+        play (Callable[[], None]): Plays the profiled games.
+        interval (float, optional): The time between samples, in seconds. Defaults to DEFAULT_INTERVAL.
+
+    Returns:
+        Profile: The profile.
+    """
+    thread_id = threading.get_ident()
+    stacks = Counter()
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(interval):
+            frame = sys._current_frames().get(thread_id)
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            # the stack is keyed by its code objects, which are only labelled once sampling is over
+            stacks[tuple(reversed(codes))] += 1
+
+    # the sampler can only run when the playing thread hands over the GIL, so it is handed over as often as samples are due
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(min(switch_interval, interval))
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        play()
+    finally:
+        done.set()
+        sampler.join()
+        sys.setswitchinterval(switch_interval)
+
+    functions: dict[str, FunctionStats] = {}
+    collapsed = Counter()
+    for codes, samples in stacks.items():
+        labels = [frame_label(code.co_filename, code.co_name) for code in codes]
+        collapsed[";".join(labels)] += samples
+        category = stack_category([code.co_filename for code in codes])
+        for label, code in dict(zip(labels, codes)).items():
+            functions.setdefault(label, FunctionStats(label=label, category=frame_category(code.co_filename) or OTHER)).cumulative += samples * interval
+        leaf = functions[labels[-1]]
+        leaf.calls += samples
+        leaf.inline += samples * interval
+        # a function takes the category of the time spent in it, which is decided at its own frame
+        leaf.category = category
+    ordered = sorted(functions.values(), key=lambda function: -function.inline)
+    return Profile(functions=ordered, stacks=collapsed, unit="s")
+
+def profile_allocations(play: Callable[[], None], frames: int = DEFAULT_FRAMES) -> Profile:
+    """Profile the memory still allocated once play is over, by the line which allocated it, with tracemalloc.
+    Collapsed stacks are the allocating tracebacks weighted by bytes.
+
+    Args:
+        play (Callable[[], None]): Plays the profiled games.
+        frames (int, optional): The number of frames recorded for each allocation. Defaults to DEFAULT_FRAMES.
+
+    Returns:
+        Profile: The profile, with inline weights in bytes.
+    """
+    tracemalloc.start(frames)
+    try:
+        play()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+    functions = []
+    stacks = Counter()
+    for statistic in snapshot.statistics("traceback"):
+        # tracebacks are most recent frame first
+        traceback = list(reversed(statistic.traceback))
+        stacks[";".join(f"{os.path.basename(frame.filename)}:{frame.lineno}" for frame in traceback)] += statistic.size
+    for statistic in snapshot.statistics("lineno"):
+        frame = statistic.traceback[0]
+        functions.append(FunctionStats(label=f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                                       category=frame_category(frame.filename) or OTHER,
+                                       calls=statistic.count, inline=statistic.size, cumulative=statistic.size))
+    return Profile(functions=functions, stacks=stacks, unit="bytes")
+
+
+def main(argv: Optional[Iterable[str]] = None) -> Profile:
+    """Run the profiling command line.
+
+    Args:
+        argv (Optional[Iterable[str]], optional): The command line arguments. Defaults to None, using sys.argv.
+
+    Returns:
+        Profile: The profile.
+    """
+    parser = argparse.ArgumentParser(prog="python -m decryptogame.profile", description="Profile seeded games of Decrypto.")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="the number of games to play")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the first game")
+    parser.add_argument("--team", action="append", dest="teams", metavar="MODULE:FACTORY",
+                        help=f"a team factory, given once for each team, or once for both. Defaults to {DEFAULT_TEAM}")
+    parser.add_argument("--mode", choices=["cprofile", "sample", "alloc"], default="cprofile",
+                        help="profile every call with cProfile, sample the stack at intervals, or find allocations with tracemalloc")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="the time between samples, in seconds")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="the number of frames recorded for each allocation")
+    parser.add_argument("--fast-outcome", action="store_true", help="skip the decisions which can no longer change the winner")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="the number of functions in the summary")
+    parser.add_argument("--output", metavar="PREFIX", help="write PREFIX.collapsed and PREFIX.txt, and PREFIX.prof with cProfile")
+    args = parser.parse_args(argv)
+
+    specs = args.teams or [DEFAULT_TEAM]
+    team_factories = [load_team_factory(spec) for spec in (specs * 2 if len(specs) == 1 else specs)]
+    play = lambda: play_games(team_factories, args.games, args.seed, fast_outcome=args.fast_outcome)
+
+    start = time.perf_counter()
+    if args.mode == "cprofile":
+        profile = profile_deterministic(play, f"{args.output}.prof" if args.output else None)
+    elif args.mode == "sample":
+        profile = profile_sampling(play, args.interval)
+    else:
+        profile = profile_allocations(play, args.frames)
+    elapsed = time.perf_counter() - start
+
+    summary = f"{args.games} games in {elapsed:.2f}s with {args.mode}\n\n{profile.summary(args.top)}"
+    print(summary)
+    if args.output:
+        profile.write_collapsed(f"{args.output}.collapsed")
+        with open(f"{args.output}.txt", "w") as file:
+            file.write(summary + "\n")
+    return profile
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+"""Check a change to a team against a corpus of archived games, by running the old and new team on every decision point of the games
+instead of replaying whole tournaments.
+
+Diff two team factories with `python -m decryptogame.regression corpus.jsonl --old MODULE:FACTORY --new MODULE:FACTORY`.
+"""
+import argparse
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import dataclasses
+from decryptogame.batch import play_seeded_game
+from decryptogame.checkpoint import dump_note, load_note
+from decryptogame.components import Keywords, Note, TeamName
+from decryptogame.game import Game
+from decryptogame.generators import RandomKeywordCards
+from decryptogame.profile import load_team_factory
+from decryptogame.teams import Team, TeamContext
+from itertools import islice
+import json
+import os
+import time
+from typing import Any, Optional
+
+DEFAULT_CHUNK_GAMES = 16
+DEFAULT_GAMES = 200
+DEFAULT_TOP = 10
+
+# the roles whose decisions are diffed
+ENCRYPT = "encrypt"
+INTERCEPT = "intercept"
+DECIPHER = "decipher"
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ArchivedGame:
+    """Dataclass representing an archived game, with everything needed to rebuild the context of each of its decisions.
+
+    Attributes:
+        keyword_cards (tuple[Keywords, ...]): The keyword card of each team.
+        notesheet (tuple[tuple[Note, ...], ...]): The notes of each round, with clues as strings.
+        seed (Optional[int]): The seed the game was played with, or None if it was not seeded.
+    """
+    keyword_cards: tuple[Keywords, ...]
+    notesheet: tuple[tuple[Note, ...], ...]
+    seed: Optional[int] = None
+
+def dump_archived_game(archived: ArchivedGame) -> dict:
+    """Convert an archived game to a compact JSON-compatible record.
+
+    Args:
+        archived (ArchivedGame): The archived game.
+
+    Returns:
+        dict: The record.
+    """
+    return {"seed": archived.seed,
+            "keyword_cards": [list(keywords) for keywords in archived.keyword_cards],
+            "notesheet": [[dump_note(note) for note in round_notes] for round_notes in archived.notesheet]}
+
+def load_archived_game(record: dict) -> ArchivedGame:
+    """Convert a record created by dump_archived_game back to an archived game.
+
+    Args:
+        record (dict): The record.
+
+    Returns:
+        ArchivedGame: The archived game.
+    """
+    return ArchivedGame(seed=record["seed"],
+                        keyword_cards=tuple(tuple(keywords) for keywords in record["keyword_cards"]),
+                        notesheet=tuple(tuple(load_note(note) for note in round_notes) for round_notes in record["notesheet"]))
+
+def write_corpus(path: str | os.PathLike, games: Iterable[ArchivedGame]):
+    """Write archived games to a corpus, one JSON record per line. It is written to a temporary file first, and only replaces the path once complete.
+
+    Args:
+        path (str | os.PathLike): The path of the corpus.
+        games (Iterable[ArchivedGame]): The archived games.
+    """
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        for archived in games:
+            file.write(json.dumps(dump_archived_game(archived), separators=(",", ":")) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+def read_corpus(path: str | os.PathLike) -> list[ArchivedGame]:
+    """Read the archived games of a corpus written by write_corpus.
+
+    Args:
+        path (str | os.PathLike): The path of the corpus.
+
+    Returns:
+        list[ArchivedGame]: The archived games.
+    """
+    with open(path) as file:
+        return [load_archived_game(json.loads(line)) for line in file if line.strip()]
+
+def record_seeded_games(team_factories: Sequence[Callable[[Keywords], Team]], seeds: Iterable[int], *,
+                        card_lengths: Optional[Sequence[int]] = None,
+                        **game_options
+                        ) -> list[ArchivedGame]:
+    """Play seeded games and archive them.
+
+    Args:
+        team_factories (Sequence[Callable[[Keywords], Team]]): A factory for each team, which builds the team given its keyword card.
+        seeds (Iterable[int]): The seed of each game.
+        card_lengths (Optional[Sequence[int]], optional): The number of keywords on each team's keyword card. Defaults to None, using DEFAULT_CARD_LENGTH.
+        **game_options: Options passed on to play_seeded_game. Games played with fast_outcome skip decisions, which are left out of diffs.
+
+    Returns:
+        list[ArchivedGame]: The archived games, in the same order as the seeds.
+    """
+    games = []
+    for seed in seeds:
+        game = play_seeded_game(team_factories, seed, card_lengths=card_lengths, **game_options)
+        # the cards are dealt as play_seeded_game deals them
+        keyword_cards = next(RandomKeywordCards(card_lengths, seed=seed))
+        notesheet = tuple(tuple(dataclasses.replace(note, clues=game.decode_clues(note.clues)) if note.clues is not None else note
+                                for note in round_notes)
+                          for round_notes in game.notesheet)
+        games.append(ArchivedGame(seed=seed, keyword_cards=tuple(keyword_cards), notesheet=notesheet))
+    return games
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class DecisionDiff:
+    """Dataclass representing a decision the old and new team made differently.
+
+    Attributes:
+        game (int): The index of the game in the corpus.
+        seed (Optional[int]): The seed of the game.
+        round_number (int): The round of the decision, counting from 0.
+        team_name (TeamName): The team which made the decision.
+        role (str): ENCRYPT, INTERCEPT or DECIPHER.
+        decision_input (tuple): The code the encryptor gave clues for, or the clues the intercepter or guesser deciphered.
+        old (tuple): The old team's decision.
+        new (tuple): The new team's decision.
+    """
+    game: int
+    seed: Optional[int]
+    round_number: int
+    team_name: TeamName
+    role: str
+    decision_input: tuple
+    old: tuple
+    new: tuple
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class GameDiff:
+    """Dataclass representing the diffs of an archived game, and the outcome each team's decisions lead to.
+
+    Outcomes are found by scoring the archived notesheet with each team's interception and decipher attempts in place of the archived ones.
+    Clues are not scored, since the other team's answers to changed clues are not known, so changed clues only appear as diffs.
+
+    Attributes:
+        game (int): The index of the game in the corpus.
+        seed (Optional[int]): The seed of the game.
+        decisions (int): The number of decisions compared.
+        diffs (tuple[DecisionDiff, ...]): The decisions which differ.
+        old_winner (Optional[TeamName]): The winner with the old team's decisions, or None for a tie or a game the archive ends first.
+        new_winner (Optional[TeamName]): The winner with the new team's decisions, or None for a tie or a game the archive ends first.
+        old_rounds (int): The number of rounds played with the old team's decisions.
+        new_rounds (int): The number of rounds played with the new team's decisions.
+    """
+    game: int
+    seed: Optional[int]
+    decisions: int
+    diffs: tuple[DecisionDiff, ...]
+    old_winner: Optional[TeamName]
+    new_winner: Optional[TeamName]
+    old_rounds: int
+    new_rounds: int
+
+    @property
+    def outcome_changed(self) -> bool:
+        """Check whether the new team's decisions change the game's winner or length.
+
+        Returns:
+            bool: True if the outcome changed.
+        """
+        return (self.old_winner, self.old_rounds) != (self.new_winner, self.new_rounds)
+
+
+@dataclasses.dataclass(kw_only=True)
+class RegressionReport:
+    """Dataclass representing the diffs of a corpus.
+
+    Attributes:
+        games (list[GameDiff]): The diffs of each game, in the same order as the corpus.
+        elapsed (float): The time taken, in seconds.
+    """
+    games: list[GameDiff]
+    elapsed: float = 0.0
+
+    @property
+    def decisions(self) -> int:
+        """Get the number of decisions compared.
+
+        Returns:
+            int: The number of decisions.
+        """
+        return sum(game.decisions for game in self.games)
+
+    @property
+    def diffs(self) -> list[DecisionDiff]:
+        """Get every decision which differs.
+
+        Returns:
+            list[DecisionDiff]: The diffs, in corpus order.
+        """
+        return [diff for game in self.games for diff in game.diffs]
+
+    @property
+    def outcome_changes(self) -> list[GameDiff]:
+        """Get the games whose outcome changed.
+
+        Returns:
+            list[GameDiff]: The games, in corpus order.
+        """
+        return [game for game in self.games if game.outcome_changed]
+
+    def summary(self, top: int = DEFAULT_TOP) -> str:
+        """Summarize the report as text.
+
+        Args:
+            top (int, optional): The number of diffs and outcome changes listed. Defaults to DEFAULT_TOP.
+
+        Returns:
+            str: The summary.
+        """
+        diffs = self.diffs
+        outcome_changes = self.outcome_changes
+        roles = Counter(diff.role for diff in diffs)
+        lines = [f"{len(diffs)} of {self.decisions} decisions changed in {len(self.games)} games ({self.elapsed:.2f}s)",
+                 "  ".join(f"{role}: {roles[role]}" for role in (ENCRYPT, INTERCEPT, DECIPHER)),
+                 f"{len(outcome_changes)} outcomes changed, "
+                 f"{sum(game.old_winner != game.new_winner for game in outcome_changes)} with a different winner"]
+        if diffs:
+            lines.append("")
+            lines.extend(f"game {diff.game} (seed {diff.seed}) round {diff.round_number} team {diff.team_name} {diff.role} "
+                         f"{list(diff.decision_input)}: {list(diff.old)} -> {list(diff.new)}" for diff in diffs[:top])
+        if outcome_changes:
+            lines.append("")
+            lines.extend(f"game {game.game} (seed {game.seed}): winner {game.old_winner} in {game.old_rounds} rounds -> "
+                         f"winner {game.new_winner} in {game.new_rounds} rounds" for game in outcome_changes[:top])
+        return "\n".join(lines)
+
+
+def _decision(decision: Any) -> Optional[tuple]:
+    return tuple(decision) if decision is not None else None
+
+def _score(game_factory: Callable[[], Game], notesheet: Iterable[Sequence[Note]]) -> tuple[Optional[TeamName], int]:
+    game = game_factory()
+    for round_notes in notesheet:
+        if game.game_over():
+            break
+        game.process_round_notes(list(round_notes))
+    return game.winner(), game._data.rounds_played
+
+def diff_game(old_factory: Callable[[Keywords], Team], new_factory: Callable[[Keywords], Team], archived: ArchivedGame, *,
+              index: int = 0,
+              team_names: Sequence[TeamName] = (TeamName.WHITE, TeamName.BLACK),
+              game_factory: Callable[[], Game] = Game
+              ) -> GameDiff:
+    """Run the old and new team on every decision point of an archived game.
+
+    The context of each round's decisions is rebuilt from the archived notesheet before the round, and decisions are made in the same order as in
+    play_round, so teams which keep state between decisions of a game see the same sequence of contexts as in a game. Each decision is given the
+    archived input, so a change in one decision does not change the inputs of later ones.
+
+    Args:
+        old_factory (Callable[[Keywords], Team]): Builds the old team given its keyword card.
+        new_factory (Callable[[Keywords], Team]): Builds the new team given its keyword card.
+        archived (ArchivedGame): The archived game.
+        index (int, optional): The index of the game in its corpus, recorded in the diffs. Defaults to 0.
+        team_names (Sequence[TeamName], optional): The teams whose decisions are diffed. The other team's archived decisions are kept. Defaults to both teams.
+        game_factory (Callable[[], Game], optional): Builds the game with the rules the archive was played under. Defaults to Game.
+
+    Returns:
+        GameDiff: The diffs and outcomes.
+    """
+    old_teams = {team_name: old_factory(archived.keyword_cards[team_name]) for team_name in team_names}
+    new_teams = {team_name: new_factory(archived.keyword_cards[team_name]) for team_name in team_names}
+    game = game_factory()
+    contexts = {team_name: TeamContext(team_name=team_name, keywords=archived.keyword_cards[team_name],
+                                       num_opponent_keywords=len(archived.keyword_cards[not team_name]), game=game)
+                for team_name in team_names}
+    diffs = []
+    decisions = 0
+    old_notesheet = []
+    new_notesheet = []
+
+    def compare(round_number, team_name, role, decision_input, decide):
+        nonlocal decisions
+        if decision_input is None:
+            return None, None
+        old = _decision(decide(old_teams[team_name]))
+        new = _decision(decide(new_teams[team_name]))
+        decisions += 1
+        if old != new:
+            diffs.append(DecisionDiff(game=index, seed=archived.seed, round_number=round_number, team_name=team_name, role=role,
+                                      decision_input=tuple(decision_input), old=old, new=new))
+        return old, new
+
+    for round_number, round_notes in enumerate(archived.notesheet):
+        old_notes = list(round_notes)
+        new_notes = list(round_notes)
+        for team_name in team_names:
+            code = round_notes[team_name].correct_code
+            compare(round_number, team_name, ENCRYPT, code, lambda team: team.encryptor.decide_clues(code, contexts[team_name]))
+        for team_name in team_names:
+            # the interception is kept for the opposing team's note
+            opponent = not team_name
+            clues = round_notes[opponent].clues
+            old, new = compare(round_number, team_name, INTERCEPT, clues, lambda team: team.intercepter.intercept_clues(clues, contexts[team_name]))
+            if clues is not None:
+                old_notes[opponent] = dataclasses.replace(old_notes[opponent], attempted_interception=old)
+                new_notes[opponent] = dataclasses.replace(new_notes[opponent], attempted_interception=new)
+        for team_name in team_names:
+            clues = round_notes[team_name].clues
+            old, new = compare(round_number, team_name, DECIPHER, clues, lambda team: team.guesser.decipher_clues(clues, contexts[team_name]))
+            if clues is not None:
+                old_notes[team_name] = dataclasses.replace(old_notes[team_name], attempted_decipher=old)
+                new_notes[team_name] = dataclasses.replace(new_notes[team_name], attempted_decipher=new)
+        old_notesheet.append(old_notes)
+        new_notesheet.append(new_notes)
+
+        # the archived round is revealed before the next round's decisions, with clues interned for games with a clue table
+        clue_table = game.clue_table
+        game.process_round_notes([dataclasses.replace(note, clues=clue_table.intern_clues(note.clues))
+                                  if clue_table is not None and note.clues is not None else note
+                                  for note in round_notes])
+
+    old_winner, old_rounds = _score(game_factory, old_notesheet)
+    new_winner, new_rounds = _score(game_factory, new_notesheet)
+    return GameDiff(game=index, seed=archived.seed, decisions=decisions, diffs=tuple(diffs),
+                    old_winner=old_winner, new_winner=new_winner, old_rounds=old_rounds, new_rounds=new_rounds)
+
+def diff_chunk(old_factory: Callable[[Keywords], Team], new_factory: Callable[[Keywords], Team], games: Iterable[tuple[int, ArchivedGame]],
+               **diff_options) -> list[GameDiff]:
+    """Diff a chunk of archived games.
+
+    Args:
+        old_factory (Callable[[Keywords], Team]): Builds the old team given its keyword card.
+        new_factory (Callable[[Keywords], Team]): Builds the new team given its keyword card.
+        games (Iterable[tuple[int, ArchivedGame]]): The index of each game in its corpus, and the game.
+        **diff_options: Options passed on to diff_game.
+
+    Returns:
+        list[GameDiff]: The diffs of each game, in the same order.
+    """
+    return [diff_game(old_factory, new_factory, archived, index=index, **diff_options) for index, archived in games]
+
+
+def diff_teams(old_factory: Callable[[Keywords], Team], new_factory: Callable[[Keywords], Team], corpus: Iterable[ArchivedGame], *,
+               backend: str = "processes",
+               max_workers: Optional[int] = None,
+               executor: Optional[Executor] = None,
+               chunk_games: int = DEFAULT_CHUNK_GAMES,
+               **diff_options
+               ) -> RegressionReport:
+    """Diff the decisions of an old and new team on every decision point of a corpus, in chunks of games run concurrently.
+
+    Args:
+        old_factory (Callable[[Keywords], Team]): Builds the old team given its keyword card. It must be picklable for the processes backend.
+        new_factory (Callable[[Keywords], Team]): Builds the new team given its keyword card. It must be picklable for the processes backend.
+        corpus (Iterable[ArchivedGame]): The archived games.
+        backend (str, optional): Either "processes", "threads" or "serial". Defaults to "processes".
+        max_workers (Optional[int], optional): The number of processes or threads. Defaults to None, using the executor's default.
+        executor (Optional[Executor], optional): The executor to diff chunks with, in place of the backend. Defaults to None.
+        chunk_games (int, optional): The number of games in each chunk. Defaults to DEFAULT_CHUNK_GAMES.
+        **diff_options: Options passed on to diff_game, such as team_names and game_factory.
+
+    Raises:
+        ValueError: If the backend is unknown.
+
+    Returns:
+        RegressionReport: The diffs of each game.
+    """
+    start = time.perf_counter()
+    games = enumerate(corpus)
+    chunks = iter(lambda: list(islice(games, chunk_games)), [])
+    if executor is None and backend == "serial":
+        diffs = [diff for chunk in chunks for diff in diff_chunk(old_factory, new_factory, chunk, **diff_options)]
+        return RegressionReport(games=diffs, elapsed=time.perf_counter() - start)
+    if executor is not None:
+        owned_executor = None
+    elif backend == "processes":
+        owned_executor = executor = ProcessPoolExecutor(max_workers)
+    elif backend == "threads":
+        owned_executor = executor = ThreadPoolExecutor(max_workers)
+    else:
+        raise ValueError(f"unknown backend {backend!r}, expected 'processes', 'threads' or 'serial'")
+    try:
+        futures = [executor.submit(diff_chunk, old_factory, new_factory, chunk, **diff_options) for chunk in chunks]
+        diffs = [diff for future in futures for diff in future.result()]
+    finally:
+        if owned_executor is not None:
+            owned_executor.shutdown(cancel_futures=True)
+    return RegressionReport(games=diffs, elapsed=time.perf_counter() - start)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> RegressionReport:
+    """Run the command line which diffs two team factories on a corpus, first recording the corpus from seeded games of the old team if it does not exist.
+
+    Args:
+        argv (Optional[Iterable[str]], optional): The command line arguments. Defaults to None, using sys.argv.
+
+    Returns:
+        RegressionReport: The report.
+    """
+    parser = argparse.ArgumentParser(prog="python -m decryptogame.regression", description="Diff the decisions of two teams on a corpus of archived games.")
+    parser.add_argument("corpus", help="the corpus of archived games, one JSON record per line")
+    parser.add_argument("--old", required=True, metavar="MODULE:FACTORY", help="the factory of the old team")
+    parser.add_argument("--new", required=True, metavar="MODULE:FACTORY", help="the factory of the new team")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="the number of seeded games of the old team to record, if the corpus does not exist")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the first recorded game")
+    parser.add_argument("--team-name", type=int, action="append", dest="team_names", choices=[0, 1],
+                        help="a team whose decisions are diffed, given once for each team. Defaults to both teams")
+    parser.add_argument("--backend", choices=["processes", "threads", "serial"], default="processes", help="how games are diffed in parallel")
+    parser.add_argument("--workers", type=int, help="the number of processes or threads")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="the number of diffs and outcome changes listed")
+    args = parser.parse_args(argv)
+
+    old_factory = load_team_factory(args.old)
+    new_factory = load_team_factory(args.new)
+    if not os.path.exists(args.corpus):
+        write_corpus(args.corpus, record_seeded_games([old_factory, old_factory], range(args.seed, args.seed + args.games)))
+    team_names = [TeamName(team_name) for team_name in args.team_names] if args.team_names else [TeamName.WHITE, TeamName.BLACK]
+    report = diff_teams(old_factory, new_factory, read_corpus(args.corpus), backend=args.backend, max_workers=args.workers, team_names=team_names)
+    print(report.summary(args.top))
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+from collections.abc import Callable, Iterable, Sequence
+import dataclasses
+from decryptogame.components import GameData, Note, TeamName
+from decryptogame.end_criteria import InterceptionEndCondition, MiscommunicationEndCondition, RoundEndCondition
+from decryptogame.game import Game, interception_miscommunication_diff_tiebreaker, interception_rule, miscommunication_rule
+from functools import partial
+from typing import Optional
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the winner recorded for games which are tied or not over
+NO_WINNER = -1
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("numpy is required for bulk replay. Install it with `pip install decryptogame[numpy]`.")
+
+
+@dataclasses.dataclass(kw_only=True)
+class PackedNotesheets:
+    """Dataclass representing many notesheets packed into arrays of the results the built-in rules score, padded to the longest notesheet.
+
+    Attributes:
+        miscommunicated (numpy.ndarray): A (games, rounds, teams) bool array of whether each team's decipher attempt was wrong.
+        intercepted (numpy.ndarray): A (games, rounds, teams) bool array of whether each team's note was intercepted, which scores for the opponent.
+        rounds (numpy.ndarray): A (games,) array of the number of rounds in each notesheet.
+    """
+    miscommunicated: "numpy.ndarray"
+    intercepted: "numpy.ndarray"
+    rounds: "numpy.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.rounds)
+
+def pack_notesheets(notesheets: Iterable[Sequence[Sequence[Note]]], num_teams: int = 2) -> PackedNotesheets:
+    """Pack notesheets into arrays of their round results. Packed notesheets can be replayed many times, under different end conditions, without comparing codes again.
+
+    Args:
+        notesheets (Iterable[Sequence[Sequence[Note]]]): The notesheets, each a list of the notes for each round.
+        num_teams (int, optional): The number of teams. Defaults to 2.
+
+    Returns:
+        PackedNotesheets: The packed notesheets.
+    """
+    _require_numpy()
+    notesheets = list(notesheets)
+    rounds = numpy.fromiter((len(notesheet) for notesheet in notesheets), dtype=numpy.int64, count=len(notesheets))
+    max_rounds = int(rounds.max()) if len(rounds) else 0
+    miscommunicated = numpy.zeros((len(notesheets), max_rounds, num_teams), dtype=bool)
+    intercepted = numpy.zeros((len(notesheets), max_rounds, num_teams), dtype=bool)
+    for game_index, notesheet in enumerate(notesheets):
+        game_miscommunicated = miscommunicated[game_index]
+        game_intercepted = intercepted[game_index]
+        for round_index, round_notes in enumerate(notesheet):
+            game_miscommunicated[round_index] = [note.attempted_decipher != note.correct_code for note in round_notes]
+            game_intercepted[round_index] = [note.attempted_interception == note.correct_code for note in round_notes]
+    return PackedNotesheets(miscommunicated=miscommunicated, intercepted=intercepted, rounds=rounds)
+
+
+@dataclasses.dataclass(kw_only=True)
+class ReplayResults:
+    """Dataclass representing the final state of many replayed games.
+
+    Attributes:
+        rounds_played (numpy.ndarray): A (games,) array of the rounds played before each game ended, or of every round if it did not end.
+        miscommunications (numpy.ndarray): A (games, teams) array of each team's final miscommunications.
+        interceptions (numpy.ndarray): A (games, teams) array of each team's final interceptions.
+        game_over (numpy.ndarray): A (games,) bool array of whether each game is over.
+        winners (numpy.ndarray): A (games,) array of each game's winner, or NO_WINNER for a tie or a game which is not over.
+    """
+    rounds_played: "numpy.ndarray"
+    miscommunications: "numpy.ndarray"
+    interceptions: "numpy.ndarray"
+    game_over: "numpy.ndarray"
+    winners: "numpy.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.rounds_played)
+
+    def data(self, index: int) -> GameData:
+        """Get the final game data of a game.
+
+        Args:
+            index (int): The index of the game.
+
+        Returns:
+            GameData: The game data.
+        """
+        return GameData(rounds_played=int(self.rounds_played[index]),
+                        miscommunications=self.miscommunications[index].tolist(),
+                        interceptions=self.interceptions[index].tolist())
+
+    def winner(self, index: int) -> Optional[TeamName]:
+        """Get the winner of a game.
+
+        Args:
+            index (int): The index of the game.
+
+        Returns:
+            Optional[TeamName]: The team name of the winner or None if there is no winner (tie or the game is not over).
+        """
+        winner = int(self.winners[index])
+        return TeamName(winner) if winner != NO_WINNER else None
+
+
+def _count_first_round(interception_func) -> Optional[bool]:
+    # the built-in interception rule, possibly with count_first_round bound, can be replayed in bulk
+    if interception_func is interception_rule:
+        return False
+    if (isinstance(interception_func, partial) and interception_func.func is interception_rule
+            and not interception_func.args and set(interception_func.keywords) <= {"count_first_round"}):
+        return bool(interception_func.keywords.get("count_first_round", False))
+    return None
+
+def bulk_replayable(game: Game) -> bool:
+    """Check if games with the same rules as a game can be replayed in bulk. They can if they use the built-in miscommunication rule,
+    the built-in interception rule, possibly with count_first_round bound by functools.partial, and only the built-in end conditions.
+
+    Args:
+        game (Game): A game with the rules to check.
+
+    Returns:
+        bool: True if the rules can be replayed in bulk, False otherwise.
+    """
+    return (game.miscommunication_func is miscommunication_rule
+            and _count_first_round(game.interception_func) is not None
+            and all(type(end_condition) in (RoundEndCondition, MiscommunicationEndCondition, InterceptionEndCondition)
+                    for end_condition in game.end_conditions))
+
+def replay_packed(packed: PackedNotesheets, game_factory: Callable[[], Game] = Game) -> ReplayResults:
+    """Replay packed notesheets in bulk, with array operations over every game at once. The results match building each game from its notesheet.
+
+    Args:
+        packed (PackedNotesheets): The packed notesheets.
+        game_factory (Callable[[], Game], optional): Builds a game with the rules to replay by. Defaults to Game.
+
+    Raises:
+        ValueError: If the rules can not be replayed in bulk.
+
+    Returns:
+        ReplayResults: The final state of each game.
+    """
+    _require_numpy()
+    rules = game_factory()
+    if not bulk_replayable(rules):
+        raise ValueError("only the built-in rules and end conditions can be replayed in bulk, replay notesheets with replay_notesheets instead")
+    num_games, max_rounds, num_teams = packed.miscommunicated.shape
+    if max_rounds == 0:
+        # a padding round keeps the array operations defined
+        padding = numpy.zeros((num_games, 1, num_teams), dtype=bool)
+        packed = PackedNotesheets(miscommunicated=padding, intercepted=padding, rounds=packed.rounds)
+        max_rounds = 1
+    round_ks = [end_condition.k for end_condition in rules.end_conditions if type(end_condition) is RoundEndCondition]
+    miscommunication_ks = [end_condition.k for end_condition in rules.end_conditions if type(end_condition) is MiscommunicationEndCondition]
+    interception_ks = [end_condition.k for end_condition in rules.end_conditions if type(end_condition) is InterceptionEndCondition]
+
+    # rounds beyond the end of a shorter notesheet are padding
+    recorded = numpy.arange(max_rounds)[None, :] < packed.rounds[:, None]
+    intercepted = packed.intercepted & recorded[:, :, None]
+    if not _count_first_round(rules.interception_func):
+        intercepted[:, 0] = False
+    # with two teams, a team's note being intercepted scores for the opponent
+    miscommunications = numpy.cumsum(packed.miscommunicated & recorded[:, :, None], axis=1, dtype=numpy.int64)
+    interceptions = numpy.cumsum(intercepted[:, :, ::-1], axis=1, dtype=numpy.int64)
+
+    # each team gains at most one token a round, so a game first ends at the first round a count equals its condition
+    over = numpy.zeros((num_games, max_rounds), dtype=bool)
+    for k in miscommunication_ks:
+        over |= (miscommunications == k).any(axis=2)
+    for k in interception_ks:
+        over |= (interceptions == k).any(axis=2)
+    for k in round_ks:
+        if 0 < k <= max_rounds:
+            over[:, k - 1] = True
+    over &= recorded
+
+    if any(k == 0 for k in [*round_ks, *miscommunication_ks, *interception_ks]):
+        # the game is over before any round is played
+        rounds_played = numpy.zeros(num_games, dtype=numpy.int64)
+        game_over = numpy.ones(num_games, dtype=bool)
+    else:
+        game_over = over.any(axis=1)
+        rounds_played = numpy.where(game_over, over.argmax(axis=1) + 1, packed.rounds)
+
+    final_round = numpy.maximum(rounds_played - 1, 0)[:, None, None]
+    played = (rounds_played > 0)[:, None]
+    final_miscommunications = numpy.take_along_axis(miscommunications, final_round, axis=1)[:, 0] * played
+    final_interceptions = numpy.take_along_axis(interceptions, final_round, axis=1)[:, 0] * played
+
+    # a team wins if an interception condition names it alone, or a miscommunication condition names its opponent alone
+    candidates = numpy.zeros((num_games, num_teams), dtype=bool)
+    for k in interception_ks:
+        reached = final_interceptions == k
+        candidates |= reached & (reached.sum(axis=1) == 1)[:, None]
+    for k in miscommunication_ks:
+        reached = final_miscommunications == k
+        candidates |= reached[:, ::-1] & (reached.sum(axis=1) == 1)[:, None]
+    decided = candidates.sum(axis=1) == 1
+    winners = numpy.where(game_over & decided, candidates.argmax(axis=1), NO_WINNER).astype(numpy.int8)
+
+    undecided = numpy.flatnonzero(game_over & ~decided)
+    if rules.tiebreaker_func is interception_miscommunication_diff_tiebreaker:
+        scores = final_interceptions[undecided] - final_miscommunications[undecided]
+        winners[undecided] = numpy.where(scores[:, 0] == scores[:, 1], NO_WINNER, scores.argmax(axis=1))
+    else:
+        for index in undecided:
+            data = GameData(rounds_played=int(rounds_played[index]),
+                            miscommunications=final_miscommunications[index].tolist(),
+                            interceptions=final_interceptions[index].tolist())
+            winner = rules.tiebreaker_func(data)
+            winners[index] = winner if winner is not None else NO_WINNER
+
+    return ReplayResults(rounds_played=rounds_played, miscommunications=final_miscommunications, interceptions=final_interceptions,
+                         game_over=game_over, winners=winners)
+
+def replay_notesheets(notesheets: Iterable[Sequence[Sequence[Note]]], game_factory: Callable[[], Game] = Game) -> ReplayResults:
+    """Replay many notesheets, as re-scoring archived games under new rules. Games using the built-in rules are packed and replayed in bulk,
+    and games using other rules are built one at a time from their notesheets.
+
+    Args:
+        notesheets (Iterable[Sequence[Sequence[Note]]]): The notesheets, each a list of the notes for each round.
+        game_factory (Callable[[], Game], optional): Builds a game with the rules to replay by. Defaults to Game.
+
+    Returns:
+        ReplayResults: The final state of each game.
+    """
+    _require_numpy()
+    prototype = game_factory()
+    if bulk_replayable(prototype):
+        return replay_packed(pack_notesheets(notesheets), game_factory)
+    # the team count is taken from a new game, so an empty corpus still has (0, teams) counters
+    num_teams = len(prototype._data.miscommunications)
+
+    games = []
+    for notesheet in notesheets:
+        game = game_factory()
+        for round_notes in notesheet:
+            if game.game_over():
+                break
+            game.process_round_notes(round_notes)
+        games.append(game)
+    winners = [game.winner() for game in games]
+    return ReplayResults(rounds_played=numpy.array([game._data.rounds_played for game in games], dtype=numpy.int64),
+                         miscommunications=numpy.array([game._data.miscommunications for game in games], dtype=numpy.int64).reshape(len(games), num_teams),
+                         interceptions=numpy.array([game._data.interceptions for game in games], dtype=numpy.int64).reshape(len(games), num_teams),
+                         game_over=numpy.array([game.game_over() for game in games], dtype=bool),
+                         winners=numpy.array([winner if winner is not None else NO_WINNER for winner in winners], dtype=numpy.int8))
@@ -0,0 +1,360 @@
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+import dataclasses
+from decryptogame.batch import DEFAULT_CHUNK_GAMES, play_seeded_game
+from decryptogame.components import Keywords
+from decryptogame.game import Game
+from decryptogame.interning import ClueTable
+import decryptogame.official_words.english as english
+from decryptogame.teams import Team
+from functools import lru_cache
+from itertools import islice
+import os
+from pathlib import Path
+from typing import Optional
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAX_KEYWORDS = 4
+MAX_CODE_LENGTH = 3
+DEFAULT_SHARD_BYTES = 64 * 1024 * 1024
+DEFAULT_SHUFFLE_RECORDS = 1 << 18
+
+# the role of the player whose decision a record holds
+ENCRYPT = 0
+INTERCEPT = 1
+DECIPHER = 2
+
+# the id of a clue or keyword outside the official word list, and of the padding after short keyword cards and codes
+UNKNOWN_WORD = -1
+PADDING = -1
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("numpy is required for self-play data. Install it with `pip install decryptogame[numpy]`.")
+
+def record_dtype() -> "numpy.dtype":
+    """Get the fixed schema of decision records. Words are stored as their index in the official word list, or UNKNOWN_WORD,
+    and keyword cards and codes shorter than the schema are padded with PADDING.
+
+    Fields:
+        game (int64): The seed of the game.
+        round (int16): The round of the decision, counting from 0.
+        team (int8): The deciding team.
+        role (int8): ENCRYPT, INTERCEPT or DECIPHER.
+        keywords (int32[MAX_KEYWORDS]): The deciding team's keywords.
+        clues (int32[MAX_CODE_LENGTH]): The clues decided by an encryptor, or the clues an intercepter or guesser decided on.
+        action (int8[MAX_CODE_LENGTH]): The code an encryptor was given, or the code an intercepter or guesser guessed.
+        correct_code (int8[MAX_CODE_LENGTH]): The code the clues were given for.
+        slot_counts (int16[MAX_KEYWORDS]): The number of clues the clue-giving team had revealed for each slot before the round.
+        miscommunications (int8[2]): Each team's miscommunications before the round, starting with the deciding team.
+        interceptions (int8[2]): Each team's interceptions before the round, starting with the deciding team.
+        outcome (int8): 1 if the deciding team won the game, -1 if it lost, or 0 for a tie.
+
+    Returns:
+        numpy.dtype: The structured record type.
+    """
+    _require_numpy()
+    return numpy.dtype([
+        ("game", numpy.int64),
+        ("round", numpy.int16),
+        ("team", numpy.int8),
+        ("role", numpy.int8),
+        ("keywords", numpy.int32, (MAX_KEYWORDS,)),
+        ("clues", numpy.int32, (MAX_CODE_LENGTH,)),
+        ("action", numpy.int8, (MAX_CODE_LENGTH,)),
+        ("correct_code", numpy.int8, (MAX_CODE_LENGTH,)),
+        ("slot_counts", numpy.int16, (MAX_KEYWORDS,)),
+        ("miscommunications", numpy.int8, (2,)),
+        ("interceptions", numpy.int8, (2,)),
+        ("outcome", numpy.int8),
+    ])
+
+
+def game_records(game: Game, keyword_cards: Sequence[Keywords], seed: int, game_factory: Callable[[], Game] = Game,
+                 clue_table: Optional[ClueTable] = None) -> "numpy.ndarray":
+    """Turn each decision of a played game into a record. The game's tokens before each round are found by replaying its notesheet in a new game.
+
+    Args:
+        game (Game): The played game.
+        keyword_cards (Sequence[Keywords]): Each team's keywords.
+        seed (int): The seed of the game, recorded with each decision.
+        game_factory (Callable[[], Game], optional): Builds a game with the rules the game was played by. Defaults to Game.
+        clue_table (Optional[ClueTable], optional): The table the game's clues were interned by, holding the official words first. Defaults to None,
+            for games which store clues as strings.
+
+    Returns:
+        numpy.ndarray: The records, three for each team in each round.
+    """
+    _require_numpy()
+    return numpy.array(_game_rows(game, keyword_cards, seed, game_factory, clue_table if clue_table is not None else official_clue_table()),
+                       dtype=record_dtype())
+
+def _game_rows(game: Game, keyword_cards: Sequence[Keywords], seed: int, game_factory: Callable[[], Game], table: ClueTable) -> list[tuple]:
+    num_words = len(english.words)
+
+    def word_ids(words: Sequence, length: int) -> list[int]:
+        ids = [table.intern(word) if isinstance(word, str) else word for word in words[:length]]
+        return [word_id if isinstance(word_id, int) and word_id < num_words else UNKNOWN_WORD for word_id in ids] + [PADDING] * (length - len(ids))
+
+    def padded(code: Optional[Sequence[int]], length: int = MAX_CODE_LENGTH) -> list[int]:
+        code = list(code[:length]) if code is not None else []
+        return code + [PADDING] * (length - len(code))
+
+    winner = game.winner()
+    keyword_ids = [word_ids(keywords, MAX_KEYWORDS) for keywords in keyword_cards]
+    outcomes = [0 if winner is None else (1 if winner == team_name else -1) for team_name in range(len(keyword_cards))]
+    slot_counts = [[0] * MAX_KEYWORDS for _ in keyword_cards]
+    replay = game_factory()
+
+    # records are built as tuples and converted at once, which is much faster than filling structured records field by field
+    rows = []
+    for round_number, round_notes in enumerate(game.notesheet):
+        # the game data is read in place, since the data property copies it
+        data = replay._data
+        clue_ids = [word_ids(note.clues, MAX_CODE_LENGTH) for note in round_notes]
+        correct_codes = [padded(note.correct_code) for note in round_notes]
+        for team_name, note in enumerate(round_notes):
+            opponent = 1 - team_name
+            tokens = ((data.miscommunications[team_name], data.miscommunications[opponent]),
+                      (data.interceptions[team_name], data.interceptions[opponent]))
+            own = (seed, round_number, team_name)
+            # each team encrypts and deciphers its own note, and intercepts the opponent's note
+            rows.append((*own, ENCRYPT, keyword_ids[team_name], clue_ids[team_name], correct_codes[team_name], correct_codes[team_name],
+                         tuple(slot_counts[team_name]), *tokens, outcomes[team_name]))
+            rows.append((*own, INTERCEPT, keyword_ids[team_name], clue_ids[opponent], padded(round_notes[opponent].attempted_interception),
+                         correct_codes[opponent], tuple(slot_counts[opponent]), *tokens, outcomes[team_name]))
+            rows.append((*own, DECIPHER, keyword_ids[team_name], clue_ids[team_name], padded(note.attempted_decipher), correct_codes[team_name],
+                         tuple(slot_counts[team_name]), *tokens, outcomes[team_name]))
+        for team_name, note in enumerate(round_notes):
+            for slot in note.correct_code:
+                if slot < MAX_KEYWORDS:
+                    slot_counts[team_name][slot] += 1
+        replay.process_round_notes(round_notes)
+    return rows
+
+@lru_cache(maxsize=None)
+def official_clue_table() -> ClueTable:
+    """Get a clue table holding only the official words, so their ids are their index in the official word list, and other clues are stored as strings.
+    The table is full, so it never changes and is shared by every game in the process.
+
+    Returns:
+        ClueTable: The clue table.
+    """
+    return ClueTable(english.words, max_size=len(english.words))
+
+def play_selfplay_chunk(team_factories: Sequence[Callable[[Keywords], Team]], seeds: Iterable[int], *,
+                        game_factory: Callable[[], Game] = Game, **game_options) -> "numpy.ndarray":
+    """Play a seeded game for each seed and turn their decisions into records.
+
+    Args:
+        team_factories (Sequence[Callable[[Keywords], Team]]): A factory for each team, which builds the team given its keyword card.
+        seeds (Iterable[int]): The seed of each game.
+        game_factory (Callable[[], Game], optional): Builds the game object. Defaults to Game.
+        **game_options: Options passed on to play_seeded_game.
+
+    Returns:
+        numpy.ndarray: The records of every game, in the same order as the seeds.
+    """
+    _require_numpy()
+    # clues are interned as they are played, so records need no lookups of their own
+    table = official_clue_table()
+
+    def interning_game_factory() -> Game:
+        game = game_factory()
+        game.clue_table = table
+        return game
+
+    # the rows of every game are converted at once, since each conversion has a fixed cost
+    rows = []
+    for seed in seeds:
+        keyword_cards = []
+        recording_factories = [_RecordingFactory(factory, keyword_cards) for factory in team_factories]
+        game = play_seeded_game(recording_factories, seed, game_factory=interning_game_factory, **game_options)
+        rows.extend(_game_rows(game, keyword_cards, seed, game_factory, table))
+    return numpy.array(rows, dtype=record_dtype())
+
+class _RecordingFactory:
+    # keeps the keyword card each team is built with, which play_seeded_game deals from its seed
+    def __init__(self, factory: Callable[[Keywords], Team], keyword_cards: list[Keywords]):
+        self.factory = factory
+        self.keyword_cards = keyword_cards
+
+    def __call__(self, keywords: Keywords) -> Team:
+        self.keyword_cards.append(keywords)
+        return self.factory(keywords)
+
+
+class ShardWriter:
+    """Writer which streams records through a shuffle buffer into numbered .npy shards of at most shard_bytes each.
+
+    Records are held in the buffer until it holds shuffle_records more than a shard, then the buffer is shuffled and a shard is written from it,
+    so records from different games and chunks are mixed across shards. Each shard is written to a temporary file which is then atomically renamed.
+
+    Args:
+        path (str | os.PathLike): The directory to write shards to.
+        shard_bytes (int, optional): The most bytes of records in each shard. Defaults to DEFAULT_SHARD_BYTES.
+        shuffle_records (int, optional): The number of records held back for shuffling, beyond those of the next shard. Defaults to DEFAULT_SHUFFLE_RECORDS.
+        seed (Optional[int], optional): The random seed for shuffling. Defaults to None.
+
+    Attributes:
+        shards (list[Path]): The shards written so far.
+        records (int): The number of records written so far.
+    """
+    def __init__(self, path: str | os.PathLike, shard_bytes: int = DEFAULT_SHARD_BYTES, shuffle_records: int = DEFAULT_SHUFFLE_RECORDS, seed: Optional[int] = None):
+        _require_numpy()
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dtype = record_dtype()
+        self.shard_records = max(shard_bytes // self.dtype.itemsize, 1)
+        self.shuffle_records = shuffle_records
+        self.random = numpy.random.default_rng(seed)
+        self.shards: list[Path] = []
+        self.records = 0
+        self._buffer: list["numpy.ndarray"] = []
+        self._buffered = 0
+
+    def write(self, records: "numpy.ndarray"):
+        """Add records to the shuffle buffer, writing shards once it is full.
+
+        Args:
+            records (numpy.ndarray): Records of the record_dtype schema.
+        """
+        self._buffer.append(records)
+        self._buffered += len(records)
+        if self._buffered >= self.shard_records + self.shuffle_records:
+            buffer = self._shuffled_buffer()
+            while len(buffer) >= self.shard_records + self.shuffle_records:
+                self._write_shard(buffer[:self.shard_records])
+                buffer = buffer[self.shard_records:]
+            self._buffer = [buffer]
+            self._buffered = len(buffer)
+
+    def _shuffled_buffer(self) -> "numpy.ndarray":
+        buffer = numpy.concatenate(self._buffer)
+        self.random.shuffle(buffer)
+        return buffer
+
+    def _write_shard(self, records: "numpy.ndarray"):
+        shard_path = self.path / f"shard-{len(self.shards):05d}.npy"
+        temporary_path = self.path / f"shard-{len(self.shards):05d}.npy.tmp"
+        with open(temporary_path, "wb") as file:
+            numpy.save(file, records)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, shard_path)
+        self.shards.append(shard_path)
+        self.records += len(records)
+
+    def close(self):
+        """Shuffle the remaining records and write them to the last shards."""
+        if self._buffered:
+            buffer = self._shuffled_buffer()
+            for start in range(0, len(buffer), self.shard_records):
+                self._write_shard(buffer[start:start + self.shard_records])
+        self._buffer = []
+        self._buffered = 0
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_shards(path: str | os.PathLike) -> Iterator["numpy.ndarray"]:
+    """Read the shards in a directory, in order, as memory-mapped record arrays.
+
+    Args:
+        path (str | os.PathLike): The directory the shards were written to.
+
+    Yields:
+        numpy.ndarray: The records of each shard.
+    """
+    _require_numpy()
+    for shard_path in sorted(Path(path).glob("shard-*.npy")):
+        yield numpy.load(shard_path, mmap_mode="r")
+
+
+@dataclasses.dataclass(kw_only=True)
+class SelfPlaySummary:
+    """Dataclass representing the output of a self-play run.
+
+    Attributes:
+        games (int): The number of games played.
+        records (int): The number of decision records written.
+        shards (list[Path]): The shards written.
+    """
+    games: int
+    records: int
+    shards: list[Path]
+
+def generate_selfplay(team_factories: Sequence[Callable[[Keywords], Team]], seeds: Iterable[int], path: str | os.PathLike, *,
+                      backend: str = "processes",
+                      max_workers: Optional[int] = None,
+                      executor: Optional[Executor] = None,
+                      chunk_games: int = DEFAULT_CHUNK_GAMES,
+                      shard_bytes: int = DEFAULT_SHARD_BYTES,
+                      shuffle_records: int = DEFAULT_SHUFFLE_RECORDS,
+                      shuffle_seed: Optional[int] = None,
+                      **game_options
+                      ) -> SelfPlaySummary:
+    """Play seeded self-play games in chunks across workers and stream their decision records into shuffled shards.
+    Chunks are written as they finish, and only a few chunks per worker are in flight, so memory use does not grow with the number of games.
+
+    Args:
+        team_factories (Sequence[Callable[[Keywords], Team]]): A factory for each team, which builds the team given its keyword card. They must be picklable for the processes backend.
+        seeds (Iterable[int]): The seed of each game.
+        path (str | os.PathLike): The directory to write shards to.
+        backend (str, optional): Either "processes", "threads" or "serial". Defaults to "processes".
+        max_workers (Optional[int], optional): The number of processes or threads. Defaults to None, using the executor's default.
+        executor (Optional[Executor], optional): The executor to play chunks with, in place of the backend. Defaults to None.
+        chunk_games (int, optional): The number of games in each chunk. Defaults to DEFAULT_CHUNK_GAMES.
+        shard_bytes (int, optional): The most bytes of records in each shard. Defaults to DEFAULT_SHARD_BYTES.
+        shuffle_records (int, optional): The number of records held back for shuffling. Defaults to DEFAULT_SHUFFLE_RECORDS.
+        shuffle_seed (Optional[int], optional): The random seed for shuffling. Defaults to None.
+        **game_options: Options passed on to play_selfplay_chunk.
+
+    Raises:
+        ValueError: If the backend is unknown.
+
+    Returns:
+        SelfPlaySummary: The number of games and records, and the shards written.
+    """
+    seeds = iter(seeds)
+    chunks = iter(lambda: list(islice(seeds, chunk_games)), [])
+    games = 0
+    with ShardWriter(path, shard_bytes, shuffle_records, shuffle_seed) as writer:
+        if executor is None and backend == "serial":
+            for chunk in chunks:
+                writer.write(play_selfplay_chunk(team_factories, chunk, **game_options))
+                games += len(chunk)
+        else:
+            if executor is not None:
+                owned_executor = None
+            elif backend == "processes":
+                owned_executor = executor = ProcessPoolExecutor(max_workers)
+            elif backend == "threads":
+                owned_executor = executor = ThreadPoolExecutor(max_workers)
+            else:
+                raise ValueError(f"unknown backend {backend!r}, expected 'processes', 'threads' or 'serial'")
+            max_in_flight = 2 * (max_workers or os.cpu_count() or 1)
+            try:
+                pending = {}
+                for chunk in chunks:
+                    pending[executor.submit(play_selfplay_chunk, team_factories, chunk, **game_options)] = len(chunk)
+                    while len(pending) >= max_in_flight:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            writer.write(future.result())
+                            games += pending.pop(future)
+                for future in list(pending):
+                    writer.write(future.result())
+                    games += pending.pop(future)
+            finally:
+                if owned_executor is not None:
+                    owned_executor.shutdown(cancel_futures=True)
+    return SelfPlaySummary(games=games, records=writer.records, shards=writer.shards)
@@ -0,0 +1,246 @@
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from decryptogame.components import GameData
+from decryptogame.game import Game
+from multiprocessing import shared_memory
+from typing import Optional
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# each record is a cache line of int64 fields: a sequence number, then the counters, then padding
+RECORD_FIELDS = 8
+FIELD_SIZE = 8
+SEQUENCE, ROUNDS_PLAYED, MISCOMMUNICATIONS, INTERCEPTIONS = 0, 1, 2, 4
+NUM_COUNTERS = 5
+
+
+class SharedGameTable:
+    """A table of game data stored in a shared memory block, one fixed-width record per game, so other processes can read live game data without pickling.
+
+    Each record is guarded by a seqlock. The writer makes the sequence number odd while it writes and even once it is done,
+    and readers retry until they read the same even sequence number before and after copying the record, so a read is never torn.
+    Only one process should write to each record.
+
+    Args:
+        num_games (int): The number of game records in the table.
+        name (Optional[str], optional): The name of the shared memory block. Defaults to None, in which case a unique name is generated.
+        create (bool, optional): Whether to create the block, or attach to an existing one. Defaults to True.
+
+    Raises:
+        ValueError: If num_games is less than 1.
+    """
+    def __init__(self, num_games: int, name: Optional[str] = None, create: bool = True):
+        if num_games < 1:
+            raise ValueError(f"a shared game table needs at least 1 game record, not {num_games}")
+        self.num_games = num_games
+        self.memory = shared_memory.SharedMemory(name=name, create=create, size=num_games * RECORD_FIELDS * FIELD_SIZE)
+        self.fields = self.memory.buf[:num_games * RECORD_FIELDS * FIELD_SIZE].cast("q")
+        self.owner = create
+
+    @classmethod
+    def attach(cls, name: str, num_games: int) -> "SharedGameTable":
+        """Attach to a table created by another process.
+
+        Args:
+            name (str): The name of the table's shared memory block.
+            num_games (int): The number of game records in the table.
+
+        Returns:
+            SharedGameTable: The attached table.
+        """
+        return cls(num_games, name=name, create=False)
+
+    @property
+    def name(self) -> str:
+        """Get the name of the table's shared memory block, which other processes need to attach to it.
+
+        Returns:
+            str: The name of the shared memory block.
+        """
+        return self.memory.name
+
+    def write(self, index: int, game_data: GameData):
+        """Write game data to a record.
+
+        Args:
+            index (int): The index of the game record.
+            game_data (GameData): The game data to write.
+        """
+        base = index * RECORD_FIELDS
+        fields = self.fields
+        fields[base + SEQUENCE] += 1
+        fields[base + ROUNDS_PLAYED] = game_data.rounds_played
+        fields[base + MISCOMMUNICATIONS], fields[base + MISCOMMUNICATIONS + 1] = game_data.miscommunications
+        fields[base + INTERCEPTIONS], fields[base + INTERCEPTIONS + 1] = game_data.interceptions
+        fields[base + SEQUENCE] += 1
+
+    def read(self, index: int) -> GameData:
+        """Read a consistent copy of the game data in a record.
+
+        Args:
+            index (int): The index of the game record.
+
+        Returns:
+            GameData: A copy of the game data.
+        """
+        base = index * RECORD_FIELDS
+        fields = self.fields
+        while True:
+            sequence = fields[base + SEQUENCE]
+            if sequence % 2:
+                continue
+            rounds_played, *miscommunications_and_interceptions = fields[base + ROUNDS_PLAYED:base + ROUNDS_PLAYED + NUM_COUNTERS]
+            if fields[base + SEQUENCE] == sequence:
+                break
+        return GameData(rounds_played=rounds_played,
+                        miscommunications=miscommunications_and_interceptions[:2],
+                        interceptions=miscommunications_and_interceptions[2:])
+
+    def array(self) -> "numpy.ndarray":
+        """Get a zero-copy NumPy view of the table, with a row per game and columns for the sequence number, rounds played, miscommunications and interceptions.
+        The view changes as games are played, so rows may be torn. Use snapshot for a consistent copy.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+
+        Returns:
+            numpy.ndarray: A (num_games, 6) int64 view of the table.
+        """
+        if numpy is None:
+            raise ImportError("numpy is required for array views. Install it with `pip install decryptogame[numpy]`.")
+        records = numpy.ndarray((self.num_games, RECORD_FIELDS), dtype=numpy.int64, buffer=self.memory.buf)
+        return records[:, :1 + NUM_COUNTERS]
+
+    def snapshot(self) -> "numpy.ndarray":
+        """Copy every record of the table at once, retrying only the records which were being written during the copy.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+
+        Returns:
+            numpy.ndarray: A consistent (num_games, 6) int64 copy of the table.
+        """
+        view = self.array()
+        snapshot = view.copy()
+        while True:
+            torn = (snapshot[:, SEQUENCE] % 2 == 1) | (view[:, SEQUENCE] != snapshot[:, SEQUENCE])
+            if not torn.any():
+                return snapshot
+            snapshot[torn] = view[torn]
+
+    def bind(self, game: Game, index: int):
+        """Store a game's data in a record of the table. The game keeps its current data and keeps working as before, with every update published to the record.
+
+        Args:
+            game (Game): The game to bind.
+            index (int): The index of the game record.
+        """
+        game._data = SharedGameData(self, index, game._data)
+
+    def close(self):
+        """Release this process's view of the table, and free the shared memory block if this process created it."""
+        self.fields.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SharedCounters(list):
+    """A list of counters which calls a function whenever a counter is set. Copies, such as those made by dataclasses.asdict, copy.deepcopy and pickle,
+    are detached and call nothing.
+
+    Args:
+        counters (Iterable[int]): The initial counters.
+        on_set (Optional[Callable[[], None]], optional): The function called whenever a counter is set. Defaults to None.
+    """
+    def __init__(self, counters: Iterable[int], on_set: Optional[Callable[[], None]] = None):
+        super().__init__(counters)
+        self.on_set = on_set
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        if self.on_set is not None:
+            self.on_set()
+
+    def __reduce__(self):
+        # copies and pickles are plain lists, so they do not hold the table
+        return list, (list(self),)
+
+
+class SharedGameData(GameData):
+    """Game data which publishes every update to a record of a SharedGameTable. Values are read locally, so reading is as fast as with GameData.
+    Updates made in a batch, such as each round scored by Game.process_round_notes, are published at once when the batch ends, so readers never see a round partly counted.
+
+    Args:
+        table (SharedGameTable): The table to publish to.
+        index (int): The index of the game record.
+        game_data (GameData, optional): The initial game data. Defaults to None, starting from a new game.
+    """
+    def __init__(self, table: SharedGameTable, index: int, game_data: GameData = None):
+        game_data = game_data if game_data is not None else GameData()
+        self.table = table
+        self.index = index
+        # the depth of nested batches, whose updates are published when the outermost one ends
+        self._batches = 0
+        self._rounds_played = game_data.rounds_played
+        self.miscommunications = SharedCounters(game_data.miscommunications, self._updated)
+        self.interceptions = SharedCounters(game_data.interceptions, self._updated)
+        self.publish()
+
+    @property
+    def rounds_played(self) -> int:
+        return self._rounds_played
+
+    @rounds_played.setter
+    def rounds_played(self, rounds_played: int):
+        self._rounds_played = rounds_played
+        self._updated()
+
+    def __eq__(self, other) -> bool:
+        # game data compares equal to a detached copy of it, as the generated dataclass equality requires the same class
+        if not isinstance(other, GameData):
+            return NotImplemented
+        return ((self.rounds_played, list(self.miscommunications), list(self.interceptions))
+                == (other.rounds_played, list(other.miscommunications), list(other.interceptions)))
+
+    def publish(self):
+        """Write the game data to its record."""
+        self.table.write(self.index, self)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group updates, so they are published to the record in a single write when the batch ends.
+
+        Yields:
+            None: The updates are made in the batch's body.
+        """
+        self._batches += 1
+        try:
+            yield
+        finally:
+            self._batches -= 1
+            if not self._batches:
+                self.publish()
+
+    def _updated(self):
+        if not self._batches:
+            self.publish()
+
+    def copy(self) -> GameData:
+        """Create a detached copy of the game data.
+
+        Returns:
+            GameData: A copy of the game data, which is not published.
+        """
+        return GameData(rounds_played=self.rounds_played,
+                        miscommunications=list(self.miscommunications),
+                        interceptions=list(self.interceptions))
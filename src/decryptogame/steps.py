@@ -0,0 +1,203 @@
+from collections.abc import Iterable, Sequence
+import dataclasses
+from decryptogame.components import Code, Keywords, Note
+from decryptogame.game import Game
+from decryptogame.generators import RandomCodes
+from decryptogame.teams import Team, TeamContext
+from enum import IntEnum
+from typing import Any, Optional
+
+
+class Phase(IntEnum):
+    """Enumeration representing the phases of a round at which a game waits for decisions.
+
+    Attributes:
+        CLUES (int): Each team's encryptor must decide clues for their code.
+        INTERCEPTION (int): Each team's intercepter must attempt to intercept the opposing team's clues.
+        DECIPHER (int): Each team's guesser must attempt to decipher their team's clues.
+        ROUND_SCORED (int): The round notes have been processed. No decisions are needed.
+    """
+    CLUES = 0
+    INTERCEPTION = 1
+    DECIPHER = 2
+    ROUND_SCORED = 3
+
+
+@dataclasses.dataclass(kw_only=True)
+class Step:
+    """Dataclass representing a point at which a stepped game is paused.
+
+    Attributes:
+        phase (Phase): The phase the game is paused at.
+        round_number (int): The index of the round being played, counted from the start of the game.
+        inputs (Sequence[Any]): What each team's teammate receives in this phase, indexed by team name.
+            The codes for CLUES, the opposing team's clues for INTERCEPTION, the team's own clues for DECIPHER, and the notes for ROUND_SCORED.
+        contexts (Sequence[TeamContext]): The context of each team, indexed by team name.
+    """
+    phase: Phase
+    round_number: int
+    inputs: Sequence[Any]
+    contexts: Sequence[TeamContext]
+
+
+class GameSteps:
+    """A game of Decrypto which is played one phase at a time, following the generator protocol.
+
+    Each call to `send` takes the decisions of both teams for the current phase and returns the next Step.
+    The first step is retrieved with `next`, and StopIteration is raised with the game as its value once play is over.
+    Unlike a generator, a GameSteps object holds only plain data, so it can be pickled at any step and resumed later,
+    given its game's rule functions and round codes are picklable too.
+
+    Args:
+        keyword_cards (Sequence[Keywords]): The keyword cards for each team.
+        game (Game, optional): The Decrypto game object. If None, a standard game will be generated.
+        round_codes (Iterable[Sequence[Code]], optional): Iterable of codes for each round. If None, random codes will be generated.
+        round_limit (Optional[int], optional): The maximum number of rounds to play. If None, the game continues until completion.
+    """
+    def __init__(self, keyword_cards: Sequence[Keywords], *,
+                 game: Game = None,
+                 round_codes: Iterable[Sequence[Code]] = None,
+                 round_limit: Optional[int] = None
+                 ):
+        self.keyword_cards = keyword_cards
+        self.game = game if game is not None else Game()
+        self.round_codes = iter(round_codes) if round_codes is not None else RandomCodes(keyword_cards)
+        self.round_limit = round_limit
+        self.rounds_played = 0
+        self.finished = False
+        self.round_number = None
+        self.step = None
+        self._codes = None
+        self._clues = None
+        self._attempted_interception = None
+
+    def contexts(self) -> list[TeamContext]:
+        """Build the context of each team for the current game state.
+
+        Returns:
+            list[TeamContext]: The context of each team, indexed by team name.
+        """
+        return [TeamContext(
+                team_name=team_name,
+                keywords=keywords,
+                num_opponent_keywords=len(self.keyword_cards[not team_name]),
+                game=self.game
+                )
+                for team_name, keywords in enumerate(self.keyword_cards)]
+
+    def send(self, decisions: Optional[Sequence[Any]]) -> Step:
+        """Provide the decisions of each team for the current phase and advance to the next step.
+
+        Args:
+            decisions (Optional[Sequence[Any]]): The clues, attempted interceptions or attempted deciphers of each team, indexed by team name.
+                Must be None before the first step and after a ROUND_SCORED step.
+
+        Raises:
+            StopIteration: If the game is over, with the game as its value.
+            TypeError: If decisions are sent when none are needed.
+
+        Returns:
+            Step: The step the game is paused at.
+        """
+        if self.finished:
+            raise StopIteration(self.game)
+        phase = self.step.phase if self.step is not None else Phase.ROUND_SCORED
+        if phase == Phase.ROUND_SCORED:
+            if decisions is not None:
+                raise TypeError("no decisions are needed before a round starts")
+            return self._start_round()
+        if decisions is None:
+            raise TypeError(f"decisions are needed for the {self.step.phase.name} phase")
+        decisions = tuple(decisions)
+        if phase == Phase.CLUES:
+            self._clues = decisions
+            # each intercepter receives the opposing team's clues
+            return self._pause(Phase.INTERCEPTION, [self._clues[not team_name] for team_name in range(len(self._clues))])
+        if phase == Phase.INTERCEPTION:
+            self._attempted_interception = decisions
+            return self._pause(Phase.DECIPHER, self._clues)
+        # each team reveals their codes and the notes are processed and added to the notesheet
+        # each note holds the opposing team's attempt to intercept it
+        notes = [Note(clues=self._clues[team_name],
+                      attempted_interception=self._attempted_interception[not team_name],
+                      attempted_decipher=decisions[team_name],
+                      correct_code=code
+                      )
+                      for team_name, code in enumerate(self._codes)]
+        self.game.process_round_notes(notes)
+        self.rounds_played += 1
+        self._codes = self._clues = self._attempted_interception = None
+        return self._pause(Phase.ROUND_SCORED, notes)
+
+    def __next__(self) -> Step:
+        """Advance to the next step without providing decisions.
+
+        Returns:
+            Step: The step the game is paused at.
+        """
+        return self.send(None)
+
+    def __iter__(self):
+        """Return the stepped game as an iterable object.
+
+        Returns:
+            GameSteps: The stepped game itself.
+        """
+        return self
+
+    def _start_round(self) -> Step:
+        if self.game.game_over() or self.rounds_played == self.round_limit:
+            return self._finish()
+        codes = next(self.round_codes, None)
+        if codes is None:
+            return self._finish()
+        self._codes = tuple(codes)
+        self.round_number = len(self.game.notesheet)
+        return self._pause(Phase.CLUES, self._codes)
+
+    def _pause(self, phase: Phase, inputs: Sequence[Any]) -> Step:
+        self.step = Step(phase=phase, round_number=self.round_number, inputs=inputs, contexts=self.contexts())
+        return self.step
+
+    def _finish(self):
+        self.finished = True
+        self.step = None
+        raise StopIteration(self.game)
+
+
+def team_decisions(teams: Sequence[Team], step: Step) -> Optional[list[Any]]:
+    """Decide each team's response to a step using the teammate responsible for its phase.
+
+    Args:
+        teams (Sequence[Team]): The pair of teams participating in the game.
+        step (Step): The step the game is paused at.
+
+    Returns:
+        Optional[list[Any]]: The decisions of each team, indexed by team name, or None if the step needs no decisions.
+    """
+    if step.phase == Phase.CLUES:
+        return [team.encryptor.decide_clues(code, context) for team, code, context in zip(teams, step.inputs, step.contexts)]
+    if step.phase == Phase.INTERCEPTION:
+        return [team.intercepter.intercept_clues(clues, context) for team, clues, context in zip(teams, step.inputs, step.contexts)]
+    if step.phase == Phase.DECIPHER:
+        return [team.guesser.decipher_clues(clues, context) for team, clues, context in zip(teams, step.inputs, step.contexts)]
+    return None
+
+
+def play_steps(teams: Sequence[Team], steps: GameSteps) -> Game:
+    """Play a stepped game to completion, answering each step with the teams' decisions. A stepped game restored part-way through resumes where it was paused.
+
+    Args:
+        teams (Sequence[Team]): The pair of teams participating in the game.
+        steps (GameSteps): The stepped game to play.
+
+    Returns:
+        Game: The game state after play.
+    """
+    step = steps.step
+    try:
+        step = steps.send(team_decisions(teams, step)) if step is not None else next(steps)
+        while True:
+            step = steps.send(team_decisions(teams, step))
+    except StopIteration as stop:
+        return stop.value
@@ -0,0 +1,267 @@
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+import csv
+import dataclasses
+from decryptogame.batch import play_seeded_game
+from decryptogame.components import Keywords, TeamName
+from decryptogame.end_criteria import (MAX_OFFICIAL_INTERCEPTIONS, MAX_OFFICIAL_MISCOMMUNICATIONS, MAX_OFFICIAL_ROUNDS,
+                                       InterceptionEndCondition, MiscommunicationEndCondition, RoundEndCondition)
+from decryptogame.game import Game, interception_rule
+from decryptogame.generators import DEFAULT_CARD_LENGTH, DEFAULT_CODE_LENGTH
+from decryptogame.teams import Team
+from functools import partial
+from itertools import product
+import math
+import os
+from statistics import NormalDist
+from typing import Optional
+
+DEFAULT_BATCH_GAMES = 200
+DEFAULT_MAX_GAMES = 10000
+DEFAULT_PRECISION = 0.02
+DEFAULT_CONFIDENCE = 0.95
+
+@dataclasses.dataclass(kw_only=True, frozen=True)
+class RulesVariant:
+    """Dataclass representing a house rules variant, one point of a parameter sweep.
+
+    Attributes:
+        miscommunications (int, optional): The number of miscommunication tokens which lose the game. Defaults to MAX_OFFICIAL_MISCOMMUNICATIONS.
+        interceptions (int, optional): The number of interception tokens which win the game. Defaults to MAX_OFFICIAL_INTERCEPTIONS.
+        rounds (int, optional): The number of rounds after which the game ends. Defaults to MAX_OFFICIAL_ROUNDS.
+        code_length (int, optional): The length of each team's codes. Defaults to DEFAULT_CODE_LENGTH.
+        card_length (int, optional): The number of keywords on each team's keyword card. Defaults to DEFAULT_CARD_LENGTH.
+        count_first_round (bool, optional): Whether interceptions count in the first round. Defaults to False.
+    """
+    miscommunications: int = MAX_OFFICIAL_MISCOMMUNICATIONS
+    interceptions: int = MAX_OFFICIAL_INTERCEPTIONS
+    rounds: int = MAX_OFFICIAL_ROUNDS
+    code_length: int = DEFAULT_CODE_LENGTH
+    card_length: int = DEFAULT_CARD_LENGTH
+    count_first_round: bool = False
+
+    def game(self) -> Game:
+        """Build a new game played by this variant's rules.
+
+        Returns:
+            Game: The new game.
+        """
+        return Game(end_conditions=[RoundEndCondition(self.rounds),
+                                    MiscommunicationEndCondition(self.miscommunications),
+                                    InterceptionEndCondition(self.interceptions)],
+                    # the plain rule keeps the game's fast path for the official rules
+                    interception_func=partial(interception_rule, count_first_round=True) if self.count_first_round else interception_rule)
+
+def parameter_grid(**values: Sequence) -> list[RulesVariant]:
+    """Build every combination of the given rules parameters. Parameters which are not given keep their default value.
+
+    Args:
+        **values (Sequence): The values to sweep for each RulesVariant attribute, such as miscommunications=[1, 2, 3].
+
+    Returns:
+        list[RulesVariant]: A variant for each combination of values.
+    """
+    names = list(values)
+    return [RulesVariant(**dict(zip(names, combination))) for combination in product(*values.values())]
+
+
+def play_variant_games(variant: RulesVariant, team_factories: Sequence[Callable[[Keywords], Team]], seeds: Iterable[int]) -> list[tuple[int, int]]:
+    """Play a game of a rules variant for each seed. The seed decides the keyword cards and codes, so each variant is played on the same deals.
+
+    Args:
+        variant (RulesVariant): The rules variant to play.
+        team_factories (Sequence[Callable[[Keywords], Team]]): A factory for each team, which builds the team given its keyword card.
+        seeds (Iterable[int]): The seed of each game.
+
+    Returns:
+        list[tuple[int, int]]: The winner of each game, or -1 for a tie, and its number of rounds played.
+    """
+    outcomes = []
+    for seed in seeds:
+        game = play_seeded_game(team_factories, seed, game_factory=variant.game,
+                                card_lengths=[variant.card_length] * 2, code_lengths=[variant.code_length] * 2)
+        winner = game.winner()
+        outcomes.append((winner if winner is not None else -1, game.data.rounds_played))
+    return outcomes
+
+
+@dataclasses.dataclass(kw_only=True)
+class SweepResult:
+    """Dataclass representing the outcomes of the games played for one rules variant.
+
+    Attributes:
+        variant (RulesVariant): The rules variant played.
+        games (int): The number of games played.
+        wins (list[int]): The number of wins of each team.
+        ties (int): The number of tied games.
+        rounds (int): The total number of rounds played.
+        squared_rounds (int): The sum of the squared number of rounds of each game.
+    """
+    variant: RulesVariant
+    games: int = 0
+    wins: list[int] = dataclasses.field(default_factory=lambda: [0, 0])
+    ties: int = 0
+    rounds: int = 0
+    squared_rounds: int = 0
+
+    def add(self, outcomes: Iterable[tuple[int, int]]):
+        """Add game outcomes to the result.
+
+        Args:
+            outcomes (Iterable[tuple[int, int]]): The winner of each game, or -1 for a tie, and its number of rounds played.
+        """
+        for winner, rounds_played in outcomes:
+            self.games += 1
+            if winner == -1:
+                self.ties += 1
+            else:
+                self.wins[winner] += 1
+            self.rounds += rounds_played
+            self.squared_rounds += rounds_played ** 2
+
+    def win_rate(self, team_name: TeamName = TeamName.WHITE, confidence: float = DEFAULT_CONFIDENCE) -> tuple[float, float, float]:
+        """Estimate the rate at which a team wins.
+
+        Args:
+            team_name (TeamName, optional): The team. Defaults to TeamName.WHITE.
+            confidence (float, optional): The confidence level of the interval. Defaults to DEFAULT_CONFIDENCE.
+
+        Returns:
+            tuple[float, float, float]: The win rate and the bounds of its Wilson score interval.
+        """
+        return wilson_interval(self.wins[team_name], self.games, confidence)
+
+    def tie_rate(self, confidence: float = DEFAULT_CONFIDENCE) -> tuple[float, float, float]:
+        """Estimate the rate at which games are tied.
+
+        Args:
+            confidence (float, optional): The confidence level of the interval. Defaults to DEFAULT_CONFIDENCE.
+
+        Returns:
+            tuple[float, float, float]: The tie rate and the bounds of its Wilson score interval.
+        """
+        return wilson_interval(self.ties, self.games, confidence)
+
+    def game_length(self, confidence: float = DEFAULT_CONFIDENCE) -> tuple[float, float, float]:
+        """Estimate the mean number of rounds played per game.
+
+        Args:
+            confidence (float, optional): The confidence level of the interval. Defaults to DEFAULT_CONFIDENCE.
+
+        Returns:
+            tuple[float, float, float]: The mean game length and the bounds of its normal confidence interval.
+        """
+        if not self.games:
+            return 0.0, 0.0, 0.0
+        mean = self.rounds / self.games
+        variance = (self.squared_rounds - self.games * mean ** 2) / (self.games - 1) if self.games > 1 else 0.0
+        half_width = _z_score(confidence) * math.sqrt(max(variance, 0.0) / self.games)
+        return mean, mean - half_width, mean + half_width
+
+    def decided(self, precision: float, confidence: float = DEFAULT_CONFIDENCE) -> bool:
+        """Check if the win rate of each team and the tie rate are known to within a precision.
+
+        Args:
+            precision (float): The largest allowed half-width of each interval.
+            confidence (float, optional): The confidence level of the intervals. Defaults to DEFAULT_CONFIDENCE.
+
+        Returns:
+            bool: True if every interval is narrow enough, False otherwise.
+        """
+        intervals = [self.win_rate(TeamName.WHITE, confidence), self.win_rate(TeamName.BLACK, confidence), self.tie_rate(confidence)]
+        return self.games > 0 and all((upper - lower) / 2 <= precision for _, lower, upper in intervals)
+
+def _z_score(confidence: float) -> float:
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+def wilson_interval(successes: int, trials: int, confidence: float = DEFAULT_CONFIDENCE) -> tuple[float, float, float]:
+    """Estimate a rate with its Wilson score interval, which stays within [0, 1] and behaves well for rates near 0 or 1.
+
+    Args:
+        successes (int): The number of successes.
+        trials (int): The number of trials.
+        confidence (float, optional): The confidence level of the interval. Defaults to DEFAULT_CONFIDENCE.
+
+    Returns:
+        tuple[float, float, float]: The observed rate and the bounds of its interval.
+    """
+    if not trials:
+        return 0.0, 0.0, 1.0
+    z = _z_score(confidence)
+    rate = successes / trials
+    denominator = 1 + z ** 2 / trials
+    center = (rate + z ** 2 / (2 * trials)) / denominator
+    half_width = z * math.sqrt(rate * (1 - rate) / trials + z ** 2 / (4 * trials ** 2)) / denominator
+    return rate, max(center - half_width, 0.0), min(center + half_width, 1.0)
+
+
+def sweep(variants: Sequence[RulesVariant], team_factories: Sequence[Callable[[Keywords], Team]], *,
+          batch_games: int = DEFAULT_BATCH_GAMES,
+          max_games: int = DEFAULT_MAX_GAMES,
+          precision: float = DEFAULT_PRECISION,
+          confidence: float = DEFAULT_CONFIDENCE,
+          seed: int = 0,
+          executor: Optional[Executor] = None
+          ) -> list[SweepResult]:
+    """Play games of each rules variant across worker processes. Each variant is played in batches, and stops early once its rates are known to within the precision.
+
+    Args:
+        variants (Sequence[RulesVariant]): The rules variants to play, for example from parameter_grid.
+        team_factories (Sequence[Callable[[Keywords], Team]]): A factory for each team, which builds the team given its keyword card. They must be picklable, so lambdas can not be used.
+        batch_games (int, optional): The number of games in each batch sent to a worker. Defaults to DEFAULT_BATCH_GAMES.
+        max_games (int, optional): The most games to play for a variant. Defaults to DEFAULT_MAX_GAMES.
+        precision (float, optional): The half-width of the win and tie rate intervals at which a variant stops. Defaults to DEFAULT_PRECISION.
+        confidence (float, optional): The confidence level of the intervals. Defaults to DEFAULT_CONFIDENCE.
+        seed (int, optional): The seed of the first game of each variant. Later games use the following seeds. Defaults to 0.
+        executor (Optional[Executor], optional): The executor to play batches with. Defaults to None, in which case a process pool with a worker per core is used.
+
+    Returns:
+        list[SweepResult]: The result of each variant, in the same order as the variants.
+    """
+    results = [SweepResult(variant=variant) for variant in variants]
+    submitted_games = [0] * len(variants)
+    owns_executor = executor is None
+    executor = executor if executor is not None else ProcessPoolExecutor(max_workers=os.cpu_count())
+
+    def submit(index: int):
+        start = seed + submitted_games[index]
+        stop = seed + min(submitted_games[index] + batch_games, max_games)
+        submitted_games[index] = stop - seed
+        future = executor.submit(play_variant_games, variants[index], team_factories, range(start, stop))
+        pending[future] = index
+
+    try:
+        pending = {}
+        for index in range(len(variants)):
+            submit(index)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                results[index].add(future.result())
+                # keep one batch in flight per variant until it is decided or out of games
+                if submitted_games[index] < max_games and not results[index].decided(precision, confidence):
+                    submit(index)
+    finally:
+        if owns_executor:
+            executor.shutdown(cancel_futures=True)
+    return results
+
+
+def write_results(results: Iterable[SweepResult], path: str | os.PathLike, confidence: float = DEFAULT_CONFIDENCE):
+    """Write sweep results to a CSV table, with a row per variant holding its parameters, the number of games played, and each estimate with its interval.
+
+    Args:
+        results (Iterable[SweepResult]): The sweep results.
+        path (str | os.PathLike): The CSV file to write.
+        confidence (float, optional): The confidence level of the intervals. Defaults to DEFAULT_CONFIDENCE.
+    """
+    parameters = [field.name for field in dataclasses.fields(RulesVariant)]
+    estimates = ["white_win_rate", "black_win_rate", "tie_rate", "game_length"]
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(parameters + ["games"] + [f"{estimate}{suffix}" for estimate in estimates for suffix in ("", "_lower", "_upper")])
+        for result in results:
+            intervals = [result.win_rate(TeamName.WHITE, confidence), result.win_rate(TeamName.BLACK, confidence),
+                         result.tie_rate(confidence), result.game_length(confidence)]
+            writer.writerow([getattr(result.variant, name) for name in parameters] + [result.games] + [value for interval in intervals for value in interval])
@@ -1,7 +1,13 @@
-from typing import Protocol
+from collections.abc import Iterable, Sequence
+from typing import Optional, Protocol, TextIO
 import dataclasses
+import random
+import sys
 from decryptogame.components import Keywords, Code, Clue, TeamName
+import decryptogame.official_words.english as english
+from decryptogame.features import NotesheetFeatures
 from decryptogame.game import Game
+from decryptogame.interning import ClueId
 
 @dataclasses.dataclass(kw_only=True)
 class TeamContext:
@@ -11,6 +17,26 @@ class TeamContext:
     num_opponent_keywords: int
     game: Game
 
+    @property
+    def features(self) -> NotesheetFeatures:
+        """Get the features of each team's revealed notes, which are kept up to date by the game.
+
+        Returns:
+            NotesheetFeatures: The game's notesheet features.
+        """
+        return self.game.features
+
+    def decode_clues(self, clues: Sequence[ClueId]) -> Clue:
+        """Get clues from the notesheet or features as strings. Games with a clue table store clue ids in their notes.
+
+        Args:
+            clues (Sequence[ClueId]): The clues of a note, or given for a keyword slot.
+
+        Returns:
+            Clue: The clues.
+        """
+        return self.game.decode_clues(clues)
+
 
 class Encryptor(Protocol):
     """Interface representing an Encryptor, a teammate who decides clues"""
@@ -72,21 +98,162 @@ class Team:
 
 # command line players allow a developer to enter clues or code through the command line
 
+class TerminalView:
+    """Incremental terminal view of a game, shared by a team's command line players. Only the rounds revealed since the last prompt are printed,
+    the clue table for each keyword slot is kept formatted between prompts and printed on request, and output is buffered until input is needed.
+
+    Args:
+        output (Optional[TextIO], optional): The stream to write to. Defaults to None, using sys.stdout.
+        input_lines (Optional[Iterable[str]], optional): Scripted answers to read in place of the command line, for testing or load testing.
+            EOFError is raised once they run out, as by input. Defaults to None, reading from the command line.
+    """
+    # entered at any prompt to print the clue table
+    TABLE_REQUEST = "?"
+
+    def __init__(self, output: Optional[TextIO] = None, input_lines: Optional[Iterable[str]] = None):
+        self.output = output if output is not None else sys.stdout
+        self.input_lines = iter(input_lines) if input_lines is not None else None
+        self._pending: list[str] = []
+        self._game = None
+        self._rounds_shown = 0
+        # the formatted clues of each team's keyword slots, and how many clues each holds
+        self._slot_lines: list[list[str]] = []
+        self._slot_counts: list[list[int]] = []
+
+    def write(self, text: str):
+        """Buffer text to be written before the next input.
+
+        Args:
+            text (str): The text.
+        """
+        self._pending.append(text)
+
+    def flush(self):
+        """Write the buffered text to the output in a single write."""
+        if self._pending:
+            self.output.write("".join(self._pending))
+            self.output.flush()
+            self._pending.clear()
+
+    def show_context(self, role: str, context: TeamContext):
+        """Show the rounds revealed since the last prompt. The team's keywords are shown once, when a new game starts.
+
+        Args:
+            role (str): The role of the player about to decide.
+            context (TeamContext): The player's context.
+        """
+        game = context.game
+        if game is not self._game or len(game.notesheet) < self._rounds_shown:
+            self._game = game
+            self._rounds_shown = 0
+            self._slot_lines = []
+            self._slot_counts = []
+            self.write(f"{'=' * 12}\nTeam {TeamName(context.team_name)}\nKeywords: {context.keywords}\n"
+                       f"Number of Opponent Keywords: {context.num_opponent_keywords}\n")
+        notesheet = game.notesheet
+        if len(notesheet) > self._rounds_shown:
+            for round_number in range(self._rounds_shown, len(notesheet)):
+                for team_name, note in enumerate(notesheet[round_number]):
+                    clues = game.decode_clues(note.clues) if note.clues is not None else None
+                    self.write(f"Round {round_number} {TeamName(team_name)}: clues {clues}, code {note.correct_code}, "
+                               f"interception {note.attempted_interception}, decipher {note.attempted_decipher}\n")
+            self._rounds_shown = len(notesheet)
+            data = game._data
+            self.write(f"Miscommunications: {data.miscommunications}, Interceptions: {data.interceptions}\n")
+        self.write(f"-- {role} for team {TeamName(context.team_name)}, round {len(notesheet)}. Enter {self.TABLE_REQUEST} at a prompt for the clue table.\n")
+
+    def clue_table(self, context: TeamContext) -> str:
+        """Format the clues given for each team's keyword slots. Only the clues given since the table was last formatted are added.
+
+        Args:
+            context (TeamContext): The player's context.
+
+        Returns:
+            str: The clue table.
+        """
+        slot_clues = context.features.slot_clues
+        for team_name, team_slot_clues in enumerate(slot_clues):
+            if team_name == len(self._slot_lines):
+                self._slot_lines.append([])
+                self._slot_counts.append([])
+            lines, counts = self._slot_lines[team_name], self._slot_counts[team_name]
+            for slot, clues in enumerate(team_slot_clues):
+                if slot == len(lines):
+                    label = f"{slot} {context.keywords[slot]}" if team_name == context.team_name and slot < len(context.keywords) else f"{slot}"
+                    lines.append(f"  {label}:")
+                    counts.append(0)
+                if len(clues) > counts[slot]:
+                    lines[slot] += "".join(f" {clue}," for clue in context.decode_clues(clues[counts[slot]:]))
+                    counts[slot] = len(clues)
+        return "".join(f"{TeamName(team_name)} clues\n" + "".join(f"{line}\n" for line in lines) for team_name, lines in enumerate(self._slot_lines))
+
+    def read(self, prompt: str, context: TeamContext) -> str:
+        """Read an answer, printing the clue table whenever it is requested instead.
+
+        Args:
+            prompt (str): The prompt.
+            context (TeamContext): The player's context.
+
+        Raises:
+            EOFError: If the scripted answers or the command line input run out.
+
+        Returns:
+            str: The answer.
+        """
+        while True:
+            self.write(prompt)
+            self.flush()
+            if self.input_lines is not None:
+                line = next(self.input_lines, None)
+                if line is None:
+                    raise EOFError("the scripted answers ran out")
+                line = line.rstrip("\n")
+                self.write(f"{line}\n")
+            else:
+                line = input()
+            if line.strip() != self.TABLE_REQUEST:
+                return line
+            self.write(self.clue_table(context))
+
+    def read_code_num(self, prompt: str, num_keywords: int, context: TeamContext) -> int:
+        """Read a code number, asking again until it is a valid slot.
+
+        Args:
+            prompt (str): The prompt.
+            num_keywords (int): The number of keyword slots.
+            context (TeamContext): The player's context.
+
+        Returns:
+            int: The code number.
+        """
+        code_num = None
+        while code_num is None:
+            try:
+                code_num = int(self.read(prompt, context))
+            except ValueError:
+                pass
+            if code_num is None or code_num not in range(num_keywords):
+                self.write(f"Code num must lie in range [0 - {num_keywords}).\n")
+                code_num = None
+        return code_num
+
+
 class CommandLineEncryptor(Encryptor):
-    """A teammate who decides clues using the command line. """
+    """A teammate who decides clues using the command line.
+
+    Args:
+        view (Optional[TerminalView], optional): The view shared with the rest of the team. Defaults to None, using a view of its own.
+    """
+    def __init__(self, view: Optional[TerminalView] = None):
+        self.view = view if view is not None else TerminalView()
 
     def print_context(self, context: TeamContext):
-        """Print information for the developer to know how to interact through the command line.
+        """Print information for the developer to know how to interact through the command line. Only the rounds revealed since the last prompt are printed.
 
         Args:
             context (TeamContext): Relevant information to the developer. 
         """
-        print("=" * 12)
-        print(f"You are Encryptor on team {TeamName(context.team_name)}")
-        print(f"Keywords: {context.keywords}")
-        print(f"Notesheet: {context.game.notesheet}")
-        print(f"Scoresheet: {context.game.data}")
-        print(f"Number of Opponent Keywords: {context.num_opponent_keywords}")
+        self.view.show_context("Encryptor", context)
 
     def decide_clues(self, code: Code, context: TeamContext) -> Clue:
         """Decide clues for the given code using the command line.
@@ -99,25 +266,26 @@ class CommandLineEncryptor(Encryptor):
             Clue: The clues decided by the Encryptor for each code number in the provided code.
         """
         self.print_context(context)
-        print(f"Code : {code}")
-        clues = tuple(input(f"Clue for number {code_num}: ") for code_num in code)
+        self.view.write(f"Code : {code}\n")
+        clues = tuple(self.view.read(f"Clue for number {code_num}: ", context) for code_num in code)
         return clues
 
 class CommandLineIntercepter(Intercepter):
-    """A teammate who attempts to decipher the opposing team's clues using the command line. """
+    """A teammate who attempts to decipher the opposing team's clues using the command line.
+
+    Args:
+        view (Optional[TerminalView], optional): The view shared with the rest of the team. Defaults to None, using a view of its own.
+    """
+    def __init__(self, view: Optional[TerminalView] = None):
+        self.view = view if view is not None else TerminalView()
 
     def print_context(self, context: TeamContext):
-        """Print information for the developer to know how to interact through the command line.
+        """Print information for the developer to know how to interact through the command line. Only the rounds revealed since the last prompt are printed.
 
         Args:
             context (TeamContext): Relevant information to the developer. 
         """
-        print("=" * 12)
-        print(f"You are Intercepter on team {TeamName(context.team_name)}")
-        print(f"Keywords: {context.keywords}")
-        print(f"Notesheet: {context.game.notesheet}")
-        print(f"Scoresheet: {context.game.data}")
-        print(f"Number of Opponent Keywords: {context.num_opponent_keywords}")
+        self.view.show_context("Intercepter", context)
 
 
     def get_code_num(self, clue: str, context: TeamContext) -> int:
@@ -130,16 +298,7 @@ class CommandLineIntercepter(Intercepter):
         Returns:
             int: The guessed code number based on the opposing team's clue.
         """
-        code_num = None
-        while code_num is None:
-            try:
-                code_num = int(input(f"Code number for clue {clue}: "))
-            except ValueError:
-                pass
-            if code_num is None or code_num not in range(len(context.keywords)):
-                print(f"Code num must lie in range [0 - {len(context.keywords)}).")
-                code_num = None
-        return code_num
+        return self.view.read_code_num(f"Code number for clue {clue}: ", context.num_opponent_keywords, context)
 
     def intercept_clues(self, opponent_clues: Clue, context: TeamContext) -> Code:
         """Attempt to intercept the opposing team's clues using the command line.
@@ -152,24 +311,26 @@ class CommandLineIntercepter(Intercepter):
             Code: The intercepted code numbers based on the opposing team's clues.
         """
         self.print_context(context)
-        print(f"Opponent Clues : {opponent_clues}")
+        self.view.write(f"Opponent Clues : {opponent_clues}\n")
         code = tuple(self.get_code_num(clue, context) for clue in opponent_clues)
         return code
 
 class CommandLineGuesser(Guesser):
-    """A teammate who attempts to decipher their team's clues using the command line. """
+    """A teammate who attempts to decipher their team's clues using the command line.
+
+    Args:
+        view (Optional[TerminalView], optional): The view shared with the rest of the team. Defaults to None, using a view of its own.
+    """
+    def __init__(self, view: Optional[TerminalView] = None):
+        self.view = view if view is not None else TerminalView()
 
     def print_context(self, context: TeamContext):
-        """Print information for the developer to know how to interact through the command line.
+        """Print information for the developer to know how to interact through the command line. Only the rounds revealed since the last prompt are printed.
 
         Args:
             context (TeamContext): Relevant information to the developer. 
         """
-        print("=" * 12)
-        print(f"You are Guesser on team {TeamName(context.team_name)}")
-        print(f"Keywords: {context.keywords}")
-        print(f"Notesheet: {context.game.notesheet}")
-        print(f"Scoresheet: {context.game.data}")
+        self.view.show_context("Guesser", context)
 
     def get_code_num(self, clue: str, context: TeamContext) -> int:
         """Attempt to decipher a single clue using the command line.
@@ -181,16 +342,7 @@ class CommandLineGuesser(Guesser):
         Returns:
             int: The guessed code number based on the team's clue.
         """
-        code_num = None
-        while code_num is None:
-            try:
-                code_num = int(input(f"Code number for clue {clue}: "))
-            except ValueError:
-                pass
-            if code_num is None or code_num not in range(len(context.keywords)):
-                print(f"Code num must lie in range [0 - {len(context.keywords)}).")
-                code_num = None
-        return code_num
+        return self.view.read_code_num(f"Code number for clue {clue}: ", len(context.keywords), context)
 
     def decipher_clues(self, clues: Clue, context: TeamContext) -> Code:
         """Attempt to decipher the team's clues using the command line.
@@ -203,14 +355,105 @@ class CommandLineGuesser(Guesser):
             Code: The guessed code numbers based on the team's clues.
         """
         self.print_context(context)
-        print(f"Clues : {clues}")
+        self.view.write(f"Clues : {clues}\n")
         code = tuple(self.get_code_num(clue, context) for clue in clues)
         return code
 
-CommandLineTeam = lambda keywords: Team(
-                                keywords=keywords,
-                                encryptor=CommandLineEncryptor(),
-                                intercepter=CommandLineIntercepter(),
-                                guesser=CommandLineGuesser()
-                            )
+def CommandLineTeam(keywords: Keywords, view: Optional[TerminalView] = None) -> Team:
+    """Build a team of command line players, who share a terminal view.
+
+    Args:
+        keywords (Keywords): The team's keywords.
+        view (Optional[TerminalView], optional): The team's view, such as one with scripted answers. Defaults to None, using the command line.
+
+    Returns:
+        Team: A team of command line players.
+    """
+    view = view if view is not None else TerminalView()
+    return Team(keywords=keywords,
+                encryptor=CommandLineEncryptor(view),
+                intercepter=CommandLineIntercepter(view),
+                guesser=CommandLineGuesser(view))
+
+
+# random players make arbitrary decisions, which is useful for simulation baselines and testing
+
+class RandomEncryptor(Encryptor):
+    """A teammate who gives random words from the official word list as clues.
+
+    Args:
+        seed (int, optional): The random seed for consistent decisions. Defaults to None.
+    """
+    def __init__(self, seed: Optional[int] = None):
+        self.random = random.Random(seed)
+
+    def decide_clues(self, code: Code, context: TeamContext) -> Clue:
+        """Decide random clues for the given code.
+
+        Args:
+            code (Code): The code assigned to the Encryptor to decide clues for.
+            context (TeamContext): Relevant information the Encryptor's decision may be guided by.
+
+        Returns:
+            Clue: A random word for each code number in the provided code.
+        """
+        return tuple(self.random.choice(english.words) for _ in code)
+
+class RandomIntercepter(Intercepter):
+    """A teammate who guesses a random code for the opposing team's clues.
+
+    Args:
+        seed (int, optional): The random seed for consistent decisions. Defaults to None.
+    """
+    def __init__(self, seed: Optional[int] = None):
+        self.random = random.Random(seed)
+
+    def intercept_clues(self, opponent_clues: Clue, context: TeamContext) -> Code:
+        """Guess a random code for the opposing team's clues.
+
+        Args:
+            opponent_clues (Clue): The clues provided by the opposing team.
+            context (TeamContext): Relevant information the Intercepter's decision may be guided by.
+
+        Returns:
+            Code: Distinct random code numbers, one for each clue.
+        """
+        return tuple(self.random.sample(range(context.num_opponent_keywords), len(opponent_clues)))
+
+class RandomGuesser(Guesser):
+    """A teammate who guesses a random code for their team's clues.
+
+    Args:
+        seed (int, optional): The random seed for consistent decisions. Defaults to None.
+    """
+    def __init__(self, seed: Optional[int] = None):
+        self.random = random.Random(seed)
+
+    def decipher_clues(self, clues: Clue, context: TeamContext) -> Code:
+        """Guess a random code for the team's clues.
 
+        Args:
+            clues (Clue): The clues provided by the Guesser's team.
+            context (TeamContext): Relevant information the Guesser's decision may be guided by.
+
+        Returns:
+            Code: Distinct random code numbers, one for each clue.
+        """
+        return tuple(self.random.sample(range(len(context.keywords)), len(clues)))
+
+def RandomTeam(keywords: Keywords, seed: Optional[int] = None) -> Team:
+    """Build a team of random players. Unlike a lambda, it can be pickled, so it may be used as a team factory in worker processes.
+
+    Args:
+        keywords (Keywords): The team's keywords.
+        seed (int, optional): The random seed for consistent decisions. Each player is seeded from it differently, so their decisions are independent. Defaults to None.
+
+    Returns:
+        Team: A team of random players.
+    """
+    # players seeded alike would draw the same codes, so the intercepter and guesser would guess alike
+    encryptor_seed, intercepter_seed, guesser_seed = (seed * 3 + role for role in range(3)) if seed is not None else (None, None, None)
+    return Team(keywords=keywords,
+                encryptor=RandomEncryptor(encryptor_seed),
+                intercepter=RandomIntercepter(intercepter_seed),
+                guesser=RandomGuesser(guesser_seed))
@@ -0,0 +1,176 @@
+from collections import deque
+from collections.abc import Iterable
+import dataclasses
+from decryptogame.components import Clue, Keywords, Note
+from functools import lru_cache
+from typing import Protocol
+
+# suffixes stripped to find the stem of a word, longest first
+SUFFIXES = ("ations", "ation", "ments", "ment", "ness", "ings", "ing", "ers", "ies", "ed", "er", "es", "ly", "s")
+# stems shorter than this are too common to count as deriving from a keyword
+MIN_STEM_LENGTH = 4
+
+
+class ClueValidator(Protocol):
+    """Interface representing a validator which decides whether a team's clues are allowed."""
+
+    def valid_clues(self, clues: Clue, keywords: Keywords) -> bool:
+        """Check if all the clues given by a team are allowed.
+
+        Args:
+            clues (Clue): The clues given by the team's encryptor.
+            keywords (Keywords): The team's keywords.
+
+        Returns:
+            bool: True if every clue is allowed, False otherwise.
+        """
+        ...
+
+
+def normalize(word: str) -> str:
+    """Normalize a word for comparison, ignoring case and anything other than letters and digits.
+
+    Args:
+        word (str): The word to normalize.
+
+    Returns:
+        str: The normalized word.
+    """
+    return "".join(char for char in word.casefold() if char.isalnum())
+
+def stem(word: str) -> str:
+    """Find the stem of a normalized word by stripping its longest common suffix, as long as the stem keeps MIN_STEM_LENGTH characters.
+
+    Args:
+        word (str): The normalized word.
+
+    Returns:
+        str: The stem of the word.
+    """
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[:-len(suffix)]
+    return word
+
+
+class AhoCorasick:
+    """Automaton which finds whether a text contains any of a set of patterns in a single pass over the text.
+
+    Args:
+        patterns (Iterable[str]): The patterns to search for.
+    """
+    def __init__(self, patterns: Iterable[str]):
+        # each state has its transitions, its failure link and whether a pattern ends there
+        self.transitions: list[dict[str, int]] = [{}]
+        self.failures = [0]
+        self.accepting = [False]
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                if char not in self.transitions[state]:
+                    self.transitions.append({})
+                    self.failures.append(0)
+                    self.accepting.append(False)
+                    self.transitions[state][char] = len(self.transitions) - 1
+                state = self.transitions[state][char]
+            self.accepting[state] = True
+
+        # link each state to its longest proper suffix which is also a prefix of a pattern, breadth first
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                failure = self.failures[state]
+                while failure and char not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                self.failures[next_state] = self.transitions[failure].get(char, 0)
+                self.accepting[next_state] = self.accepting[next_state] or self.accepting[self.failures[next_state]]
+                queue.append(next_state)
+
+    def contains_any(self, text: str) -> bool:
+        """Check if the text contains any of the patterns.
+
+        Args:
+            text (str): The text to search.
+
+        Returns:
+            bool: True if any pattern occurs in the text, False otherwise.
+        """
+        transitions, failures, accepting = self.transitions, self.failures, self.accepting
+        state = 0
+        for char in text:
+            while state and char not in transitions[state]:
+                state = failures[state]
+            state = transitions[state].get(char, 0)
+            if accepting[state]:
+                return True
+        return False
+
+
+@dataclasses.dataclass(frozen=True)
+class KeywordIndex:
+    """Index over a team's keywords for finding clues which contain or derive from them.
+
+    Attributes:
+        automaton (AhoCorasick): Automaton over the normalized keywords, which clues must not contain.
+        stems (frozenset[str]): The stems of the normalized keywords, which clues must not share.
+    """
+    automaton: AhoCorasick
+    stems: frozenset[str]
+
+@lru_cache(maxsize=256)
+def keyword_index(keywords: tuple[str, ...]) -> KeywordIndex:
+    """Build the index over a team's keywords. Indexes are cached, so each keyword card is only indexed once per game.
+
+    Args:
+        keywords (tuple[str, ...]): The team's keywords.
+
+    Returns:
+        KeywordIndex: The index over the keywords.
+    """
+    normalized = [normalize(keyword) for keyword in keywords]
+    stems = frozenset(stem(keyword) for keyword in normalized)
+    # stems are only compared with the stems of clues, since as substrings they match unrelated words, such as "plan" in "plant"
+    return KeywordIndex(automaton=AhoCorasick(pattern for pattern in set(normalized) if pattern), stems=stems)
+
+
+class KeywordLeakValidator(ClueValidator):
+    """Validator which forbids clues that contain one of the team's keywords, or derive from one by sharing its stem."""
+
+    def valid_clue(self, clue: str, keywords: Keywords) -> bool:
+        """Check if a single clue is allowed.
+
+        Args:
+            clue (str): The clue given by the team's encryptor.
+            keywords (Keywords): The team's keywords.
+
+        Returns:
+            bool: True if the clue does not contain or derive from a keyword, False otherwise.
+        """
+        index = keyword_index(tuple(keywords))
+        normalized = normalize(clue)
+        return stem(normalized) not in index.stems and not index.automaton.contains_any(normalized)
+
+    def valid_clues(self, clues: Clue, keywords: Keywords) -> bool:
+        """Check if all the clues given by a team are allowed.
+
+        Args:
+            clues (Clue): The clues given by the team's encryptor.
+            keywords (Keywords): The team's keywords.
+
+        Returns:
+            bool: True if no clue contains or derives from a keyword, False otherwise.
+        """
+        return all(self.valid_clue(clue, keywords) for clue in clues)
+
+
+def miscommunication_penalty(note: Note) -> Note:
+    """Penalize a team for giving invalid clues by voiding their decipher attempt, so the official rules count a miscommunication.
+
+    Args:
+        note (Note): The note of the team which gave invalid clues.
+
+    Returns:
+        Note: The penalized note.
+    """
+    return dataclasses.replace(note, attempted_decipher=())
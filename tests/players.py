@@ -0,0 +1,23 @@
+"""Deterministic players shared by the tests."""
+from decryptogame.teams import RandomIntercepter, Team
+
+
+class KeywordEncryptor:
+    def decide_clues(self, code, context):
+        return tuple(context.keywords[code_num] for code_num in code)
+
+class FirstSlotsIntercepter:
+    def intercept_clues(self, opponent_clues, context):
+        return tuple(range(len(opponent_clues)))
+
+class KeywordGuesser:
+    def decipher_clues(self, clues, context):
+        return tuple(context.keywords.index(clue) for clue in context.decode_clues(clues))
+
+def KeywordTeam(keywords, seed=None):
+    # gives each keyword as its own clue, so it never miscommunicates and beats a random team
+    return Team(keywords=keywords, encryptor=KeywordEncryptor(), intercepter=RandomIntercepter(seed), guesser=KeywordGuesser())
+
+def FirstSlotsTeam(keywords):
+    # like KeywordTeam, but every decision is deterministic
+    return Team(keywords=keywords, encryptor=KeywordEncryptor(), intercepter=FirstSlotsIntercepter(), guesser=KeywordGuesser())
@@ -0,0 +1,88 @@
+from functools import partial
+import pytest
+from decryptogame.analytics import COLUMNS, notesheet_columns
+from decryptogame.batch import play_seeded_game
+from decryptogame.components import Note
+from decryptogame.game import Game
+from decryptogame.teams import RandomTeam
+
+
+@pytest.fixture
+def games():
+    # one miscommunication among first team, one interception of second team by first, which is not counted in the first round
+    round_notes = [
+        Note(clues=("a", "b", "c"), attempted_interception=(2, 3, 1), attempted_decipher=(2, 3, 1), correct_code=(4, 3, 1)),
+        Note(clues=("dog", "foot", "bar"), attempted_interception=(2, 1, 3), attempted_decipher=(2, 1, 3), correct_code=(2, 1, 3))
+    ]
+    return [Game(notesheet=[round_notes, round_notes]), Game(notesheet=[round_notes])]
+
+@pytest.fixture
+def fast_outcome_game():
+    # the game is sure to end before black's last decipher attempt, which is skipped
+    game = play_seeded_game([partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)], 8, fast_outcome=True)
+    assert game.notesheet[-1][1].attempted_decipher is None
+    return game
+
+@pytest.fixture
+def labels():
+    return [("alpha", "beta"), ("beta", "alpha")]
+
+
+class TestNotesheetColumns:
+    def test_rows(self, games, labels):
+        columns = notesheet_columns(games, labels)
+
+        assert list(columns) == COLUMNS
+        assert columns["game"] == [0, 0, 0, 0, 1, 1]
+        assert columns["round"] == [0, 0, 1, 1, 0, 0]
+        assert columns["team"] == [0, 1, 0, 1, 0, 1]
+        assert columns["label"] == ["alpha", "beta", "alpha", "beta", "beta", "alpha"]
+        assert columns["clues"][1] == ["dog", "foot", "bar"]
+        assert columns["miscommunication"] == [True, False] * 3
+        assert columns["intercepted"] == [False, False, False, True, False, False]
+
+    def test_empty(self):
+        assert notesheet_columns([Game()]) == {column: [] for column in COLUMNS}
+
+    def test_skipped_decisions(self, fast_outcome_game):
+        columns = notesheet_columns([fast_outcome_game])
+        assert columns["attempted_decipher"][-1] is None
+        assert columns["attempted_decipher"][-2] == list(fast_outcome_game.notesheet[-1][0].attempted_decipher)
+
+
+class TestExport:
+    @pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+    def test_round_trip(self, tmp_path, games, labels, file_format):
+        pytest.importorskip("pyarrow")
+        from decryptogame.analytics import read_notesheets, write_notesheets
+
+        path = tmp_path / f"notesheets.{file_format}"
+        assert write_notesheets(games, path, labels=labels, file_format=file_format, batch_rows=2) == 6
+
+        table = read_notesheets(path, file_format=file_format)
+        assert table.num_rows == 6
+        assert table.column("clues").to_pylist() == notesheet_columns(games, labels)["clues"]
+
+    @pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+    def test_skipped_decisions(self, tmp_path, fast_outcome_game, file_format):
+        pytest.importorskip("pyarrow")
+        from decryptogame.analytics import read_notesheets, write_notesheets
+
+        path = tmp_path / f"fast.{file_format}"
+        rows = write_notesheets([fast_outcome_game], path, file_format=file_format)
+        table = read_notesheets(path, file_format=file_format)
+        assert table.num_rows == rows == 2 * len(fast_outcome_game.notesheet)
+        assert table.column("attempted_decipher").to_pylist() == notesheet_columns([fast_outcome_game])["attempted_decipher"]
+        assert table.column("attempted_decipher").null_count == 1
+
+    def test_rate_by(self, tmp_path, games, labels):
+        pytest.importorskip("pyarrow")
+        from decryptogame.analytics import rate_by, read_notesheets, write_notesheets
+
+        path = tmp_path / "notesheets.parquet"
+        write_notesheets(games, path, labels=labels)
+        rates = rate_by(read_notesheets(path))
+
+        assert rates[(1, "beta")] == 1.0
+        assert rates[(0, "beta")] == 0.0
+        assert rate_by(read_notesheets(path), "miscommunication", ["label"]) == {("alpha",): 2 / 3, ("beta",): 1 / 3}
@@ -0,0 +1,98 @@
+from array import array
+import multiprocessing
+import os
+import pytest
+import subprocess
+import sys
+from decryptogame.artifacts import ArtifactStore, artifacts, measure_pool, with_artifacts
+from decryptogame.teams import RandomTeam
+
+
+def lexicon_team(keywords, lexicon):
+    team = RandomTeam(keywords)
+    team.lexicon = lexicon
+    return team
+
+def lexicon_size(factory):
+    return len(factory(("a", "b", "c", "d")).lexicon)
+
+
+@pytest.fixture
+def store():
+    store = ArtifactStore()
+    yield store
+    store.close()
+
+
+class TestArtifactStore:
+    def test_load_once(self, store):
+        calls = []
+        loader = lambda: calls.append(1) or "lexicon"
+        assert store.load("lexicon", loader) == "lexicon"
+        assert store.load("lexicon", loader) == "lexicon"
+        assert len(calls) == 1
+
+    def test_nested_load(self, store):
+        vocabulary = lambda: ["tree", "forest"]
+        # a loader which loads the artifact it depends on
+        index = lambda: {word: number for number, word in enumerate(store.load("vocabulary", vocabulary))}
+        assert store.load("index", index) == {"tree": 0, "forest": 1}
+        assert store.load("vocabulary", vocabulary) == ["tree", "forest"]
+
+    def test_share_and_attach(self, store):
+        store.load("bytes", lambda: b"clue words")
+        store.load("array", lambda: array("d", [0.5, 1.5]))
+        store.load("lexicon", lambda: {"tree": ["forest"]})
+        handles = store.share()
+
+        worker_store = ArtifactStore()
+        worker_store.attach(handles)
+        assert bytes(worker_store["bytes"]) == b"clue words"
+        assert worker_store["array"].tolist() == [0.5, 1.5]
+        assert worker_store["lexicon"] == {"tree": ["forest"]}
+        with pytest.raises(TypeError):
+            worker_store["array"][0] = 2.0
+        worker_store.close()
+
+    def test_share_ndarray(self, store):
+        numpy = pytest.importorskip("numpy")
+        embeddings = numpy.arange(12, dtype=numpy.float32).reshape(3, 4)
+        store.load("embeddings", lambda: embeddings)
+
+        worker_store = ArtifactStore()
+        worker_store.attach(store.share())
+        attached = worker_store["embeddings"]
+        assert attached.shape == (3, 4)
+        assert (attached == embeddings).all()
+        assert not attached.flags.writeable
+        del attached
+        worker_store.close()
+
+
+class TestPools:
+    @pytest.mark.parametrize("start_method", ["fork", "spawn"])
+    def test_team_factory(self, start_method):
+        artifacts.load("lexicon", lambda: list(range(1000)))
+        factory = with_artifacts(lexicon_team, "lexicon")
+        assert lexicon_size(factory) == 1000
+
+        try:
+            with artifacts.pool(2, multiprocessing.get_context(start_method)) as executor:
+                assert list(executor.map(lexicon_size, [factory] * 2)) == [1000, 1000]
+        finally:
+            artifacts.close()
+
+    def test_measure_pool(self):
+        measurement = measure_pool(lambda: artifacts.pool(2, multiprocessing.get_context("fork")), 2, delay=0.05)
+        assert measurement.startup_seconds >= 0
+        assert 1 <= len(measurement.worker_rss) <= 2
+        assert measurement.total_rss > 0
+
+    def test_without_resource(self):
+        # the resource module is Unix-only, so the module must import and measure without it
+        code = ("import sys; sys.modules['resource'] = None\n"
+                "import decryptogame.artifacts as artifacts\n"
+                "assert artifacts.resource is None\n"
+                "rss, pss = artifacts.process_memory()\n"
+                "assert rss >= 0 and pss >= 0\n")
+        subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)})
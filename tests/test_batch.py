@@ -0,0 +1,34 @@
+from functools import partial
+import pytest
+from decryptogame.batch import play_batch, play_chunk, play_seeded_game
+from decryptogame.official_words import english
+from decryptogame.teams import RandomTeam
+
+
+@pytest.fixture
+def team_factories():
+    return [partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)]
+
+
+class TestBatch:
+    def test_seeded_game(self, team_factories):
+        game = play_seeded_game(team_factories, 5, card_lengths=[2, 2], code_lengths=[1, 1])
+        assert game.notesheet == play_seeded_game(team_factories, 5, card_lengths=[2, 2], code_lengths=[1, 1]).notesheet
+
+    @pytest.mark.parametrize("backend", ["threads", "processes"])
+    def test_matches_serial(self, team_factories, backend):
+        options = dict(card_lengths=[2, 2], code_lengths=[1, 1])
+        serial = play_chunk(team_factories, range(100), **options)
+        results = play_batch(team_factories, range(100), backend=backend, max_workers=4, chunk_games=7, **options)
+
+        assert results == serial
+        assert [result.seed for result in results] == list(range(100))
+        assert play_batch(team_factories, range(100), backend="serial", **options) == serial
+
+    def test_unknown_backend(self, team_factories):
+        with pytest.raises(ValueError):
+            play_batch(team_factories, range(3), backend="fibers")
+
+    def test_words_immutable(self):
+        with pytest.raises(TypeError):
+            english.words[0] = "CHANGED"
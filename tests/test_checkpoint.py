@@ -0,0 +1,152 @@
+from functools import partial
+import json
+import pytest
+from decryptogame.batch import play_seeded_game
+from decryptogame.checkpoint import REGISTRY, Tournament, dump_game, load_game, register
+from decryptogame.components import Note
+from decryptogame.end_criteria import RoundEndCondition
+from decryptogame.game import Game
+from decryptogame.generators import RandomCodes, RandomKeywordCards
+from decryptogame.teams import RandomTeam, Team
+from tests.players import FirstSlotsTeam, KeywordEncryptor, KeywordGuesser
+
+
+class Preempted(Exception):
+    pass
+
+class PreemptedIntercepter:
+    calls = 0
+
+    def intercept_clues(self, opponent_clues, context):
+        PreemptedIntercepter.calls += 1
+        if PreemptedIntercepter.calls == 40:
+            raise Preempted
+        return tuple(range(len(opponent_clues)))
+
+def preempted_team(keywords):
+    return Team(keywords=keywords, encryptor=KeywordEncryptor(), intercepter=PreemptedIntercepter(), guesser=KeywordGuesser())
+
+class PreemptedRandomIntercepter:
+    calls = 0
+
+    def __init__(self, intercepter):
+        self.intercepter = intercepter
+
+    def intercept_clues(self, opponent_clues, context):
+        PreemptedRandomIntercepter.calls += 1
+        if PreemptedRandomIntercepter.calls == 11:
+            raise Preempted
+        return self.intercepter.intercept_clues(opponent_clues, context)
+
+def preempted_random_team(keywords, seed):
+    team = RandomTeam(keywords, seed=seed)
+    team.intercepter = PreemptedRandomIntercepter(team.intercepter)
+    return team
+
+@pytest.fixture
+def notesheet():
+    return [
+        [Note(clues=("try", "b", "c"), attempted_interception=(2, 1, 3), attempted_decipher=(1, 2, 3), correct_code=(1, 2, 3)),
+         Note(clues=("bat", "dot", "ply"), attempted_interception=(4, 1, 3), attempted_decipher=(3, 1, 4), correct_code=(3, 1, 4))],
+        [Note(clues=("apple", "bot", "core"), attempted_interception=(2, 1, 3), attempted_decipher=(2, 1, 3), correct_code=(2, 1, 3)),
+         Note(clues=("ant", "bee", "cry"), attempted_interception=(2, 4, 3), attempted_decipher=(4, 1, 3), correct_code=(4, 1, 3))],
+    ]
+
+
+class TestGameRecords:
+    def test_round_trip(self, notesheet):
+        game = Game(notesheet=notesheet, end_conditions=[RoundEndCondition(5)])
+        restored = load_game(json.loads(json.dumps(dump_game(game))))
+
+        assert restored.notesheet == game.notesheet
+        assert restored.data == game.data
+        assert restored.end_conditions[0].k == 5
+
+    def test_incremental(self, notesheet):
+        game = Game(notesheet=notesheet[:1])
+        restored = load_game(dump_game(game))
+        game.process_round_notes(notesheet[1])
+
+        record = dump_game(game, start_round=1)
+        assert len(record["notesheet"]) == 1
+
+        load_game(record, restored)
+        assert restored.notesheet == game.notesheet
+        assert restored.data == game.data
+
+        with pytest.raises(ValueError):
+            load_game(record, restored)
+
+    def test_skipped_decisions(self):
+        game = play_seeded_game([partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)], 8, fast_outcome=True)
+        # the last round's decipher attempt could not change the winner, so it was skipped
+        assert game.notesheet[-1][-1].attempted_decipher is None
+        restored = load_game(json.loads(json.dumps(dump_game(game))))
+        assert restored.notesheet == game.notesheet
+        assert restored.data == game.data
+
+    def test_unregistered(self):
+        def custom_rule(note, data):
+            return 0
+
+        game = Game(miscommunication_func=custom_rule)
+        with pytest.raises(ValueError):
+            dump_game(game)
+
+        register(custom_rule)
+        assert load_game(dump_game(game)).miscommunication_func is custom_rule
+        del REGISTRY["custom_rule"]
+
+
+class TestGeneratorState:
+    def test_codes(self):
+        keyword_cards = [("a", "b", "c", "d"), ("e", "f", "g", "h")]
+        codes = RandomCodes(keyword_cards, seed=1)
+        next(codes)
+        state = json.loads(json.dumps(codes.getstate()))
+        expected = [next(codes) for _ in range(5)]
+
+        restored = RandomCodes(keyword_cards)
+        restored.setstate(state)
+        assert [next(restored) for _ in range(5)] == expected
+
+    def test_keyword_cards(self):
+        cards = RandomKeywordCards(seed=1)
+        state = cards.getstate()
+        expected = next(cards)
+
+        restored = RandomKeywordCards()
+        restored.setstate(state)
+        assert next(restored) == expected
+
+
+class TestTournament:
+    def test_resume(self, tmp_path):
+        expected = Tournament([FirstSlotsTeam, FirstSlotsTeam], 10, tmp_path / "uninterrupted", checkpoint_rounds=3).run()
+
+        with pytest.raises(Preempted):
+            Tournament([preempted_team, preempted_team], 10, tmp_path / "resumed", checkpoint_rounds=3).run()
+        # only the rounds played since the previous checkpoint are lost
+        assert len(list((tmp_path / "resumed").glob("*.jsonl"))) > 1
+
+        resumed = Tournament([FirstSlotsTeam, FirstSlotsTeam], 10, tmp_path / "resumed", checkpoint_rounds=3).run()
+
+        assert len(resumed) == 10
+        assert [game.notesheet for game in resumed] == [game.notesheet for game in expected]
+        assert [game.data for game in resumed] == [game.data for game in expected]
+
+    @pytest.mark.parametrize("checkpoint_teams", [True, False])
+    def test_resume_seeded_teams(self, tmp_path, checkpoint_teams):
+        factories = [partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)]
+        expected = Tournament(factories, 6, tmp_path / "uninterrupted", checkpoint_rounds=1).run()
+
+        PreemptedRandomIntercepter.calls = 0
+        preempted = [partial(preempted_random_team, seed=1), partial(preempted_random_team, seed=2)]
+        with pytest.raises(Preempted):
+            Tournament(preempted, 6, tmp_path / "resumed", checkpoint_rounds=1, checkpoint_teams=checkpoint_teams).run()
+        # the game in progress was checkpointed after its first round, with its teams if they are checkpointed
+        assert len(list((tmp_path / "resumed").glob("*.teams.pickle"))) == checkpoint_teams
+
+        resumed = Tournament(factories, 6, tmp_path / "resumed", checkpoint_rounds=1, checkpoint_teams=checkpoint_teams).run()
+        # rebuilt teams restart their random streams partway through the game, so they only resume exactly when checkpointed
+        assert ([game.notesheet for game in resumed] == [game.notesheet for game in expected]) == checkpoint_teams
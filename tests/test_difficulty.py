@@ -0,0 +1,78 @@
+from itertools import combinations
+import os
+import pytest
+import random
+from decryptogame.difficulty import DifficultyIndex, build_difficulty_index, letter_similarity, main, pair_offset
+from decryptogame.generators import RandomKeywordCards
+from decryptogame.official_words import english
+
+
+@pytest.fixture(scope="module")
+def index_path(tmp_path_factory):
+    path = os.path.join(tmp_path_factory.mktemp("difficulty"), "keywords.idx")
+    build_difficulty_index(path, num_bands=4, bucket_capacity=64)
+    return path
+
+@pytest.fixture
+def index(index_path):
+    index = DifficultyIndex(index_path)
+    yield index
+    index.close()
+
+
+class TestDifficultyIndex:
+    def test_pair_offset(self):
+        offsets = [pair_offset(i, j, 5) for i, j in combinations(range(5), 2)]
+        assert offsets == list(range(10))
+        assert pair_offset(3, 1, 5) == pair_offset(1, 3, 5)
+
+    def test_pair_difficulty(self, index):
+        words = english.words
+        assert index.num_words == len(words)
+        assert index.pair_difficulty(0, 1) == pytest.approx(letter_similarity(words[0], words[1]), abs=1e-3)
+        assert index.pair_difficulty(5, 2) == index.pair_difficulty(2, 5)
+
+    def test_buckets(self, index):
+        assert index.bucket_sizes == [64] * 4
+        assert index.band_edges == sorted(index.band_edges)
+        rng = random.Random(0)
+        for band in range(index.num_bands):
+            for _ in range(20):
+                card = index.draw(band, rng)
+                assert len(set(card)) == index.card_length
+                assert index.band(index.card_difficulty(card)) == band
+
+    def test_main(self, tmp_path):
+        path = os.path.join(tmp_path, "cards3.idx")
+        main([path, "--card-length", "3", "--bands", "2", "--bucket-capacity", "8"])
+        index = DifficultyIndex(path)
+        assert (index.card_length, index.num_bands) == (3, 2)
+        index.close()
+
+
+class TestDifficultyBands:
+    def test_band(self, index):
+        cards = RandomKeywordCards(seed=1, difficulty_index=index, difficulty_band=3)
+        for _ in range(20):
+            card1, card2 = next(cards)
+            assert not set(card1) & set(card2)
+            for card in (card1, card2):
+                assert index.band(index.card_difficulty([english.words.index(word) for word in card])) == 3
+
+    def test_band_range(self, index):
+        cards = RandomKeywordCards(seed=1, difficulty_index=index, difficulty_band=(0, 1))
+        bands = {index.band(index.card_difficulty([english.words.index(word) for word in card])) for _ in range(30) for card in next(cards)}
+        assert bands == {0, 1}
+
+    def test_seed(self, index):
+        cards1 = next(RandomKeywordCards(seed=7, difficulty_index=index, difficulty_band=2))
+        cards2 = next(RandomKeywordCards(seed=7, difficulty_index=index, difficulty_band=2))
+        assert cards1 == cards2
+
+    def test_mismatch(self, index):
+        with pytest.raises(ValueError):
+            RandomKeywordCards(difficulty_band=1)
+        with pytest.raises(ValueError):
+            RandomKeywordCards(card_lengths=[3, 3], difficulty_index=index, difficulty_band=1)
+        with pytest.raises(ValueError):
+            RandomKeywordCards(words=english.words[:-1], difficulty_index=index, difficulty_band=1)
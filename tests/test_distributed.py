@@ -0,0 +1,223 @@
+from functools import partial
+import multiprocessing
+import os
+import threading
+import time
+import pytest
+from decryptogame.batch import play_batch
+from decryptogame.distributed import (AUTHKEY_VARIABLE, Chunk, ChunkFailed, ChunkResult, Coordinator, LocalTransport, TCPTransport,
+                                      main, partition_jobs, run_worker)
+from decryptogame.teams import RandomTeam
+
+MATCHUPS = {
+    "1v2": [partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)],
+    "3v4": [partial(RandomTeam, seed=3), partial(RandomTeam, seed=4)],
+}
+
+
+def expected_results(seeds):
+    return {name: play_batch(factories, seeds, backend="serial") for name, factories in MATCHUPS.items()}
+
+def start_workers(transport, count, matchups=MATCHUPS):
+    threads = [threading.Thread(target=run_worker, args=(transport.connect(), matchups), kwargs={"name": f"worker{index}"}, daemon=True)
+               for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+def tcp_worker(address, authkey):
+    run_worker(TCPTransport(address, authkey).connect(), MATCHUPS)
+
+
+class FlakyTeam:
+    # fails the first time each seed is played, as a worker with a transient fault would
+    failed = set()
+    lock = threading.Lock()
+
+    def __init__(self, seed):
+        self.seed = seed
+
+    def __call__(self, keywords):
+        with self.lock:
+            if keywords not in self.failed:
+                self.failed.add(keywords)
+                raise RuntimeError("transient fault")
+        return RandomTeam(keywords, seed=self.seed)
+
+
+class TestPartition:
+    def test_chunks(self):
+        chunks = partition_jobs(["a", "b"], range(10), chunk_games=4)
+        assert [chunk.chunk_id for chunk in chunks] == list(range(6))
+        assert [chunk.matchup for chunk in chunks] == ["a"] * 3 + ["b"] * 3
+        assert [chunk.seeds for chunk in chunks[:3]] == [range(0, 4), range(4, 8), range(8, 10)]
+
+    def test_scattered_seeds(self):
+        chunks = partition_jobs(["a"], [5, 6, 8, 10], chunk_games=2)
+        assert [chunk.seeds for chunk in chunks] == [range(5, 7), [8, 10]]
+
+
+class TestCoordinator:
+    def test_local_workers(self):
+        seeds = range(40)
+        transport = LocalTransport()
+        coordinator = Coordinator(transport, list(MATCHUPS), seeds, chunk_games=7)
+        workers = start_workers(transport, 3)
+        assert coordinator.run(timeout=60) == expected_results(seeds)
+        for worker in workers:
+            worker.join(5)
+            assert not worker.is_alive()
+        assert {result.worker for result in coordinator.results.values()} <= {"worker0", "worker1", "worker2"}
+
+    def test_tcp_workers(self):
+        seeds = range(30)
+        transport = TCPTransport(("127.0.0.1", 0), b"secret")
+        address = transport.listen()
+        coordinator = Coordinator(transport, list(MATCHUPS), seeds, chunk_games=10)
+        context = multiprocessing.get_context("spawn")
+        workers = [context.Process(target=tcp_worker, args=(address, b"secret")) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        try:
+            assert coordinator.run(timeout=120) == expected_results(seeds)
+        finally:
+            for worker in workers:
+                worker.join(30)
+        assert all(worker.exitcode == 0 for worker in workers)
+
+    def test_failed_chunks_are_retried(self):
+        seeds = range(12)
+        transport = LocalTransport()
+        matchups = {"flaky": [FlakyTeam(1), FlakyTeam(2)]}
+        coordinator = Coordinator(transport, ["flaky"], seeds, chunk_games=4, max_attempts=20)
+        start_workers(transport, 2, matchups)
+        results = coordinator.run(timeout=60)
+        assert results["flaky"] == play_batch(MATCHUPS["1v2"], seeds, backend="serial")
+        assert coordinator.errors
+
+    def test_give_up(self):
+        transport = LocalTransport()
+        coordinator = Coordinator(transport, ["missing"], range(4), chunk_games=2, max_attempts=2)
+        start_workers(transport, 1)
+        with pytest.raises(RuntimeError, match="KeyError"):
+            coordinator.run(timeout=60)
+
+    def test_hung_worker(self):
+        transport = LocalTransport()
+        coordinator = Coordinator(transport, ["1v2"], range(4), chunk_games=4, lease_timeout=0.1, max_attempts=1, poll_interval=0.05)
+        # a worker which leases the only chunk on its last attempt, then never answers but stays connected
+        channel = transport.connect()
+        channel.send(None)
+        errors = []
+        def run():
+            try:
+                coordinator.run()
+            except RuntimeError as error:
+                errors.append(error)
+        runner = threading.Thread(target=run, daemon=True)
+        runner.start()
+        assert isinstance(channel.recv(), Chunk)
+        runner.join(30)
+        assert not runner.is_alive()
+        assert len(errors) == 1 and "lease expired" in str(errors[0])
+        channel.close()
+
+    def test_integer_poll_interval(self):
+        transport = LocalTransport()
+        coordinator = Coordinator(transport, ["1v2"], range(8), chunk_games=4, lease_timeout=60, poll_interval=1)
+        # a straggler holds one chunk while the worker finishes the other, so the worker is told to wait
+        straggler = transport.connect()
+        straggler.send(None)
+        runner = threading.Thread(target=lambda: results.append(coordinator.run(timeout=60)))
+        results = []
+        runner.start()
+        chunk = straggler.recv()
+        workers = start_workers(transport, 1)
+        time.sleep(0.5)
+        assert workers[0].is_alive()
+        expected = expected_results(range(8))["1v2"]
+        straggler.send(ChunkResult(chunk_id=chunk.chunk_id, worker="straggler", results=tuple(expected[:4])))
+        assert straggler.recv() is None
+        runner.join(60)
+        assert results == [{"1v2": expected}]
+        workers[0].join(10)
+        assert not workers[0].is_alive()
+
+    def test_disconnected_worker(self):
+        transport = LocalTransport()
+        coordinator = Coordinator(transport, ["1v2"], range(8), chunk_games=4)
+        # a worker which leases a chunk, then goes away without playing it
+        channel = transport.connect()
+        channel.send(None)
+        runner = threading.Thread(target=lambda: results.append(coordinator.run(timeout=60)))
+        results = []
+        runner.start()
+        assert isinstance(channel.recv(), Chunk)
+        channel.close()
+        start_workers(transport, 1)
+        runner.join(60)
+        assert results == [{"1v2": expected_results(range(8))["1v2"]}]
+
+    @pytest.mark.parametrize("fails", [False, True])
+    def test_expired_holder_goes_away(self, fails):
+        transport = LocalTransport()
+        coordinator = Coordinator(transport, ["1v2"], range(4), chunk_games=4, lease_timeout=0.0, max_attempts=2)
+        # a straggler leases the only chunk, which expires and is leased to another worker on its last attempt
+        straggler = transport.connect()
+        straggler.send(None)
+        runner = threading.Thread(target=lambda: results.append(coordinator.run(timeout=60)))
+        results = []
+        runner.start()
+        chunk = straggler.recv()
+        coordinator.lease_timeout = 60
+        worker = transport.connect()
+        worker.send(None)
+        assert worker.recv() == chunk
+        # the straggler then fails or disconnects, which must not release the other worker's lease
+        if fails:
+            straggler.send(ChunkFailed(chunk_id=chunk.chunk_id, worker="straggler", error="late failure"))
+            assert isinstance(straggler.recv(), float)
+        straggler.close()
+        time.sleep(0.2)
+        assert runner.is_alive()
+        expected = expected_results(range(4))["1v2"]
+        worker.send(ChunkResult(chunk_id=chunk.chunk_id, worker="worker", results=tuple(expected)))
+        assert worker.recv() is None
+        runner.join(60)
+        assert results == [{"1v2": expected}]
+        worker.close()
+
+    def test_expired_lease_duplicates_are_ignored(self):
+        transport = LocalTransport()
+        coordinator = Coordinator(transport, ["1v2"], range(4), chunk_games=4, lease_timeout=0.0)
+        # a straggler leases the only chunk, which then expires and is finished by another worker
+        straggler = transport.connect()
+        straggler.send(None)
+        runner = threading.Thread(target=lambda: results.append(coordinator.run(timeout=60)))
+        results = []
+        runner.start()
+        chunk = straggler.recv()
+        start_workers(transport, 1)
+        runner.join(60)
+        expected = expected_results(range(4))["1v2"]
+        assert results == [{"1v2": expected}]
+        straggler.send(ChunkResult(chunk_id=chunk.chunk_id, worker="straggler", results=()))
+        assert straggler.recv() is None
+        assert coordinator.duplicates == 1
+        assert coordinator.results[chunk.chunk_id].worker == "worker0"
+
+
+class TestMain:
+    def test_worker(self, monkeypatch):
+        transport = TCPTransport(("127.0.0.1", 0), b"secret")
+        host, port = transport.listen()
+        coordinator = Coordinator(transport, ["1v2"], range(6), chunk_games=3)
+        monkeypatch.setenv(AUTHKEY_VARIABLE, "secret")
+        # Windows has no os.environb, so the key is read without it
+        monkeypatch.delattr(os, "environb", raising=False)
+        worker = threading.Thread(target=lambda: played.append(main([f"{host}:{port}", "--matchups", "tests.test_distributed:MATCHUPS"])))
+        played = []
+        worker.start()
+        assert coordinator.run(timeout=60) == {"1v2": expected_results(range(6))["1v2"]}
+        worker.join(30)
+        assert played == [2]
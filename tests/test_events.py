@@ -0,0 +1,96 @@
+from functools import partial
+import threading
+from decryptogame.batch import play_seeded_game
+from decryptogame.events import (CluesDecided, DecipherAttempted, Event, EventBus, GameEnded, InterceptionAttempted,
+                                 RingBufferSubscriber, RoundScored, RoundStarted)
+from decryptogame.game import Game
+from decryptogame.teams import RandomTeam
+
+team_factories = [partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)]
+
+def play(event_bus=None, seed=0):
+    return play_seeded_game(team_factories, seed, game_factory=partial(Game, event_bus=event_bus))
+
+
+class TestEventBus:
+    def test_game_events(self):
+        bus = EventBus()
+        events = []
+        bus.subscribe(events.append)
+        game = play(bus)
+
+        rounds = game.data.rounds_played
+        assert len(events) == rounds * 8 + 1
+        assert [type(event) for event in events[:8]] == [RoundStarted, CluesDecided, CluesDecided, InterceptionAttempted, InterceptionAttempted,
+                                                        DecipherAttempted, DecipherAttempted, RoundScored]
+        assert [event.notes for event in events if isinstance(event, RoundScored)] == game.notesheet
+        assert events[-1] == GameEnded(round_number=rounds, winner=game.winner(), data=game.data)
+        assert game.notesheet == play().notesheet
+
+    def test_typed_subscribers(self):
+        bus = EventBus()
+        scored, decisions = [], []
+        bus.subscribe(scored.append, RoundScored)
+        bus.subscribe(decisions.append, InterceptionAttempted, DecipherAttempted)
+        game = play(bus)
+
+        assert [event.data for event in scored][-1] == game.data
+        assert len(decisions) == game.data.rounds_played * 4
+
+        bus.unsubscribe(scored.append)
+        assert bus.active
+        bus.unsubscribe(decisions.append)
+        assert not bus.active
+        play(bus)
+        assert len(scored) == game.data.rounds_played
+
+    def test_decorator(self):
+        bus = EventBus()
+        seen = []
+
+        @bus.subscribe
+        def handler(event: Event):
+            seen.append(event.round_number)
+
+        play(bus)
+        assert seen[0] == 0
+
+
+class TestRingBufferSubscriber:
+    def test_batches(self):
+        bus = EventBus()
+        sync_events, batches = [], []
+        threads = set()
+        def handle(batch):
+            threads.add(threading.get_ident())
+            batches.append(batch)
+        subscriber = RingBufferSubscriber(handle, batch_size=10)
+        bus.subscribe(subscriber)
+        bus.subscribe(sync_events.append)
+        for seed in range(20):
+            play(bus, seed)
+        subscriber.flush()
+
+        assert [event for batch in batches for event in batch] == sync_events
+        assert all(len(batch) <= 10 for batch in batches)
+        assert threads == {subscriber._thread.ident}
+        subscriber.close()
+        assert not subscriber._thread.is_alive()
+
+    def test_dropped(self):
+        release = threading.Event()
+        batches = []
+        subscriber = RingBufferSubscriber(lambda batch: (release.wait(), batches.append(batch)), capacity=5, batch_size=1, interval=60)
+        for round_number in range(3):
+            subscriber(Event(round_number=round_number))
+        # the first event is held by the handler, so the rest fill the buffer
+        while len(subscriber._buffer) == 3:
+            pass
+        for round_number in range(3, 12):
+            subscriber(Event(round_number=round_number))
+        release.set()
+        subscriber.close()
+
+        handled = [event.round_number for batch in batches for event in batch]
+        assert handled[-5:] == list(range(7, 12))
+        assert subscriber.dropped == 12 - len(handled)
@@ -0,0 +1,42 @@
+import pytest
+from decryptogame.components import Note
+from decryptogame.game import Game
+from decryptogame.teams import TeamContext
+
+
+@pytest.fixture
+def notesheet():
+    return [
+        [Note(clues=("try", "b", "c"), attempted_interception=(2, 1, 3), attempted_decipher=(1, 2, 3), correct_code=(1, 2, 3)),
+         Note(clues=("bat", "dot", "ply"), attempted_interception=(3, 1, 2), attempted_decipher=(3, 1, 0), correct_code=(3, 1, 0))],
+        [Note(clues=("apple", "bot", "core"), attempted_interception=(2, 1, 3), attempted_decipher=(2, 1, 3), correct_code=(2, 1, 3)),
+         Note(clues=("ant", "bee", "cry"), attempted_interception=(2, 0, 3), attempted_decipher=(0, 1, 3), correct_code=(0, 1, 3))],
+    ]
+
+
+class TestNotesheetFeatures:
+    def test_incremental(self, notesheet):
+        game = Game()
+        game.process_round_notes(notesheet[0])
+        assert game.features.clues_for_slot(0, 2) == ["b"]
+
+        game.process_round_notes(notesheet[1])
+        features = game.features
+        assert features.rounds == 2
+        assert features.clues_for_slot(0, 2) == ["b", "apple"]
+        assert features.clues_for_slot(0, 0) == []
+        assert features.clues_for_slot(1, 1) == ["dot", "bee"]
+        assert features.code_history(1) == [(3, 1, 0), (0, 1, 3)]
+        assert features.slot_frequencies(0, 4) == [0.0, 1 / 3, 1 / 3, 1 / 3]
+
+    def test_matches_notesheet(self, notesheet):
+        # features are built when a game is initialized from a notesheet too
+        features = Game(notesheet=notesheet).features
+        for team_name in range(2):
+            assert features.code_history(team_name) == [round_notes[team_name].correct_code for round_notes in notesheet]
+
+    def test_context(self, notesheet):
+        game = Game(notesheet=notesheet)
+        context = TeamContext(team_name=0, keywords=("a", "b", "c", "d"), num_opponent_keywords=4, game=game)
+        assert context.features is game.features
+        assert context.features.slot_frequencies(1, 4) == [1 / 3, 1 / 3, 0.0, 1 / 3]
@@ -1,5 +1,5 @@
 import pytest
-from decryptogame.game import Game
+from decryptogame.game import Game, interception_rule, miscommunication_rule
 from decryptogame.components import GameData, Note
 
 
@@ -75,4 +75,43 @@ class TestGame:
 
         game = Game(notesheet=notesheet)
 
-        assert game.data == GameData(miscommunications=[1,0], interceptions=[1,1], rounds_played = rounds_played)
\ No newline at end of file
+        assert game.data == GameData(miscommunications=[1,0], interceptions=[1,1], rounds_played = rounds_played)
+
+    def test_custom_rules(self):
+        round_notes = [
+            Note(clues=("a", "b", "c"), attempted_interception=(2, 3, 1), attempted_decipher=(2, 3, 1), correct_code=(4, 3, 1)),
+            Note(clues=("dog", "foot", "bar"), attempted_interception=(2, 1, 3), attempted_decipher=(2, 1, 3), correct_code=(2, 1, 3))
+        ]
+        # custom rules are scored through the generic path, and agree with the built-in rules scored directly
+        game = Game(miscommunication_func=lambda note, data: miscommunication_rule(note, data),
+                    interception_func=lambda note, data: interception_rule(note, data, count_first_round=True))
+        game.process_round_notes(round_notes)
+        assert game.data == GameData(interceptions=[1, 0], miscommunications=[1, 0], rounds_played=1)
+
+        game.process_round_notes(round_notes)
+        assert game.data == GameData(interceptions=[2, 0], miscommunications=[2, 0], rounds_played=2)
+        assert Game(notesheet=[round_notes, round_notes]).data == GameData(interceptions=[1, 0], miscommunications=[2, 0], rounds_played=2)
+
+    def test_outcome_decided(self):
+        game = Game(notesheet=[[
+            Note(clues=("a",), attempted_interception=(0,), attempted_decipher=(1,), correct_code=(0,)),
+            Note(clues=("b",), attempted_interception=(1,), attempted_decipher=(1,), correct_code=(1,)),
+        ]])
+        assert game.data == GameData(miscommunications=[1, 0], rounds_played=1)
+        # nothing is known yet, so white may or may not miscommunicate again
+        assert not game.outcome_decided([None, None], [None, None])
+        # white miscommunicating again loses, since black can not reach two miscommunications this round
+        assert game.outcome_decided([True, None], [None, None])
+
+        game.process_round_notes([
+            Note(clues=("c",), attempted_interception=(1,), attempted_decipher=(0,), correct_code=(0,)),
+            Note(clues=("d",), attempted_interception=(0,), attempted_decipher=(0,), correct_code=(1,)),
+        ])
+        assert game.data == GameData(miscommunications=[1, 1], rounds_played=2)
+        # if black miscommunicates too, the tiebreaker decides by the unknown interceptions
+        assert not game.outcome_decided([True, None], [None, None])
+        assert game.outcome_decided([True, False], [None, None])
+
+    def test_outcome_decided_custom_rules(self):
+        game = Game(miscommunication_func=lambda note, data: 1)
+        assert not game.outcome_decided([True, False], [False, False])
@@ -1,5 +1,8 @@
+import json
 import pytest
-from decryptogame.generators import RandomKeywordCards, RandomCodes
+from collections import Counter
+from decryptogame.generators import BalancedSlots, MaxOverlap, RandomKeywordCards, RandomCodes, ScheduledCodes
+from itertools import permutations
 
 @pytest.fixture
 def keyword_cards():
@@ -42,4 +45,47 @@ class TestRandomCodes:
         assert codes1 == codes2
 
 
-        
\ No newline at end of file
+        
+class TestScheduledCodes:
+    def test_no_repeats(self, keyword_cards):
+        codes = ScheduledCodes(keyword_cards, seed=400)
+        rounds = [next(codes) for _ in range(24)]
+
+        for team_codes in zip(*rounds):
+            assert sorted(team_codes) == list(permutations(range(4), 3))
+        # once every code has been drawn, a new shuffle begins
+        assert all(len(code) == 3 for code in next(codes))
+
+    def test_seed(self, keyword_cards):
+        codes1 = ScheduledCodes(keyword_cards, seed=400).next_n(3, 8)
+        codes2 = ScheduledCodes(keyword_cards, seed=400).next_n(3, 8)
+
+        assert codes1 == codes2
+        assert len(codes1) == 3 * 8 * 2 * 3
+
+    def test_max_overlap(self, keyword_cards):
+        codes = ScheduledCodes(keyword_cards, seed=1, policies=[MaxOverlap(0, rounds=1)])
+        rounds = [next(codes) for _ in range(8)]
+
+        for previous, current in zip(rounds, rounds[1:]):
+            for previous_code, code in zip(previous, current):
+                assert all(digit != previous_digit for digit, previous_digit in zip(code, previous_code))
+
+    def test_balanced_slots(self, keyword_cards):
+        codes = ScheduledCodes(keyword_cards, seed=2, policies=[BalancedSlots(4)])
+        for _ in range(8):
+            next(codes)
+
+        for history in codes.histories:
+            counts = Counter(digit for code in history for digit in code)
+            assert set(counts.values()) == {6}
+
+    def test_state(self, keyword_cards):
+        codes = ScheduledCodes(keyword_cards, seed=3)
+        next(codes)
+        state = json.loads(json.dumps(codes.getstate()))
+        expected = [next(codes) for _ in range(10)]
+
+        restored = ScheduledCodes(keyword_cards)
+        restored.setstate(state)
+        assert [next(restored) for _ in range(10)] == expected
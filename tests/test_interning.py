@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import json
+import pickle
+from decryptogame.batch import play_seeded_game
+from decryptogame.game import Game
+from decryptogame.interning import ClueTable
+from decryptogame.play import play_game
+from decryptogame.teams import RandomTeam
+from decryptogame.validators import KeywordLeakValidator
+
+team_factories = [partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)]
+
+
+class TestClueTable:
+    def test_intern(self):
+        table = ClueTable(["apple"])
+        assert table.intern_clues(("pear", "apple", "pear")) == (1, 0, 1)
+        assert table.decode((1, 0)) == ("pear", "apple")
+        assert "pear" in table and len(table) == 2
+
+    def test_bounded(self):
+        table = ClueTable(max_size=2)
+        clue_ids = table.intern_clues(("a", "b", "c", "a", "c"))
+        assert clue_ids == (0, 1, "c", 0, "c")
+        assert table.decode(clue_ids) == ("a", "b", "c", "a", "c")
+        assert len(table) == 2 and table.overflowed == 2
+
+    def test_serialize(self):
+        table = ClueTable(["a", "b"])
+        loaded = ClueTable.load(json.loads(json.dumps(table.dump())))
+        assert loaded.intern_clues(("b", "c")) == (1, 2)
+
+        unpickled = pickle.loads(pickle.dumps(table))
+        assert unpickled.intern("c") == 2
+
+    def test_threads(self):
+        table = ClueTable()
+        words = [f"word{i % 50}" for i in range(5000)]
+        with ThreadPoolExecutor(8) as executor:
+            ids = list(executor.map(table.intern, words))
+        assert len(table) == 50
+        assert [table.words[clue_id] for clue_id in ids] == words
+
+
+class TestInternedGames:
+    def test_notesheet(self):
+        table = ClueTable()
+        games = [play_seeded_game(team_factories, seed, game_factory=partial(Game, clue_table=table)) for seed in range(20)]
+        plain = [play_seeded_game(team_factories, seed) for seed in range(20)]
+
+        for game, plain_game in zip(games, plain):
+            assert game.data == plain_game.data
+            for round_notes, plain_notes in zip(game.notesheet, plain_game.notesheet):
+                for note, plain_note in zip(round_notes, plain_notes):
+                    assert all(isinstance(clue_id, int) for clue_id in note.clues)
+                    assert game.decode_clues(note.clues) == plain_note.clues
+        # a clue given in several games is stored as the same id object
+        first = games[0].notesheet[0][0].clues[0]
+        repeats = [clue_id for game in games for round_notes in game.notesheet for note in round_notes for clue_id in note.clues if clue_id == first]
+        assert len(repeats) > 1 and all(clue_id is first for clue_id in repeats)
+
+    def test_validator(self):
+        class LeakyEncryptor:
+            def decide_clues(self, code, context):
+                return tuple(context.keywords[i] for i in code)
+        keyword_cards = [("a", "b", "c", "d"), ("e", "f", "g", "h")]
+        teams = [RandomTeam(keywords, seed=1) for keywords in keyword_cards]
+        teams[0].encryptor = LeakyEncryptor()
+        game = play_game(teams, game=Game(clue_table=ClueTable()), round_limit=1, clue_validator=KeywordLeakValidator())
+
+        assert game.notesheet[0][0].attempted_decipher == ()
+        assert game.decode_clues(game.notesheet[0][0].clues) == tuple(keyword_cards[0][i] for i in game.notesheet[0][0].correct_code)
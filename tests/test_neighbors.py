@@ -0,0 +1,106 @@
+import pytest
+from decryptogame.end_criteria import RoundEndCondition
+from decryptogame.game import Game
+from decryptogame.interning import ClueTable
+from decryptogame.neighbors import EXACT_SEARCH_BELOW, EmbeddingGuesser, IVFIndex, normalize_rows, train_centroids
+from decryptogame.play import play_game
+from decryptogame.teams import RandomIntercepter, Team
+
+numpy = pytest.importorskip("numpy")
+
+NUM_SLOTS = 4
+CLUES_PER_SLOT = 12
+
+
+def brute_force(vectors, labels, queries, k):
+    scores = normalize_rows(queries) @ normalize_rows(vectors).T
+    top = numpy.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return numpy.take_along_axis(scores, top, axis=1), labels[top]
+
+@pytest.fixture(scope="module")
+def embeddings():
+    # each slot's clues lie near its keyword, so a guesser which knows the embeddings deciphers every clue
+    rng = numpy.random.default_rng(0)
+    keywords = [f"KEYWORD{slot}" for slot in range(NUM_SLOTS)]
+    words = keywords + [f"CLUE{slot}_{index}" for slot in range(NUM_SLOTS) for index in range(CLUES_PER_SLOT)]
+    keyword_vectors = rng.standard_normal((NUM_SLOTS, 32))
+    clue_vectors = numpy.repeat(keyword_vectors, CLUES_PER_SLOT, axis=0) + 0.3 * rng.standard_normal((NUM_SLOTS * CLUES_PER_SLOT, 32))
+    vocabulary = {word: row for row, word in enumerate(words)}
+    return keywords, vocabulary, numpy.concatenate([keyword_vectors, clue_vectors]).astype(numpy.float32)
+
+
+class SlotEncryptor:
+    def __init__(self):
+        self.given = [0] * NUM_SLOTS
+
+    def decide_clues(self, code, context):
+        clues = []
+        for slot in code:
+            clues.append(f"clue{slot}_{self.given[slot]}")
+            self.given[slot] += 1
+        return tuple(clues)
+
+
+class TestIVFIndex:
+    def test_matches_brute_force_when_every_list_is_probed(self):
+        rng = numpy.random.default_rng(1)
+        vectors = rng.standard_normal((EXACT_SEARCH_BELOW * 3, 16)).astype(numpy.float32)
+        labels = numpy.arange(len(vectors))
+        index = IVFIndex(train_centroids(vectors, num_lists=16), nprobe=16)
+        index.add(vectors, labels)
+        queries = rng.standard_normal((20, 16))
+        similarities, found = index.search(queries, k=5)
+        expected_similarities, expected = brute_force(vectors, labels, queries, 5)
+        assert (found == expected).all()
+        assert numpy.allclose(similarities, expected_similarities, atol=1e-5)
+
+    def test_few_probes_find_near_duplicates(self):
+        rng = numpy.random.default_rng(2)
+        vectors = rng.standard_normal((EXACT_SEARCH_BELOW * 4, 16)).astype(numpy.float32)
+        index = IVFIndex(train_centroids(vectors, num_lists=32), nprobe=2)
+        index.add(vectors, range(len(vectors)))
+        _, found = index.search(vectors[:50] + 0.01 * rng.standard_normal((50, 16)), k=1)
+        assert (found[:, 0] == numpy.arange(50)).all()
+
+    def test_incremental_add(self):
+        rng = numpy.random.default_rng(3)
+        vectors = rng.standard_normal((100, 8)).astype(numpy.float32)
+        index = IVFIndex(train_centroids(vectors, num_lists=4))
+        for start in range(0, 100, 7):
+            index.add(vectors[start:start + 7], range(start, min(start + 7, 100)))
+        assert len(index) == 100
+        _, found = index.search(vectors, k=1)
+        assert (found[:, 0] == numpy.arange(100)).all()
+
+    def test_padding(self):
+        index = IVFIndex(numpy.eye(3))
+        similarities, labels = index.search(numpy.eye(3), k=2)
+        assert (labels == -1).all() and numpy.isneginf(similarities).all()
+
+        index.add(numpy.eye(3)[:1], [7])
+        similarities, labels = index.search(numpy.eye(3)[:2], k=2)
+        assert labels.tolist() == [[7, -1], [7, -1]]
+        assert similarities[0].tolist() == [1.0, -numpy.inf]
+
+
+class TestEmbeddingGuesser:
+    def test_embed_unknown_words(self, embeddings):
+        keywords, vocabulary, vectors = embeddings
+        guesser = EmbeddingGuesser(vocabulary, vectors)
+        embedded = guesser.embed(["keyword1", "unknown"])
+        assert numpy.array_equal(embedded[0], vectors[1])
+        assert not embedded[1].any()
+
+    @pytest.mark.parametrize("clue_table", [None, ClueTable()])
+    def test_deciphers_clues(self, embeddings, clue_table):
+        keywords, vocabulary, vectors = embeddings
+        guessers = [EmbeddingGuesser(vocabulary, vectors, k=3) for _ in range(2)]
+        teams = [Team(keywords=keywords, encryptor=SlotEncryptor(), intercepter=RandomIntercepter(seed), guesser=guessers[seed])
+                 for seed in range(2)]
+        round_codes = [[(round_number % 4, (round_number + 1) % 4, (round_number + 2) % 4)] * 2 for round_number in range(8)]
+        game = Game(end_conditions=[RoundEndCondition(8)], clue_table=clue_table)
+        play_game(teams, game=game, round_codes=round_codes)
+        assert game.data.rounds_played == 8
+        assert game.data.miscommunications == [0, 0]
+        # the clues of every round but the last were added to each guesser's index as they were revealed
+        assert len(guessers[0].index) == NUM_SLOTS + 3 * 7
@@ -0,0 +1,116 @@
+from itertools import permutations
+import os
+import pytest
+from decryptogame.batch import play_seeded_game
+from decryptogame.generators import RandomKeywordCards
+from decryptogame.openings import (BookEncryptor, BookGuesser, OpeningBook, book_key, build_opening_book, main, search_openings,
+                                   with_opening_book, write_opening_book)
+from decryptogame.teams import RandomIntercepter, Team
+
+KEYWORDS = ("apple", "bread", "cheese", "dates")
+
+
+class SearchEncryptor:
+    """Gives each keyword with the number of rounds played, and counts its searches."""
+    def __init__(self):
+        self.searches = 0
+
+    def decide_clues(self, code, context):
+        self.searches += 1
+        return tuple(f"{context.keywords[number]}{context.features.rounds}" for number in code)
+
+class SearchGuesser:
+    def __init__(self):
+        self.searches = 0
+
+    def decipher_clues(self, clues, context):
+        self.searches += 1
+        return tuple(context.keywords.index(clue.rstrip("0123456789")) for clue in clues)
+
+def SearchTeam(keywords, seed=0):
+    return Team(keywords=keywords, encryptor=SearchEncryptor(), intercepter=RandomIntercepter(seed), guesser=SearchGuesser())
+
+def BookTeam(keywords, book, seed=0):
+    return with_opening_book(SearchTeam(keywords, seed), book)
+
+def keyword_cards(seeds):
+    return [keywords for seed in seeds for keywords in next(RandomKeywordCards(seed=seed))]
+
+
+@pytest.fixture
+def book(tmp_path):
+    path = os.path.join(tmp_path, "book.bin")
+    build_opening_book(path, SearchTeam, keyword_cards(range(4)), rounds=2, backend="threads", max_workers=2)
+    book = OpeningBook(path)
+    yield book
+    book.close()
+
+
+class TestOpeningBook:
+    def test_write_and_get(self, tmp_path):
+        path = os.path.join(tmp_path, "small.bin")
+        entries = {f"key{index}": [index, str(index)] for index in range(100)}
+        write_opening_book(path, entries, rounds=1)
+        book = OpeningBook(path)
+        assert (len(book), book.rounds) == (100, 1)
+        assert all(book.get(key) == value for key, value in entries.items())
+        assert book.get("missing") is None
+        book.close()
+
+    def test_not_a_book(self, tmp_path):
+        path = os.path.join(tmp_path, "other.bin")
+        with open(path, "wb") as file:
+            file.write(b"\0" * 64)
+        with pytest.raises(ValueError):
+            OpeningBook(path)
+
+    def test_search_openings(self):
+        entries = search_openings(SearchTeam, KEYWORDS, rounds=2)
+        codes = list(permutations(range(4), 3))
+        assert entries[book_key("E", KEYWORDS, (), (2, 0, 1))] == ["cheese0", "apple0", "bread0"]
+        assert entries[book_key("G", KEYWORDS, (), ("cheese0", "apple0", "bread0"))] == [2, 0, 1]
+        history = [((2, 0, 1), ("cheese0", "apple0", "bread0"))]
+        assert entries[book_key("E", KEYWORDS, history, (3, 1, 0))] == ["dates1", "bread1", "apple1"]
+        # each round searches a clue and a decipher decision for every code, and the second round does so after every first round
+        assert len(entries) == 2 * len(codes) * (1 + len(codes))
+        with pytest.raises(ValueError):
+            search_openings(SearchTeam, KEYWORDS, rounds=3)
+
+    def test_lookups(self, book):
+        card = keyword_cards([0])[0]
+        assert book.clues(card, (0, 1, 2)) == tuple(f"{keyword}0" for keyword in card[:3])
+        assert book.decipher(card, tuple(f"{keyword}0" for keyword in card[:3])) == (0, 1, 2)
+        assert book.clues(KEYWORDS, (0, 1, 2)) is None
+
+
+class TestBookPlayers:
+    def test_same_games_without_search(self, book):
+        teams = []
+        def book_team(keywords, seed=0):
+            teams.append(BookTeam(keywords, book, seed))
+            return teams[-1]
+        for seed in range(4):
+            teams.clear()
+            expected = play_seeded_game([SearchTeam, SearchTeam], seed)
+            game = play_seeded_game([book_team, book_team], seed)
+            assert (game.notesheet, game.data) == (expected.notesheet, expected.data)
+            for team in teams:
+                # the book holds the first two rounds, so only later rounds are searched
+                assert team.encryptor.hits == team.guesser.hits == 2
+                assert team.encryptor.misses == team.guesser.misses == 0
+                assert team.encryptor.encryptor.searches == team.guesser.guesser.searches == expected.data.rounds_played - 2
+
+    def test_missing_card_falls_back(self, book):
+        team = BookTeam(KEYWORDS, book)
+        game = play_seeded_game([lambda keywords: team, SearchTeam], 0)
+        assert isinstance(team.encryptor, BookEncryptor) and isinstance(team.guesser, BookGuesser)
+        assert team.encryptor.hits == team.guesser.hits == 0
+        assert team.encryptor.misses == team.guesser.misses == 2
+        assert team.encryptor.encryptor.searches == game.data.rounds_played
+
+    def test_main(self, tmp_path):
+        path = os.path.join(tmp_path, "main.bin")
+        entries = main([path, "--team", "decryptogame.teams:RandomTeam", "--games", "2", "--backend", "serial"])
+        book = OpeningBook(path)
+        assert (len(book), book.rounds) == (entries, 1)
+        book.close()
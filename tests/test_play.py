@@ -0,0 +1,61 @@
+from functools import partial
+import pytest
+from decryptogame.game import Game
+from decryptogame.generators import RandomCodes, RandomKeywordCards
+from decryptogame.play import play_game
+from decryptogame.teams import RandomTeam
+
+
+class CountingGuesser:
+    def __init__(self, guesser):
+        self.guesser = guesser
+        self.calls = 0
+
+    def decipher_clues(self, clues, context):
+        self.calls += 1
+        return self.guesser.decipher_clues(clues, context)
+
+def play_seeded_game(seed, fast_outcome):
+    # two keywords and single-number codes make interceptions and miscommunications common
+    keyword_cards = next(RandomKeywordCards([2, 2], seed=seed))
+    teams = [RandomTeam(keywords, seed=seed + team_name) for team_name, keywords in enumerate(keyword_cards)]
+    for team in teams:
+        team.guesser = CountingGuesser(team.guesser)
+    game = play_game(teams, round_codes=RandomCodes(keyword_cards, [1, 1], seed=seed), fast_outcome=fast_outcome)
+    return game, sum(team.guesser.calls for team in teams)
+
+
+class TestFastOutcome:
+    def test_same_winner(self):
+        skipped_calls = 0
+        for seed in range(200):
+            full_game, full_calls = play_seeded_game(seed, fast_outcome=False)
+            fast_game, fast_calls = play_seeded_game(seed, fast_outcome=True)
+
+            assert fast_game.winner() == full_game.winner()
+            assert fast_game.game_over()
+            # rounds before the last are played in full
+            assert fast_game.notesheet[:-1] == full_game.notesheet[:-1]
+            skipped_calls += full_calls - fast_calls
+        assert skipped_calls > 0
+
+
+class KnownCodeIntercepter:
+    def __init__(self, code):
+        self.code = code
+
+    def intercept_clues(self, opponent_clues, context):
+        return self.code
+
+
+class TestInterception:
+    def test_correct_interceptions_score(self):
+        keyword_cards = [("a", "b", "c", "d"), ("e", "f", "g", "h")]
+        teams = [RandomTeam(keywords, seed=team_name) for team_name, keywords in enumerate(keyword_cards)]
+        # white always intercepts black's code, and black never intercepts white's
+        teams[0].intercepter = KnownCodeIntercepter((2, 3, 1))
+        teams[1].intercepter = KnownCodeIntercepter((3, 2, 1))
+        game = play_game(teams, round_codes=iter([[(0, 1, 2), (2, 3, 1)]] * 8), round_limit=3)
+        assert all(note.attempted_interception == (2, 3, 1) for _, note in game.notesheet)
+        assert game.data.interceptions[0] >= 1
+        assert game.data.interceptions[1] == 0
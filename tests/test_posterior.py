@@ -0,0 +1,57 @@
+from functools import partial
+from itertools import permutations
+import math
+import pytest
+from decryptogame.batch import play_seeded_game
+from decryptogame.game import Game
+from decryptogame.interning import ClueTable
+from decryptogame.posterior import BayesianIntercepter, ClueSlotPosterior, code_space
+from decryptogame.teams import Team
+from tests.players import KeywordEncryptor, KeywordGuesser, KeywordTeam
+
+numpy = pytest.importorskip("numpy")
+
+
+# both teams give the same clue for a slot every time and never miscommunicate, so games last until the opponent's clues are learned
+def BayesianTeam(keywords, seed=None):
+    return Team(keywords=keywords, encryptor=KeywordEncryptor(), intercepter=BayesianIntercepter(seed), guesser=KeywordGuesser())
+
+
+class TestClueSlotPosterior:
+    def test_code_space_matches_permutations(self):
+        assert code_space(4, 3).tolist() == [list(code) for code in permutations(range(4), 3)]
+        assert not code_space(4, 3).flags.writeable
+
+    def test_log_likelihoods(self):
+        posterior = ClueSlotPosterior(3, prior=1.0, vocabulary_size=10)
+        posterior.observe_note(("Ocean", "tree"), (0, 2))
+        posterior.observe("ocean", 0)
+        log_likelihoods = posterior.log_likelihoods(("OCEAN", "tree", "new"))
+        assert log_likelihoods[0, 0] == pytest.approx(math.log(3 / 12))
+        assert log_likelihoods[1, 0] == pytest.approx(math.log(1 / 10))
+        assert log_likelihoods[2, 1] == pytest.approx(math.log(2 / 11))
+        assert log_likelihoods[0, 2] == pytest.approx(math.log(1 / 12))
+        assert posterior.observations == 3
+
+    def test_scores_match_a_loop_over_codes(self):
+        posterior = ClueSlotPosterior(5, capacity=2)
+        words = ["sun", "moon", "star", "sky", "sea", "cloud", "rain"]
+        for index in range(30):
+            posterior.observe(words[index % len(words)], index * 3 % 5)
+        clues = ("moon", "rain", "unknown", "sun")
+        log_likelihoods = posterior.log_likelihoods(clues)
+        expected = [sum(log_likelihoods[slot, position] for position, slot in enumerate(code)) for code in permutations(range(5), 4)]
+        assert numpy.allclose(posterior.score_codes(clues), expected)
+        probabilities = posterior.posterior(clues)
+        assert probabilities.sum() == pytest.approx(1.0)
+        assert probabilities.argmax() == numpy.argmax(expected)
+
+
+class TestBayesianIntercepter:
+    def test_learns_repeated_clues(self):
+        wins = sum(play_seeded_game([BayesianTeam, partial(KeywordTeam, seed=seed)], seed).winner() == 0 for seed in range(20))
+        assert wins >= 18
+
+    def test_clue_table(self):
+        game = play_seeded_game([BayesianTeam, partial(KeywordTeam, seed=1)], 1, game_factory=partial(Game, clue_table=ClueTable()))
+        assert game.data.interceptions[0] >= 1
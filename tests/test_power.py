@@ -0,0 +1,83 @@
+from functools import partial
+import random
+import pytest
+from decryptogame.power import BETTER, EQUIVALENT, UNDECIDED, WORSE, SequentialTest, compare_teams, fixed_sample_games
+from decryptogame.teams import RandomTeam
+from tests.players import KeywordTeam
+
+
+class TestSequentialTest:
+    @pytest.mark.parametrize("share, decision", [(0.7, BETTER), (0.3, WORSE), (0.5, EQUIVALENT)])
+    def test_decisions(self, share, decision):
+        rng = random.Random(2)
+        test = SequentialTest(effect=0.1)
+        while test.decision == UNDECIDED:
+            test.update(rng.random() < share)
+        assert test.decision == decision
+        assert test.games < fixed_sample_games(0.1) * 2
+
+    def test_ties_do_not_move_the_test(self):
+        test = SequentialTest(effect=0.1)
+        for _ in range(10000):
+            assert test.update(None) == UNDECIDED
+        assert test.ties == 10000
+        assert test.log_likelihood_ratios() == (0.0, 0.0)
+
+    def test_decision_is_kept(self):
+        test = SequentialTest(effect=0.2)
+        while test.decision == UNDECIDED:
+            test.update(True)
+        for _ in range(100):
+            test.update(False)
+        assert test.decision == BETTER
+
+    def test_error_rate(self):
+        # equal teams are rarely declared different
+        rng = random.Random(1)
+        differences = 0
+        for _ in range(200):
+            test = SequentialTest(effect=0.1, alpha=0.1)
+            while test.decision == UNDECIDED:
+                test.update(rng.random() < 0.5)
+            differences += test.decision != EQUIVALENT
+        assert differences < 40
+
+    def test_invalid_effect(self):
+        with pytest.raises(ValueError):
+            SequentialTest(effect=0.5)
+
+
+class TestCompareTeams:
+    def test_better_team(self):
+        result = compare_teams(KeywordTeam, partial(RandomTeam, seed=1), effect=0.1, batch_games=20)
+        assert result.decision == BETTER
+        assert result.decided_at <= result.games
+        assert result.games_saved > 0
+
+    def test_worse_team(self):
+        result = compare_teams(partial(RandomTeam, seed=1), KeywordTeam, effect=0.1, batch_games=20)
+        assert result.decision == WORSE
+        assert result.wins < result.losses
+
+    def test_equal_teams(self):
+        result = compare_teams(partial(RandomTeam, seed=1), partial(RandomTeam, seed=2), effect=0.15, batch_games=100, seed=0)
+        assert result.decision == EQUIVALENT
+        assert result.games == result.wins + result.losses + result.ties
+        assert result.ties > 0
+
+    def test_out_of_games(self):
+        result = compare_teams(partial(RandomTeam, seed=1), partial(RandomTeam, seed=2), effect=0.01, batch_games=10, max_games=25)
+        assert result.decision == UNDECIDED
+        assert result.decided_at is None
+        assert result.games == 25
+
+    @pytest.mark.parametrize("batch_games, max_games", [(15, 40), (10, 25)])
+    def test_no_games_are_discarded(self, batch_games, max_games):
+        # odd batches are rounded up to even ones, and a last batch cut to an odd size plays its last seed from one side only
+        played = []
+        def candidate(keywords):
+            played.append(keywords)
+            return RandomTeam(keywords, seed=1)
+        result = compare_teams(candidate, partial(RandomTeam, seed=2), effect=0.01, batch_games=batch_games, max_games=max_games)
+        assert result.decision == UNDECIDED
+        assert result.games == len(played) == max_games
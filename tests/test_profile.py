@@ -0,0 +1,38 @@
+import os
+import pytest
+import random
+from decryptogame import game, teams
+from decryptogame.profile import LIBRARY, TEAM, frame_category, load_team_factory, main, stack_category
+
+
+class TestProfile:
+    def test_categories(self):
+        assert frame_category(game.__file__) == LIBRARY
+        assert frame_category(teams.__file__) == TEAM
+        assert frame_category(__file__) == TEAM
+        assert frame_category(random.__file__) is None
+        assert frame_category("~") is None
+        # standard library time belongs to the code which called it
+        assert stack_category([game.__file__, teams.__file__, random.__file__]) == TEAM
+        assert stack_category([teams.__file__, game.__file__, random.__file__]) == LIBRARY
+
+    def test_load_team_factory(self):
+        assert load_team_factory("decryptogame.teams:RandomTeam") is teams.RandomTeam
+        with pytest.raises(ValueError):
+            load_team_factory("decryptogame.teams")
+
+    @pytest.mark.parametrize("mode", ["cprofile", "sample", "alloc"])
+    def test_main(self, tmp_path, capsys, mode):
+        prefix = os.path.join(tmp_path, mode)
+        profile = main(["--games", "20", "--mode", mode, "--output", prefix])
+
+        assert "library" in capsys.readouterr().out
+        assert os.path.exists(f"{prefix}.txt")
+        with open(f"{prefix}.collapsed") as file:
+            for line in file:
+                stack, weight = line.rsplit(" ", 1)
+                assert int(weight) > 0
+        assert os.path.exists(f"{prefix}.prof") == (mode == "cprofile")
+        if mode == "cprofile":
+            totals = profile.totals()
+            assert totals[LIBRARY] > 0 and totals[TEAM] > 0
@@ -0,0 +1,104 @@
+from functools import partial
+import os
+import pytest
+from decryptogame.batch import play_seeded_game
+from decryptogame.regression import (DECIPHER, ENCRYPT, INTERCEPT, ArchivedGame, diff_game, diff_teams, dump_archived_game, load_archived_game,
+                                     main, read_corpus, record_seeded_games, write_corpus)
+from decryptogame.teams import RandomIntercepter, RandomTeam, Team
+from tests.players import KeywordEncryptor, KeywordTeam
+
+
+class ReversedGuesser:
+    """Deciphers the first round's clues backwards."""
+    def decipher_clues(self, clues, context):
+        code = tuple(context.keywords.index(clue) for clue in clues)
+        return code[::-1] if context.features.rounds == 0 else code
+
+def ReversedTeam(keywords, seed=0):
+    return Team(keywords=keywords, encryptor=KeywordEncryptor(), intercepter=RandomIntercepter(seed), guesser=ReversedGuesser())
+
+RANDOM_TEAMS = [partial(RandomTeam, seed=1), partial(RandomTeam, seed=1)]
+# seeded, so the old and new team intercept alike
+KEYWORD_TEAM = partial(KeywordTeam, seed=0)
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return record_seeded_games(RANDOM_TEAMS, range(12))
+
+
+class TestCorpus:
+    def test_record(self, corpus):
+        game = play_seeded_game(RANDOM_TEAMS, 3)
+        assert corpus[3].seed == 3
+        assert [list(round_notes) for round_notes in corpus[3].notesheet] == game.notesheet
+        assert all(len(keywords) == 4 for keywords in corpus[3].keyword_cards)
+
+    def test_write_and_read(self, corpus, tmp_path):
+        assert load_archived_game(dump_archived_game(corpus[0])) == corpus[0]
+        path = os.path.join(tmp_path, "corpus.jsonl")
+        write_corpus(path, corpus)
+        assert read_corpus(path) == corpus
+
+    def test_fast_outcome(self, tmp_path):
+        corpus = record_seeded_games(RANDOM_TEAMS, range(40), fast_outcome=True)
+        assert any(note.attempted_decipher is None for archived in corpus for note in archived.notesheet[-1])
+        path = os.path.join(tmp_path, "corpus.jsonl")
+        write_corpus(path, corpus)
+        assert read_corpus(path) == corpus
+
+
+class TestDiff:
+    def test_same_team(self, corpus):
+        for index, archived in enumerate(corpus):
+            game = play_seeded_game(RANDOM_TEAMS, archived.seed)
+            diff = diff_game(RANDOM_TEAMS[0], RANDOM_TEAMS[0], archived, index=index)
+            # the rebuilt contexts give the same decisions as the archived game, so its outcome is reproduced
+            assert diff.diffs == ()
+            assert diff.decisions == 6 * len(archived.notesheet)
+            assert (diff.old_winner, diff.old_rounds) == (diff.new_winner, diff.new_rounds) == (game.winner(), game.data.rounds_played)
+
+    def test_changed_decisions(self):
+        archived = record_seeded_games([KEYWORD_TEAM, KEYWORD_TEAM], [0])[0]
+        diff = diff_game(KEYWORD_TEAM, ReversedTeam, archived, index=5)
+        assert [(change.game, change.round_number, change.team_name, change.role) for change in diff.diffs] == [(5, 0, 0, DECIPHER), (5, 0, 1, DECIPHER)]
+        first = diff.diffs[0]
+        assert first.old == archived.notesheet[0][0].correct_code
+        assert first.new == first.old[::-1]
+        assert (diff.old_winner, diff.old_rounds) == (play_seeded_game([KEYWORD_TEAM, KEYWORD_TEAM], 0).winner(), len(archived.notesheet))
+
+    def test_one_team(self):
+        archived = record_seeded_games([KEYWORD_TEAM, KEYWORD_TEAM], [0])[0]
+        diff = diff_game(KEYWORD_TEAM, ReversedTeam, archived, team_names=[1])
+        assert [(change.team_name, change.role) for change in diff.diffs] == [(1, DECIPHER)]
+        assert diff.decisions == 3 * len(archived.notesheet)
+
+    def test_skipped_decisions(self, corpus):
+        archived = corpus[0]
+        notes = list(archived.notesheet[-1])
+        notes[1] = type(notes[1])(clues=None, attempted_interception=None, attempted_decipher=None, correct_code=notes[1].correct_code)
+        skipped = ArchivedGame(seed=archived.seed, keyword_cards=archived.keyword_cards, notesheet=archived.notesheet[:-1] + (tuple(notes),))
+        # the interception of team 1's clues and team 1's decipher attempt were skipped, so they are left out
+        assert diff_game(RANDOM_TEAMS[0], RANDOM_TEAMS[0], skipped).decisions == 6 * len(archived.notesheet) - 2
+
+
+class TestDiffTeams:
+    @pytest.mark.parametrize("backend", ["serial", "threads", "processes"])
+    def test_backends(self, corpus, backend):
+        report = diff_teams(RANDOM_TEAMS[0], partial(RandomTeam, seed=2), corpus, backend=backend, max_workers=2, chunk_games=5)
+        expected = [diff_game(RANDOM_TEAMS[0], partial(RandomTeam, seed=2), archived, index=index) for index, archived in enumerate(corpus)]
+        assert report.games == expected
+        assert {diff.role for diff in report.diffs} == {ENCRYPT, INTERCEPT, DECIPHER}
+        assert report.outcome_changes and all(game.outcome_changed for game in report.outcome_changes)
+        assert "decisions changed in 12 games" in report.summary()
+
+    def test_unknown_backend(self, corpus):
+        with pytest.raises(ValueError):
+            diff_teams(RANDOM_TEAMS[0], RANDOM_TEAMS[0], corpus, backend="fibers")
+
+    def test_main(self, tmp_path, capsys):
+        path = os.path.join(tmp_path, "corpus.jsonl")
+        options = ["--old", "decryptogame.teams:RandomTeam", "--new", "decryptogame.teams:RandomTeam", "--games", "4", "--backend", "serial"]
+        report = main([path, *options])
+        assert len(read_corpus(path)) == len(report.games) == 4
+        assert f"of {report.decisions} decisions changed in 4 games" in capsys.readouterr().out
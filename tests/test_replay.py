@@ -0,0 +1,75 @@
+from functools import partial
+import pytest
+from decryptogame.batch import play_seeded_game
+from decryptogame.end_criteria import RoundEndCondition
+from decryptogame.game import Game
+from decryptogame.replay import NO_WINNER, bulk_replayable, pack_notesheets, replay_notesheets, replay_packed
+from decryptogame.sweep import RulesVariant
+from decryptogame.teams import RandomTeam
+
+numpy = pytest.importorskip("numpy")
+
+
+@pytest.fixture(scope="module")
+def notesheets():
+    # long games on small cards give every kind of ending
+    team_factories = [partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)]
+    game_factory = lambda: Game(end_conditions=[RoundEndCondition(10)])
+    return [play_seeded_game(team_factories, seed, game_factory=game_factory, card_lengths=[3, 3], code_lengths=[2, 2]).notesheet[:seed % 11]
+            for seed in range(300)]
+
+def assert_matches_games(results, notesheets, game_factory):
+    for index, notesheet in enumerate(notesheets):
+        game = game_factory()
+        for round_notes in notesheet:
+            if game.game_over():
+                break
+            game.process_round_notes(round_notes)
+        assert results.data(index) == game.data
+        assert results.game_over[index] == game.game_over()
+        assert results.winner(index) == game.winner()
+
+
+class TestReplay:
+    @pytest.mark.parametrize("variant", [RulesVariant(), RulesVariant(miscommunications=3, interceptions=1),
+                                         RulesVariant(rounds=4, count_first_round=True), RulesVariant(rounds=0)])
+    def test_bulk(self, notesheets, variant):
+        assert bulk_replayable(variant.game())
+        results = replay_notesheets(notesheets, variant.game)
+        assert_matches_games(results, notesheets, variant.game)
+
+    def test_packed(self, notesheets):
+        packed = pack_notesheets(notesheets)
+        assert len(packed) == len(notesheets)
+        results = replay_packed(packed)
+        assert_matches_games(results, notesheets, Game)
+        assert set(results.winners.tolist()) == {NO_WINNER, 0, 1}
+
+    def test_custom_rules(self, notesheets):
+        game_factory = lambda: Game(miscommunication_func=lambda note, data: 0, tiebreaker_func=lambda data: None)
+        assert not bulk_replayable(game_factory())
+        results = replay_notesheets(notesheets, game_factory)
+        assert_matches_games(results, notesheets, game_factory)
+        assert not results.miscommunications.any()
+
+        with pytest.raises(ValueError):
+            replay_packed(pack_notesheets(notesheets), game_factory)
+
+    def test_custom_tiebreaker(self, notesheets):
+        game_factory = lambda: Game(tiebreaker_func=lambda data: 1)
+        assert bulk_replayable(game_factory())
+        assert_matches_games(replay_notesheets(notesheets, game_factory), notesheets, game_factory)
+
+    def test_empty(self):
+        results = replay_notesheets([[], []])
+        assert results.rounds_played.tolist() == [0, 0]
+        assert not results.game_over.any()
+        assert len(replay_notesheets([])) == 0
+
+    def test_empty_custom_rules(self):
+        game_factory = lambda: Game(miscommunication_func=lambda note, data: 0)
+        assert not bulk_replayable(game_factory())
+        results = replay_notesheets([], game_factory)
+        assert len(results) == 0
+        assert results.miscommunications.shape == results.interceptions.shape == (0, 2)
+        assert replay_notesheets([[]], game_factory).rounds_played.tolist() == [0]
@@ -0,0 +1,88 @@
+from functools import partial
+import pytest
+from decryptogame.batch import play_seeded_game
+import decryptogame.official_words.english as english
+from decryptogame.selfplay import (DECIPHER, ENCRYPT, INTERCEPT, PADDING, ShardWriter, game_records, generate_selfplay,
+                                   play_selfplay_chunk, read_shards, record_dtype)
+from decryptogame.teams import RandomTeam
+
+numpy = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def team_factories():
+    return [partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)]
+
+def sort_records(records):
+    return numpy.sort(records, order=["game", "round", "team", "role"])
+
+
+class TestRecords:
+    def test_game_records(self, team_factories):
+        keyword_cards = []
+        recording_factories = [lambda keywords, factory=factory: keyword_cards.append(keywords) or factory(keywords) for factory in team_factories]
+        game = play_seeded_game(recording_factories, 7, card_lengths=[4, 3])
+        records = game_records(game, keyword_cards, 7)
+        assert len(records) == 6 * len(game.notesheet)
+        assert (records["game"] == 7).all()
+
+        last_round = records[records["round"] == len(game.notesheet) - 1]
+        white, black = game.notesheet[-1]
+        encrypt, intercept, decipher = last_round[:3]
+        assert encrypt["role"] == ENCRYPT and intercept["role"] == INTERCEPT and decipher["role"] == DECIPHER
+        assert [english.words[word_id] for word_id in encrypt["clues"]] == list(white.clues)
+        assert tuple(encrypt["action"]) == white.correct_code
+        assert tuple(intercept["action"]) == black.attempted_interception
+        assert [english.words[word_id] for word_id in intercept["clues"]] == list(black.clues)
+        assert tuple(decipher["action"]) == white.attempted_decipher
+        # black's card has three keywords, so its last keyword is padding
+        assert last_round[3]["keywords"][3] == PADDING
+        assert sum(last_round[0]["slot_counts"]) == 3 * (len(game.notesheet) - 1)
+
+        data = game.data
+        tokens_before = (data.miscommunications[0] - (white.attempted_decipher != white.correct_code))
+        assert encrypt["miscommunications"][0] == tokens_before
+        winner = game.winner()
+        expected_outcome = 0 if winner is None else (1 if winner == 0 else -1)
+        assert (records[records["team"] == 0]["outcome"] == expected_outcome).all()
+
+    def test_unknown_clues(self, team_factories):
+        class OddEncryptor:
+            def decide_clues(self, code, context):
+                return tuple("not a word" for _ in code)
+
+        def odd_team(keywords):
+            team = RandomTeam(keywords, seed=3)
+            team.encryptor = OddEncryptor()
+            return team
+
+        records = play_selfplay_chunk([odd_team, team_factories[1]], range(3))
+        assert (records[(records["team"] == 0) & (records["role"] == ENCRYPT)]["clues"] == -1).all()
+        assert (records[(records["team"] == 1) & (records["role"] == ENCRYPT)]["clues"] >= 0).all()
+
+
+class TestShards:
+    def test_shard_writer(self, tmp_path, team_factories):
+        records = play_selfplay_chunk(team_factories, range(100))
+        shard_records = 50
+        with ShardWriter(tmp_path, shard_bytes=shard_records * record_dtype().itemsize, shuffle_records=120, seed=0) as writer:
+            for start in range(0, len(records), 37):
+                writer.write(records[start:start + 37])
+        shards = list(read_shards(tmp_path))
+        assert len(shards) == writer.records // shard_records + (writer.records % shard_records > 0)
+        assert all(len(shard) <= shard_records for shard in shards)
+        written = numpy.concatenate(shards)
+        assert writer.records == len(records)
+        # shuffled across chunks, but no record is lost or repeated
+        assert not numpy.array_equal(written["game"], records["game"])
+        assert numpy.array_equal(sort_records(written), sort_records(records))
+
+    @pytest.mark.parametrize("backend", ["serial", "threads", "processes"])
+    def test_generate(self, tmp_path, team_factories, backend):
+        summary = generate_selfplay(team_factories, range(60), tmp_path, backend=backend, max_workers=2, chunk_games=7,
+                                    shard_bytes=4096, shuffle_records=64, shuffle_seed=0)
+        assert summary.games == 60
+        written = numpy.concatenate(list(read_shards(tmp_path)))
+        assert len(written) == summary.records
+        assert all(len(shard) <= 4096 // record_dtype().itemsize for shard in read_shards(tmp_path))
+        assert numpy.array_equal(sort_records(written), sort_records(play_selfplay_chunk(team_factories, range(60))))
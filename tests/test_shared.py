@@ -0,0 +1,101 @@
+import json
+import pytest
+from decryptogame.checkpoint import dump_game, load_game
+from decryptogame.components import GameData, Note
+from decryptogame.game import Game
+from decryptogame.shared import SharedGameTable
+
+
+@pytest.fixture
+def round_notes():
+    # one miscommunication among first team, one interception of second team by first
+    return [
+        Note(clues=("a", "b", "c"), attempted_interception=(2, 3, 1), attempted_decipher=(2, 3, 1), correct_code=(4, 3, 1)),
+        Note(clues=("dog", "foot", "bar"), attempted_interception=(2, 1, 3), attempted_decipher=(2, 1, 3), correct_code=(2, 1, 3))
+    ]
+
+@pytest.fixture
+def table():
+    with SharedGameTable(3) as table:
+        yield table
+
+
+class TestSharedGameTable:
+    def test_bound_game(self, table, round_notes):
+        game = Game()
+        table.bind(game, 1)
+        assert table.read(1) == GameData()
+
+        game.process_round_notes(round_notes)
+        game.process_round_notes(round_notes)
+
+        assert table.read(1) == game.data == GameData(interceptions=[1, 0], miscommunications=[2, 0], rounds_played=2)
+        assert game.game_over()
+        assert game.winner() is not None
+        # other records are untouched
+        assert table.read(0) == GameData()
+
+    def test_rounds_are_published_at_once(self, table, round_notes):
+        game = Game(end_conditions=[])
+        table.bind(game, 0)
+        published = []
+        write = table.write
+        def record_write(index, game_data):
+            write(index, game_data)
+            published.append(table.read(index))
+        table.write = record_write
+        for _ in range(3):
+            game.process_round_notes(round_notes)
+        # a reader only sees whole rounds, whatever the custom rules update
+        assert published == [GameData(rounds_played=1, miscommunications=[1, 0], interceptions=[0, 0]),
+                             GameData(rounds_played=2, miscommunications=[2, 0], interceptions=[1, 0]),
+                             GameData(rounds_played=3, miscommunications=[3, 0], interceptions=[2, 0])]
+
+        custom = Game(end_conditions=[], miscommunication_func=lambda note, data: 1, interception_func=lambda note, data: 1)
+        table.bind(custom, 1)
+        published.clear()
+        custom.process_round_notes(round_notes)
+        assert published == [GameData(rounds_played=1, miscommunications=[1, 1], interceptions=[1, 1])]
+
+    def test_bind_keeps_data(self, table, round_notes):
+        game = Game(notesheet=[round_notes])
+        table.bind(game, 2)
+        assert table.read(2) == game.data
+
+    def test_checkpoint_bound_game(self, table, round_notes):
+        game = Game()
+        table.bind(game, 1)
+        game.process_round_notes(round_notes)
+        assert game._data == game.data and game.data == game._data
+        restored = load_game(json.loads(json.dumps(dump_game(game))))
+        assert (restored.notesheet, restored.data) == (game.notesheet, game.data)
+        # the restored game is detached from the table
+        restored.process_round_notes(round_notes)
+        assert table.read(1) == game.data
+
+    def test_no_games(self):
+        with pytest.raises(ValueError):
+            SharedGameTable(0)
+
+    def test_attach(self, table, round_notes):
+        game = Game()
+        table.bind(game, 0)
+        game.process_round_notes(round_notes)
+
+        reader = SharedGameTable.attach(table.name, 3)
+        assert reader.read(0) == game.data
+        reader.close()
+
+    def test_snapshot(self, table, round_notes):
+        pytest.importorskip("numpy")
+        games = [Game() for _ in range(3)]
+        for index, game in enumerate(games):
+            table.bind(game, index)
+        games[2].process_round_notes(round_notes)
+
+        view = table.array()
+        snapshot = table.snapshot()
+        assert snapshot.shape == (3, 6)
+        assert snapshot[2, 1:].tolist() == [1, 1, 0, 0, 0]
+        assert (snapshot[:, 0] % 2 == 0).all()
+        del view
@@ -0,0 +1,71 @@
+import pickle
+import pytest
+from decryptogame.generators import RandomCodes
+from decryptogame.play import play_game
+from decryptogame.steps import GameSteps, Phase, play_steps, team_decisions
+from tests.players import FirstSlotsTeam
+
+@pytest.fixture
+def keyword_cards():
+    return [("a", "b", "c", "d"), ("e", "f", "g", "h")]
+
+@pytest.fixture
+def teams(keyword_cards):
+    return [FirstSlotsTeam(keywords) for keywords in keyword_cards]
+
+
+class TestGameSteps:
+    def test_phases(self, keyword_cards):
+        steps = GameSteps(keyword_cards, round_codes=[[(0, 1, 2), (3, 2, 1)]])
+        step = next(steps)
+        assert step.phase == Phase.CLUES
+        assert step.round_number == 0
+        assert step.inputs == ((0, 1, 2), (3, 2, 1))
+
+        step = steps.send([("x", "y", "z"), ("u", "v", "w")])
+        assert step.phase == Phase.INTERCEPTION
+        assert step.inputs == [("u", "v", "w"), ("x", "y", "z")]
+
+        step = steps.send([(3, 2, 1), (0, 1, 2)])
+        assert step.phase == Phase.DECIPHER
+        assert step.inputs == (("x", "y", "z"), ("u", "v", "w"))
+
+        step = steps.send([(0, 1, 2), (0, 1, 2)])
+        assert step.phase == Phase.ROUND_SCORED
+        assert steps.game.data.miscommunications == [0, 1]
+
+        # the round codes are exhausted
+        with pytest.raises(StopIteration):
+            next(steps)
+
+    def test_bad_decisions(self, keyword_cards):
+        steps = GameSteps(keyword_cards)
+        with pytest.raises(TypeError):
+            steps.send([(0, 1, 2), (0, 1, 2)])
+        next(steps)
+        with pytest.raises(TypeError):
+            next(steps)
+
+    def test_matches_play_game(self, teams, keyword_cards):
+        played = play_game(teams, round_codes=RandomCodes(keyword_cards, seed=7))
+        stepped = play_steps(teams, GameSteps(keyword_cards, round_codes=RandomCodes(keyword_cards, seed=7)))
+
+        assert stepped.notesheet == played.notesheet
+        assert stepped.data == played.data
+
+    def test_round_limit(self, teams, keyword_cards):
+        game = play_steps(teams, GameSteps(keyword_cards, round_limit=2))
+        assert game.data.rounds_played == 2
+
+    def test_picklable(self, teams, keyword_cards):
+        uninterrupted = play_steps(teams, GameSteps(keyword_cards, round_codes=RandomCodes(keyword_cards, seed=3)))
+
+        steps = GameSteps(keyword_cards, round_codes=RandomCodes(keyword_cards, seed=3))
+        step = next(steps)
+        steps.send(team_decisions(teams, step))
+        restored = pickle.loads(pickle.dumps(steps))
+        assert restored.step.phase == Phase.INTERCEPTION
+
+        resumed = play_steps(teams, restored)
+        assert resumed.notesheet == uninterrupted.notesheet
+        assert resumed.data == uninterrupted.data
@@ -0,0 +1,64 @@
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import pytest
+from decryptogame.components import TeamName
+from decryptogame.game import interception_rule
+from decryptogame.sweep import RulesVariant, parameter_grid, play_variant_games, sweep, wilson_interval, write_results
+from decryptogame.teams import RandomTeam
+
+
+@pytest.fixture
+def team_factories():
+    return [partial(RandomTeam, seed=1), partial(RandomTeam, seed=2)]
+
+
+class TestRulesVariant:
+    def test_default_game(self):
+        game = RulesVariant().game()
+        assert [end_condition.k for end_condition in game.end_conditions] == [8, 2, 2]
+        assert game.interception_func is interception_rule
+
+    def test_parameter_grid(self):
+        variants = parameter_grid(miscommunications=[1, 2, 3], count_first_round=[False, True])
+        assert len(variants) == 6
+        assert variants[1] == RulesVariant(miscommunications=1, count_first_round=True)
+
+    def test_play_variant_games(self, team_factories):
+        variant = RulesVariant(rounds=1, code_length=2, card_length=3)
+        outcomes = play_variant_games(variant, team_factories, range(5))
+        assert len(outcomes) == 5
+        assert all(rounds_played == 1 for _, rounds_played in outcomes)
+        assert outcomes == play_variant_games(variant, team_factories, range(5))
+
+
+class TestSweep:
+    def test_wilson_interval(self):
+        rate, lower, upper = wilson_interval(50, 100)
+        assert rate == 0.5
+        assert lower == pytest.approx(1 - upper)
+        assert 0.39 < lower < 0.41
+        assert wilson_interval(0, 10)[1] == pytest.approx(0.0)
+
+    def test_early_stopping(self, team_factories):
+        # random guessers usually miscommunicate twice in two rounds, so most games are tied and decided quickly
+        variants = parameter_grid(miscommunications=[2, 20])
+        with ThreadPoolExecutor(2) as executor:
+            results = sweep(variants, team_factories, batch_games=50, max_games=400, precision=0.05, executor=executor)
+
+        assert results[0].games < 400
+        assert results[0].tie_rate()[0] > 0.7
+        assert results[1].decided(0.05) or results[1].games == 400
+        assert results[1].game_length()[0] > results[0].game_length()[0]
+
+    def test_process_pool(self, tmp_path, team_factories):
+        results = sweep([RulesVariant(rounds=2)], team_factories, batch_games=10, max_games=20, precision=0.0)
+        assert results[0].games == 20
+        assert sum(results[0].wins) + results[0].ties == 20
+
+        path = tmp_path / "results.csv"
+        write_results(results, path)
+        with open(path) as file:
+            rows = list(csv.DictReader(file))
+        assert rows[0]["games"] == "20"
+        assert float(rows[0]["tie_rate_lower"]) <= float(rows[0]["tie_rate"]) <= float(rows[0]["tie_rate_upper"])
@@ -0,0 +1,75 @@
+import io
+from itertools import cycle
+from types import SimpleNamespace
+import pytest
+from decryptogame.game import Game
+from decryptogame.generators import RandomCodes
+from decryptogame.play import play_game
+from decryptogame.teams import CommandLineTeam, RandomTeam, TerminalView
+
+keyword_cards = [("a", "b", "c", "d"), ("e", "f", "g", "h")]
+
+def play_scripted(answers, round_limit=None):
+    output = io.StringIO()
+    teams = [CommandLineTeam(keyword_cards[0], TerminalView(output, answers)), RandomTeam(keyword_cards[1], seed=1)]
+    game = play_game(teams, round_codes=RandomCodes(keyword_cards, seed=2), round_limit=round_limit)
+    return game, output.getvalue()
+
+
+class TestTerminalView:
+    def test_scripted_game(self):
+        # each round, three clues, then three interception numbers, then three decipher numbers
+        game, output = play_scripted(cycle(["x", "y", "z", "0", "1", "2", "0", "1", "2"]))
+
+        assert game.game_over()
+        assert output.count("\nKeywords:") == 1
+        for round_number in range(game.data.rounds_played - 1):
+            # each revealed round is printed once, however many prompts follow it
+            assert output.count(f"Round {round_number} WHITE:") == 1
+        assert all(note.clues == ("x", "y", "z") for note, _ in game.notesheet)
+
+    def test_clue_table(self):
+        answers = ["x", "y", "z", "0", "1", "2", "0", "1", "2", "?", "p", "q", "r"]
+        game, output = play_scripted(answers + ["1"] * 6, round_limit=2)
+
+        table = output[output.index("WHITE clues"):]
+        white_code = game.notesheet[0][0].correct_code
+        assert f"  {white_code[0]} {keyword_cards[0][white_code[0]]}: x," in table
+        assert game.notesheet[1][0].clues == ("p", "q", "r")
+
+    def test_invalid_code_num(self):
+        answers = ["x", "y", "z", "nine", "9", "0", "1", "2", "0", "1", "2"]
+        game, output = play_scripted(answers, round_limit=1)
+
+        assert output.count("Code num must lie in range [0 - 4).") == 2
+        # the command line team intercepted the opponent, so its attempt is kept in the opponent's note
+        assert game.notesheet[0][1].attempted_interception == (0, 1, 2)
+
+    def test_scripted_answers_run_out(self):
+        with pytest.raises(EOFError):
+            play_scripted(["x", "y"])
+
+    def test_buffered_writes(self):
+        writes = []
+        class Output(io.StringIO):
+            def write(self, text):
+                writes.append(text)
+                return super().write(text)
+        view = TerminalView(Output(), ["0"])
+        view.write("a\n")
+        view.write("b\n")
+        assert not writes
+        view.read("prompt: ", None)
+        assert writes == ["a\nb\nprompt: "]
+
+
+class TestRandomTeam:
+    def test_independent_players(self):
+        context = SimpleNamespace(keywords=keyword_cards[0], num_opponent_keywords=4)
+        def draws(team):
+            return ([team.intercepter.intercept_clues(("x", "y", "z"), context) for _ in range(20)],
+                    [team.guesser.decipher_clues(("x", "y", "z"), context) for _ in range(20)])
+        interceptions, deciphers = draws(RandomTeam(keyword_cards[0], seed=1))
+        # the cards are the same size, so players seeded alike would draw the same codes
+        assert interceptions != deciphers
+        assert draws(RandomTeam(keyword_cards[0], seed=1)) == (interceptions, deciphers)
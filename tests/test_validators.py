@@ -0,0 +1,76 @@
+import pytest
+from decryptogame.components import GameData
+from decryptogame.game import Game
+from decryptogame.play import play_round
+from decryptogame.teams import Team
+from decryptogame.validators import AhoCorasick, KeywordLeakValidator
+
+
+class FixedEncryptor:
+    def __init__(self, clues):
+        self.clues = clues
+
+    def decide_clues(self, code, context):
+        return self.clues
+
+class FixedGuesser:
+    def intercept_clues(self, opponent_clues, context):
+        return (3, 2, 1)
+
+    def decipher_clues(self, clues, context):
+        return (0, 1, 2)
+
+@pytest.fixture
+def keywords():
+    return ("FOREST", "Coffee", "ice cream", "RUN")
+
+
+class TestAhoCorasick:
+    def test_contains_any(self):
+        automaton = AhoCorasick(["he", "she", "hers", "his"])
+        assert automaton.contains_any("ushers")
+        assert automaton.contains_any("ahishe")
+        assert not automaton.contains_any("hxs")
+        assert not AhoCorasick([]).contains_any("anything")
+
+    def test_overlapping_failure(self):
+        automaton = AhoCorasick(["abcd", "bce"])
+        assert automaton.contains_any("abce")
+        assert not automaton.contains_any("abcbc")
+
+
+class TestKeywordLeakValidator:
+    @pytest.mark.parametrize("clue", ["forest", "rainforest", "Foresters", "coffees", "ICE-CREAM", "icecreams", "runner"])
+    def test_invalid(self, keywords, clue):
+        assert not KeywordLeakValidator().valid_clue(clue, keywords)
+
+    @pytest.mark.parametrize("clue", ["tree", "espresso", "sprint", "fore", "cream"])
+    def test_valid(self, keywords, clue):
+        assert KeywordLeakValidator().valid_clue(clue, keywords)
+
+    @pytest.mark.parametrize("keyword, clue", [("planes", "plant"), ("shores", "short")])
+    def test_stem_is_not_a_substring(self, keyword, clue):
+        # the stems "plan" and "shor" only forbid clues which share them, not clues which contain them
+        assert KeywordLeakValidator().valid_clue(clue, (keyword,))
+        assert not KeywordLeakValidator().valid_clue(f"{keyword[:-1]}d", (keyword,))
+
+    def test_valid_clues(self, keywords):
+        validator = KeywordLeakValidator()
+        assert validator.valid_clues(("tree", "espresso", "sprint"), keywords)
+        assert not validator.valid_clues(("tree", "coffee", "sprint"), keywords)
+
+
+class TestPlayRound:
+    def test_penalty(self, keywords):
+        teams = [Team(keywords=keywords, encryptor=FixedEncryptor(("tree", "espresso", "sorbet")), intercepter=FixedGuesser(), guesser=FixedGuesser()),
+                 Team(keywords=("A", "B", "C", "D"), encryptor=FixedEncryptor(("a", "x", "y")), intercepter=FixedGuesser(), guesser=FixedGuesser())]
+        codes = [(0, 1, 2), (0, 1, 2)]
+
+        game = Game()
+        play_round(teams, game, codes)
+        assert game.data == GameData(rounds_played=1)
+
+        game = Game()
+        play_round(teams, game, codes, clue_validator=KeywordLeakValidator())
+        assert game.data == GameData(miscommunications=[0, 1], rounds_played=1)
+        assert game.notesheet[0][1].attempted_decipher == ()